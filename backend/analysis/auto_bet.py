@@ -0,0 +1,107 @@
+"""
+自動投注訂閱：排程每次入庫後，為所有進行中的訂閱對下一期下注。
+
+選號只依參數組合計算一次（同策略、同期數、同星數的訂閱共用結果），
+所有訂閱產生的投注以單一 INSERT ... RETURNING 寫入。
+"""
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.auto_bet_subscription import AutoBetSubscription
+from app.models.draw_result import DrawResult
+from analysis.bet_placement import bet_rows, insert_bets
+from analysis.high_low_analyzer import HighLowAnalyzer
+from analysis.odd_even_analyzer import OddEvenAnalyzer
+from analysis.smart_pick_engine import SmartPickEngine
+
+logger = logging.getLogger(__name__)
+
+STRATEGIES = ("smart_pick", "high_low", "odd_even")
+SMART_PICK_COUNT = 10
+MAX_STAR_LEVEL = 8  # star_combos 取自前 8 個推薦號碼
+MAX_COMBOS = 5
+
+GroupKey = Tuple[str, int, Optional[int]]
+
+
+def _group_key(sub: AutoBetSubscription) -> GroupKey:
+    return (sub.strategy, sub.period_range, sub.star_level if sub.strategy == "smart_pick" else None)
+
+
+def _compute_picks(db: Session, key: GroupKey) -> List[Dict]:
+    """一組參數的投注規格（每筆含 bet_type / star_level / selected_numbers / selected_option）"""
+    strategy, period_range, star_level = key
+    if strategy == "smart_pick":
+        combos = SmartPickEngine(db).pick(period_range, pick_count=SMART_PICK_COUNT, star_level=star_level)["star_combos"]
+        return [
+            {"bet_type": "basic", "star_level": star_level, "selected_numbers": combo}
+            for combo in combos
+            if len(combo) == star_level
+        ]
+    analyzer = HighLowAnalyzer if strategy == "high_low" else OddEvenAnalyzer
+    prediction = analyzer(db).analyze(period_range)["prediction"]
+    return [{"bet_type": strategy, "selected_option": prediction}] if prediction else []
+
+
+def run_auto_bets(db: Session) -> Dict[str, int]:
+    """為下一期執行所有進行中的訂閱；同一期不會重複下注。回傳統計"""
+    latest = db.execute(select(DrawResult.draw_term).order_by(DrawResult.draw_term.desc()).limit(1)).scalar()
+    if not latest:
+        return {"subscriptions": 0, "groups": 0, "bets": 0}
+    target = str(int(latest) + 1)
+
+    subs = (
+        db.query(AutoBetSubscription)
+        .filter(AutoBetSubscription.status == "active")
+        .filter((AutoBetSubscription.last_term.is_(None)) | (AutoBetSubscription.last_term < target))
+        .all()
+    )
+    if not subs:
+        return {"subscriptions": 0, "groups": 0, "bets": 0}
+
+    groups: Dict[GroupKey, List[AutoBetSubscription]] = defaultdict(list)
+    for sub in subs:
+        groups[_group_key(sub)].append(sub)
+
+    now = datetime.utcnow()
+    rows: List[dict] = []
+    executed = 0
+    for key, members in groups.items():
+        picks = _compute_picks(db, key)
+        if not picks:
+            continue  # 資料不足，下一期再試
+        for sub in members:
+            for spec in picks[:sub.combo_count]:
+                rows.extend(bet_rows(sub.session_id, first_term=int(target), multiplier=sub.multiplier, now=now, **spec))
+            sub.last_term = target
+            sub.draws_done += 1
+            if sub.draws_done >= sub.draws_total:
+                sub.status = "finished"
+            executed += 1
+
+    insert_bets(db, rows)
+    db.commit()
+    if rows:
+        logger.info("自動投注: %d 個訂閱 (%d 組參數) 下注 %d 筆, 期號 %s", executed, len(groups), len(rows), target)
+    return {"subscriptions": executed, "groups": len(groups), "bets": len(rows)}
+
+
+def subscription_to_dict(sub: AutoBetSubscription) -> Dict:
+    return {
+        "id": sub.id,
+        "strategy": sub.strategy,
+        "period_range": sub.period_range,
+        "star_level": sub.star_level,
+        "combo_count": sub.combo_count,
+        "multiplier": sub.multiplier,
+        "draws_total": sub.draws_total,
+        "draws_done": sub.draws_done,
+        "status": sub.status,
+        "last_term": sub.last_term,
+        "created_at": (sub.created_at.isoformat() + "Z") if sub.created_at else None,
+    }
@@ -1,11 +1,14 @@
-import math
 from collections import Counter
-from typing import Dict, List, Set
+from typing import Dict, List, Optional, Set
 from sqlalchemy.orm import Session
 
 from app.models.draw_result import DrawResult
+from analysis import draw_numbers
+from analysis.hot_scores import get_hot_scores
+from analysis.number_index import NUMBERS, NumberIndex, get_number_index
 
-DECAY_RATE = 0.05
+DECAY_RATE = 0.05  # must be one of hot_scores.RATES
+STREAK_PAGE = 8  # draws fetched per step when following consecutive hits
 
 
 class BasicAnalyzer:
@@ -20,12 +23,14 @@ class BasicAnalyzer:
         top_n: int = 10,
         use_weighted: bool = True,
     ) -> Dict:
+        if draw_numbers.pushdown_enabled():
+            return self._analyze_pushdown(period_range, top_n, use_weighted)
         draws = self._fetch_draws(period_range)
         if not draws:
             return self._empty_result()
 
         freq = (
-            self._weighted_frequency(draws)
+            self._hot_frequency(draws)
             if use_weighted
             else self._simple_frequency(draws)
         )
@@ -44,14 +49,127 @@ class BasicAnalyzer:
             "method": "weighted" if use_weighted else "simple",
         }
 
+    def _analyze_pushdown(self, period_range: int, top_n: int, use_weighted: bool) -> Dict:
+        """
+        同 analyze：次數與最近開出期別由 draw_numbers 分組計算，
+        只載入追蹤連續開出所需的最新幾期
+        """
+        total = draw_numbers.window_size(self.db, period_range)
+        if not total:
+            return self._empty_result()
+
+        stats = draw_numbers.number_stats(self.db, period_range)
+        # analyze() meets numbers newest draw first, then in number order
+        seen = sorted(stats, key=lambda n: (-stats[n][1], n))
+        if use_weighted:
+            hot = get_hot_scores(self.db).scores(DECAY_RATE)
+            freq = {f"{n:02d}": hot[f"{n:02d}"] for n in seen}
+        else:
+            freq = {f"{n:02d}": stats[n][0] for n in seen}
+        top = sorted(freq.items(), key=lambda x: x[1], reverse=True)[:top_n]
+
+        expected_value = total * 20 / 80
+        all_stats = {}
+        for n in range(1, 81):
+            count, last = stats.get(n, (0, None))
+            all_stats[f"{n:02d}"] = {
+                "count": count,
+                "pct": round(count / total * 100, 2),
+                "last_term": str(last) if last is not None else None,
+                "expected_value": round(expected_value, 2),
+                "deviation_pct": round((count - expected_value) / expected_value * 100, 2),
+            }
+
+        recent = self._fetch_streak_draws(total)
+        return {
+            "predictions": top,
+            "all_stats": all_stats,
+            "repeat_info": self._repeat_tracking(recent),
+            "consecutive_hits": self._consecutive_draw_tracking(recent),
+            "period_range": total,
+            "method": "weighted" if use_weighted else "simple",
+        }
+
     def batch_analyze(
         self,
         period_ranges: List[int] = [10, 20, 30, 50, 100],
         top_n: int = 10,
         use_weighted: bool = True,
     ) -> Dict[int, Dict]:
+        """多個期數區間一次計算：走記憶體號碼索引，不重複查詢資料庫"""
+        index = get_number_index(self.db)
+        hot = get_hot_scores(self.db).scores(DECAY_RATE) if use_weighted else None
+        with index.lock:
+            return {
+                p: self._analyze_indexed(index, hot, p, top_n)
+                for p in period_ranges
+            }
+
+    def _analyze_indexed(
+        self, index: NumberIndex, hot: Optional[Dict[str, float]], period_range: int, top_n: int
+    ) -> Dict:
+        """Same result as `analyze`, from prefix sums + position arrays."""
+        total = len(index)
+        start = index.window_start(period_range)
+        size = total - start
+        if not size:
+            return self._empty_result()
+
+        counts = index.window_counts(start, total)
+        last_pos = {}
+        for n in NUMBERS:
+            pos = index.last_seen(n)
+            if pos is not None and pos >= start:
+                last_pos[n] = pos
+
+        if hot is not None:
+            scores = {n: hot[f"{n:02d}"] for n in last_pos}
+        else:
+            scores = {n: counts[n - 1] for n in last_pos}
+        # analyze() breaks ties by first encounter (newest draw, then number)
+        ranked = sorted(last_pos, key=lambda n: (-scores[n], -last_pos[n], n))
+        top = [(f"{n:02d}", scores[n]) for n in ranked[:top_n]]
+
+        expected_value = size * 20 / 80
+        all_stats = {}
+        for n in NUMBERS:
+            count = counts[n - 1]
+            all_stats[f"{n:02d}"] = {
+                "count": count,
+                "pct": round(count / size * 100, 2),
+                "last_term": str(index.terms[last_pos[n]]) if n in last_pos else None,
+                "expected_value": round(expected_value, 2),
+                "deviation_pct": round((count - expected_value) / expected_value * 100, 2),
+            }
+
+        latest = index.numbers_at(total - 1)
+        if size < 2:
+            repeat_info = {"repeat_count": 0, "repeat_numbers": []}
+            consecutive_hits = []
+        else:
+            repeats = [f"{n:02d}" for n in latest if index.contains(n, total - 2)]
+            repeat_info = {
+                "repeat_count": len(repeats),
+                "repeat_numbers": repeats,
+                "latest_term": str(index.terms[total - 1]),
+                "previous_term": str(index.terms[total - 2]),
+            }
+            consecutive_hits = []
+            for n in latest:
+                streak = 1
+                while total - 1 - streak >= start and index.contains(n, total - 1 - streak):
+                    streak += 1
+                if streak >= 2:
+                    consecutive_hits.append({"number": f"{n:02d}", "consecutive_draws": streak})
+            consecutive_hits.sort(key=lambda x: x["consecutive_draws"], reverse=True)
+
         return {
-            p: self.analyze(p, top_n, use_weighted) for p in period_ranges
+            "predictions": top,
+            "all_stats": all_stats,
+            "repeat_info": repeat_info,
+            "consecutive_hits": consecutive_hits,
+            "period_range": size,
+            "method": "weighted" if hot is not None else "simple",
         }
 
     # ─── Algorithms ───────────────────────────────────────
@@ -62,13 +180,17 @@ class BasicAnalyzer:
             counter.update(draw.numbers_sorted.split(","))
         return dict(counter)
 
-    def _weighted_frequency(self, draws) -> Dict[str, float]:
-        """指數衰減加權：weight = e^(-DECAY_RATE * idx)"""
+    def _hot_frequency(self, draws) -> Dict[str, float]:
+        """
+        指數衰減加權：weight = e^(-DECAY_RATE * idx)，直接讀取維護中的 EWMA 熱度。
+        視窗內出現過的號碼為候選，分數包含視窗外更早期（已衰減）的貢獻。
+        """
+        hot = get_hot_scores(self.db).scores(DECAY_RATE)
         freq: Dict[str, float] = {}
-        for idx, draw in enumerate(draws):
-            weight = math.exp(-DECAY_RATE * idx)
+        for draw in draws:
             for num in draw.numbers_sorted.split(","):
-                freq[num] = freq.get(num, 0.0) + weight
+                if num not in freq:
+                    freq[num] = hot[num]
         return freq
 
     def _repeat_tracking(self, draws) -> Dict:
@@ -120,6 +242,27 @@ class BasicAnalyzer:
             .all()
         )
 
+    def _fetch_streak_draws(self, limit: int):
+        """最新幾期，直到沒有號碼能再延續連續開出（最多 limit 期）"""
+        draws, streaking = [], None
+        while len(draws) < limit:
+            page = (
+                self.db.query(DrawResult)
+                .order_by(DrawResult.draw_term.desc())
+                .offset(len(draws))
+                .limit(min(STREAK_PAGE, limit - len(draws)))
+                .all()
+            )
+            if not page:
+                break
+            for draw in page:
+                numbers = set(draw.get_numbers_list())
+                streaking = numbers if streaking is None else streaking & numbers
+            draws.extend(page)
+            if len(draws) >= 2 and not streaking:
+                break
+        return draws
+
     def _build_all_stats(self, draws, total: int) -> Dict:
         expected_value = total * 20 / 80
 
@@ -0,0 +1,56 @@
+"""
+下注寫入：把投注規格展開成 simulated_bets 列，並以單一 INSERT ... RETURNING 寫入。
+API（單筆 / 批次下注）與自動投注排程共用。
+"""
+from datetime import datetime
+from typing import List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.simulated_bet import SimulatedBet
+
+BET_AMOUNT = 25
+
+
+def bet_rows(
+    session_id: str,
+    bet_type: str,
+    first_term: int,
+    *,
+    star_level: Optional[int] = None,
+    selected_numbers: Optional[List[str]] = None,
+    selected_option: Optional[str] = None,
+    multiplier: int = 1,
+    bet_periods: int = 1,
+    now: Optional[datetime] = None,
+) -> List[dict]:
+    """一個投注規格 → 每期一列（first_term 起連續 bet_periods 期）"""
+    now = now or datetime.utcnow()
+    numbers_str = ",".join(selected_numbers) if selected_numbers else None
+    return [
+        {
+            "session_id": session_id,
+            "bet_type": bet_type,
+            "star_level": star_level,
+            "selected_numbers": numbers_str,
+            "selected_option": selected_option,
+            "bet_amount": BET_AMOUNT,
+            "multiplier": multiplier,
+            "target_draw_term": str(first_term + i),
+            "status": "pending",
+            "prize_amount": 0,
+            "net_profit": 0,
+            "created_at": now,
+        }
+        for i in range(bet_periods)
+    ]
+
+
+def insert_bets(db: Session, rows: List[dict]):
+    """Multi-row INSERT ... RETURNING in one statement; rows come back in input order."""
+    if not rows:
+        return []
+    table = SimulatedBet.__table__
+    stmt = insert(table).returning(*table.c, sort_by_parameter_order=True)
+    return db.execute(stmt, rows).all()
@@ -2,6 +2,7 @@
 兌獎引擎：比對投注與開獎結果，計算獎金。
 """
 import logging
+import time
 from datetime import datetime
 from typing import List
 
@@ -9,6 +10,7 @@ from sqlalchemy.orm import Session
 
 from app.models.draw_result import DrawResult
 from app.models.simulated_bet import SimulatedBet
+from app.metrics import BETS_SETTLED, SETTLEMENT_BATCH_SIZE, SETTLEMENT_DURATION
 from analysis.payout_table import calculate_prize
 
 logger = logging.getLogger(__name__)
@@ -95,6 +97,7 @@ def auto_settle_all(db: Session, draw: DrawResult, *, session_id: str | None = N
     """
     from sqlalchemy import or_
 
+    started = time.perf_counter()
     filters = [
         SimulatedBet.status == "pending",
         or_(
@@ -112,18 +115,24 @@ def auto_settle_all(db: Session, draw: DrawResult, *, session_id: str | None = N
         .all()
     )
 
+    SETTLEMENT_BATCH_SIZE.observe(len(pending_bets))
     if not pending_bets:
         return 0
 
     settled = 0
+    won = 0
     for bet in pending_bets:
         try:
             settle_bet(bet, draw)
             settled += 1
+            won += bet.status == "won"
         except Exception:
             logger.exception("Failed to settle bet id=%s", bet.id)
 
     db.commit()
+    SETTLEMENT_DURATION.observe(time.perf_counter() - started)
+    BETS_SETTLED.inc(won, status="won")
+    BETS_SETTLED.inc(settled - won, status="lost")
     logger.info(
         "Auto-settled %d/%d bets against draw %s",
         settled,
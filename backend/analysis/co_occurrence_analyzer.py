@@ -1,16 +1,18 @@
 from collections import Counter
 from itertools import combinations
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
 from sqlalchemy.orm import Session
 
 from app.models.draw_result import DrawResult
+from analysis import draw_numbers
 
 
 class CoOccurrenceAnalyzer:
     """共現分析：統計兩兩號碼在同一期同時出現的頻率"""
 
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Optional[Session], draws: Optional[Sequence] = None):
         self.db = db_session
+        self.draws = draws  # preloaded window, newest first (see analysis.offload)
 
     def analyze(
         self,
@@ -18,6 +20,8 @@ class CoOccurrenceAnalyzer:
         top_n: int = 15,
         target_number: Optional[str] = None,
     ) -> Dict:
+        if self.draws is None and draw_numbers.pushdown_enabled():
+            return self._analyze_pushdown(period_range, top_n, target_number)
         draws = self._fetch_draws(period_range)
         if not draws:
             return self._empty_result()
@@ -72,7 +76,29 @@ class CoOccurrenceAnalyzer:
 
         return result
 
+    def _analyze_pushdown(self, period_range: int, top_n: int, target_number: Optional[str]) -> Dict:
+        """同 analyze，號碼對以 draw_numbers 自我 join 分組計數"""
+        total = draw_numbers.window_size(self.db, period_range)
+        if not total:
+            return self._empty_result()
+
+        top_pairs = [
+            dict(p, co_rate=round(p["count"] / total * 100, 2))
+            for p in draw_numbers.pair_counts(self.db, period_range, top_n)
+        ]
+        result = {"top_pairs": top_pairs, "period_range": total}
+        if target_number is not None:
+            target = target_number.zfill(2)
+            result["target_number"] = target
+            result["target_partners"] = [
+                dict(p, co_rate=round(p["count"] / total * 100, 2))
+                for p in draw_numbers.partner_counts(self.db, period_range, int(target))
+            ]
+        return result
+
     def _fetch_draws(self, limit: int):
+        if self.draws is not None:
+            return list(self.draws[:limit])
         return (
             self.db.query(DrawResult)
             .order_by(DrawResult.draw_term.desc())
@@ -1,5 +1,5 @@
 from collections import Counter
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence
 from sqlalchemy.orm import Session
 
 from app.models.draw_result import DrawResult
@@ -10,8 +10,9 @@ ALL_NUMBERS = [f"{i:02d}" for i in range(1, 81)]
 class ColdHotCycleAnalyzer:
     """冷熱週期分析：追蹤每個號碼的出現間隔、連莊、冷熱狀態"""
 
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Optional[Session], draws: Optional[Sequence] = None):
         self.db = db_session
+        self.draws = draws  # preloaded window, newest first (see analysis.offload)
 
     def analyze(
         self,
@@ -58,28 +59,33 @@ class ColdHotCycleAnalyzer:
             current_gap = last_seen.get(n, total)
             all_gaps = gaps[n]
             appear_count = len(all_gaps) + (1 if n in last_seen else 0)
-            avg_interval = round(total / appear_count, 2) if appear_count > 0 else total
             max_gap = max(all_gaps) if all_gaps else current_gap
-
-            if appear_count == 0:
-                phase = "inactive"
-            elif current_gap <= avg_interval * 0.5:
-                phase = "hot"
-            elif current_gap >= avg_interval * 1.5:
-                phase = "cold"
-            else:
-                phase = "normal"
-
-            stats[n] = {
-                "appear_count": appear_count,
-                "avg_interval": avg_interval,
-                "max_gap": max_gap,
-                "current_gap": current_gap,
-                "phase": phase,
-            }
+            stats[n] = self.number_stat(total, appear_count, current_gap, max_gap)
 
         return stats
 
+    @staticmethod
+    def number_stat(total: int, appear_count: int, current_gap: int, max_gap: int) -> Dict:
+        """單一號碼的平均間隔與冷熱狀態（Python 與 DuckDB 引擎共用）"""
+        avg_interval = round(total / appear_count, 2) if appear_count > 0 else total
+
+        if appear_count == 0:
+            phase = "inactive"
+        elif current_gap <= avg_interval * 0.5:
+            phase = "hot"
+        elif current_gap >= avg_interval * 1.5:
+            phase = "cold"
+        else:
+            phase = "normal"
+
+        return {
+            "appear_count": appear_count,
+            "avg_interval": avg_interval,
+            "max_gap": max_gap,
+            "current_gap": current_gap,
+            "phase": phase,
+        }
+
     def _get_recent_hot(self, recent_draws, top_n: int) -> List[Dict]:
         counter = Counter()
         for draw in recent_draws:
@@ -130,9 +136,12 @@ class ColdHotCycleAnalyzer:
             for n, s in streaks.items()
             if s >= 2
         ]
-        return sorted(streak_list, key=lambda x: x["streak"], reverse=True)
+        # 同連莊期數依號碼排序，結果不受 set 迭代順序影響（各 pool 程序 hash seed 不同）
+        return sorted(streak_list, key=lambda x: (-x["streak"], x["number"]))
 
     def _fetch_draws(self, limit: int):
+        if self.draws is not None:
+            return list(self.draws[:limit])
         return (
             self.db.query(DrawResult)
             .order_by(DrawResult.draw_term.desc())
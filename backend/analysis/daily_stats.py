@@ -0,0 +1,187 @@
+"""
+每日彙總統計：入庫時維護 `daily_draw_stats`（每天一列），
+長期間（最近 7 / 30 / 365 天或自訂日期區間）的統計只需加總數百列，不必掃描數萬期。
+"""
+import json
+import logging
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.daily_draw_stats import DailyDrawStats
+from app.models.draw_result import DrawResult
+from analysis.zone_distribution_analyzer import ZONES
+
+logger = logging.getLogger(__name__)
+
+_draws = DrawResult.__table__
+
+
+# ─── Maintenance ──────────────────────────────────────────
+
+
+def _aggregate_day(db: Session, day: date) -> Optional[DailyDrawStats]:
+    """以 draw_date 重算某一天（與髒日期判斷同一鍵；無資料回傳 None）"""
+    rows = db.execute(
+        select(
+            _draws.c.draw_term, _draws.c.numbers_sorted, _draws.c.super_number,
+            _draws.c.high_low_result, _draws.c.odd_even_result, _draws.c.high_count, _draws.c.odd_count,
+        )
+        .where(_draws.c.draw_date == day)
+        .order_by(_draws.c.draw_term)
+    ).all()
+    if not rows:
+        return None
+
+    numbers = [0] * 80
+    supers = [0] * 80
+    tails = [0] * 10
+    zones = {z: 0 for z in ZONES}
+    pairs = [0] * 79
+    stats = DailyDrawStats(
+        day=day, draws=len(rows), first_term=rows[0].draw_term, last_term=rows[-1].draw_term,
+        high_draws=0, low_draws=0, high_low_ties=0, odd_draws=0, even_draws=0, odd_even_ties=0,
+        high_count_sum=0, odd_count_sum=0,
+    )
+    for r in rows:
+        nums = [int(n) for n in r.numbers_sorted.split(",")]
+        present = set(nums)
+        for n in nums:
+            numbers[n - 1] += 1
+            tails[n % 10] += 1
+            if n < 80 and n + 1 in present:
+                pairs[n - 1] += 1
+        for zone, (lo, hi) in ZONES.items():
+            zones[zone] += sum(1 for n in nums if lo <= n <= hi)
+        supers[int(r.super_number) - 1] += 1
+        stats.high_draws += r.high_low_result == "大"
+        stats.low_draws += r.high_low_result == "小"
+        stats.high_low_ties += r.high_low_result not in ("大", "小")
+        stats.odd_draws += r.odd_even_result == "單"
+        stats.even_draws += r.odd_even_result == "雙"
+        stats.odd_even_ties += r.odd_even_result not in ("單", "雙")
+        stats.high_count_sum += r.high_count or 0
+        stats.odd_count_sum += r.odd_count or 0
+
+    stats.number_counts = json.dumps(numbers)
+    stats.super_counts = json.dumps(supers)
+    stats.tail_counts = json.dumps(tails)
+    stats.zone_counts = json.dumps(zones)
+    stats.consecutive_pairs = json.dumps(pairs)
+    return stats
+
+
+def _rebuild_days(db: Session, days: Iterable[date]) -> int:
+    rebuilt = 0
+    for day in sorted(set(days)):
+        db.query(DailyDrawStats).filter(DailyDrawStats.day == day).delete()
+        stats = _aggregate_day(db, day)
+        if stats is not None:
+            db.add(stats)
+            rebuilt += 1
+    db.commit()
+    return rebuilt
+
+
+def refresh_daily_stats(db: Session, full: bool = False) -> int:
+    """
+    重算有新資料的日期（期號大於已彙總的最大期號）。
+    full=True 時比對每日期數，連回補的舊日期一併重算。回傳重算天數
+    """
+    last_term = db.execute(select(func.max(DailyDrawStats.last_term))).scalar()
+    if full or last_term is None:
+        actual = dict(db.execute(select(_draws.c.draw_date, func.count()).group_by(_draws.c.draw_date)).all())
+        stored = dict(db.execute(select(DailyDrawStats.day, DailyDrawStats.draws)).all())
+        dirty = [d for d, n in actual.items() if stored.get(d) != n] + [d for d in stored if d not in actual]
+    else:
+        dirty = db.execute(
+            select(_draws.c.draw_date).where(_draws.c.draw_term > last_term).distinct()
+        ).scalars().all()
+    rebuilt = _rebuild_days(db, dirty)
+    if rebuilt:
+        logger.info("每日彙總: 重算 %d 天", rebuilt)
+    return rebuilt
+
+
+# ─── Queries ──────────────────────────────────────────────
+
+
+def _sum_lists(rows: List[DailyDrawStats], attr: str, size: int) -> List[int]:
+    total = [0] * size
+    for r in rows:
+        for i, v in enumerate(json.loads(getattr(r, attr))):
+            total[i] += v
+    return total
+
+
+def window_stats(
+    db: Session,
+    days: Optional[int] = None,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    top_n: int = 10,
+) -> Dict:
+    """最近 days 天（以最後有資料的日期為終點）或 [from_date, to_date] 的彙總統計"""
+    if days is not None:
+        to_date = to_date or db.execute(select(func.max(DailyDrawStats.day))).scalar()
+        from_date = to_date - timedelta(days=days - 1) if to_date else None
+    query = db.query(DailyDrawStats)
+    if from_date:
+        query = query.filter(DailyDrawStats.day >= from_date)
+    if to_date:
+        query = query.filter(DailyDrawStats.day <= to_date)
+    rows = query.order_by(DailyDrawStats.day).all()
+
+    draws = sum(r.draws for r in rows)
+    result = {
+        "from_date": rows[0].day.isoformat() if rows else (from_date.isoformat() if from_date else None),
+        "to_date": rows[-1].day.isoformat() if rows else (to_date.isoformat() if to_date else None),
+        "days": len(rows),
+        "draws": draws,
+        "first_term": rows[0].first_term if rows else None,
+        "last_term": rows[-1].last_term if rows else None,
+    }
+    if not draws:
+        return result
+
+    numbers = _sum_lists(rows, "number_counts", 80)
+    supers = _sum_lists(rows, "super_counts", 80)
+    tails = _sum_lists(rows, "tail_counts", 10)
+    pairs = _sum_lists(rows, "consecutive_pairs", 79)
+    zones = {z: sum(json.loads(r.zone_counts)[z] for r in rows) for z in ZONES}
+
+    def ranked(counts: List[int]) -> List[Dict]:
+        order = sorted(range(80), key=lambda i: (-counts[i], i))
+        return [
+            {"number": f"{i + 1:02d}", "count": counts[i], "rate": round(counts[i] / draws * 100, 2)}
+            for i in order
+        ]
+
+    result.update({
+        "numbers": ranked(numbers),
+        "super_numbers": ranked(supers)[:top_n],
+        "high_low": {
+            "大": sum(r.high_draws for r in rows),
+            "小": sum(r.low_draws for r in rows),
+            "－": sum(r.high_low_ties for r in rows),
+            "avg_high_count": round(sum(r.high_count_sum for r in rows) / draws, 2),
+        },
+        "odd_even": {
+            "單": sum(r.odd_draws for r in rows),
+            "雙": sum(r.even_draws for r in rows),
+            "－": sum(r.odd_even_ties for r in rows),
+            "avg_odd_count": round(sum(r.odd_count_sum for r in rows) / draws, 2),
+        },
+        "zones": {
+            z: {"range": f"{lo}-{hi}", "total_count": zones[z], "avg_per_draw": round(zones[z] / draws, 2)}
+            for z, (lo, hi) in ZONES.items()
+        },
+        "tails": {str(t): tails[t] for t in range(10)},
+        "consecutive_pairs": [
+            {"pair": [f"{i + 1:02d}", f"{i + 2:02d}"], "count": pairs[i]}
+            for i in sorted(range(79), key=lambda i: (-pairs[i], i))[:top_n]
+        ],
+    })
+    return result
@@ -0,0 +1,134 @@
+"""
+Shared machinery for in-memory structures built from `draw_results` in term
+order (NumberIndex, TrendSeries, ...).
+
+Each structure is built once per process and engine, then caught up on every
+read with one primary-key range query. The scheduler also syncs after ingest.
+With DRAW_STORE_PATH set, the initial build reads the binary history file and
+only the newer tail comes from SQL.
+If a draw older than the newest indexed term shows up (a historical backfill)
+or the table shrinks, the structure is rebuilt from scratch.
+"""
+import threading
+from abc import ABC, abstractmethod
+from array import array
+from typing import Callable, Dict, Tuple, TypeVar
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.metrics import record_cache
+from app.models.draw_result import DrawResult
+from storage.binary_store import StoredDraw, open_matching_view
+
+SYNC_BATCH = 10_000
+
+_table = DrawResult.__table__
+
+
+class IncrementalDrawIndex(ABC):
+    """Subclasses list the extra `columns` they need and implement `_clear` / `_append_row`."""
+
+    columns: Tuple[str, ...] = ()
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.terms = array("I")  # position → draw term
+        self._last_id = 0
+        self._clear()
+
+    @abstractmethod
+    def _clear(self):
+        """Drop all derived state (called on build and rebuild)."""
+
+    @abstractmethod
+    def _append_row(self, row):
+        """Consume one draw; its position is len(self.terms) - 1."""
+
+    def _append_stored(self, draw: StoredDraw):
+        """Consume one binary-store record; override when the raw fields are cheaper."""
+        self._append_row(draw)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def window_start(self, window) -> int:
+        """First position of the newest `window` draws (None = whole history)."""
+        total = len(self.terms)
+        return 0 if window is None else max(total - window, 0)
+
+    def _bootstrap(self, db: Session) -> int:
+        """Load every draw in the binary history file, if it matches the DB. Returns draws loaded."""
+        view = open_matching_view(db)
+        if view is None:
+            return 0
+        try:
+            for i in range(len(view)):
+                draw = view[i]
+                self.terms.append(draw.term)
+                self._append_stored(draw)
+        finally:
+            view.close()
+        self._last_id = db.execute(
+            select(func.max(_table.c.id)).where(_table.c.draw_term <= str(self.terms[-1]))
+        ).scalar() or 0
+        return len(self.terms)
+
+    def sync(self, db: Session) -> int:
+        """Consume draws inserted since the last sync. Returns draws added."""
+        with self.lock:
+            max_id = db.execute(select(func.max(_table.c.id))).scalar() or 0
+            if max_id < self._last_id:
+                self._reset()  # table was truncated / recreated
+            cols = [_table.c.id, _table.c.draw_term] + [_table.c[c] for c in self.columns]
+            added = 0 if self.terms else self._bootstrap(db)
+            # After a bootstrap the tail is selected by term, not by id
+            since_id = 0 if added else self._last_id
+            while True:
+                stmt = (
+                    select(*cols)
+                    .where(_table.c.id > since_id)
+                    .order_by(_table.c.draw_term)
+                    .limit(SYNC_BATCH)
+                )
+                if added:
+                    stmt = stmt.where(_table.c.draw_term > str(self.terms[-1]))
+                rows = db.execute(stmt).all()
+                if not rows:
+                    return added
+                if not added and self.terms and int(rows[0].draw_term) <= self.terms[-1]:
+                    self._reset()  # out-of-order backfill: rebuild in term order
+                    since_id = 0
+                    continue
+                for row in rows:
+                    self.terms.append(int(row.draw_term))
+                    self._append_row(row)
+                    self._last_id = max(self._last_id, row.id)
+                added += len(rows)
+
+
+T = TypeVar("T", bound=IncrementalDrawIndex)
+
+_registry: "WeakKeyDictionary" = WeakKeyDictionary()
+_registry_lock = threading.Lock()
+
+
+def get_synced(db: Session, key: str, factory: Callable[[], T], cache: str) -> T:
+    """
+    Process-wide instance `key` for the session's engine, caught up with the DB.
+    Counted as a `cache` hit when it was already built and current.
+    """
+    engine = db.get_bind()
+    with _registry_lock:
+        instances: Dict[str, IncrementalDrawIndex] = _registry.setdefault(engine, {})
+        instance = instances.get(key)
+        created = instance is None
+        if created:
+            instance = instances[key] = factory()
+    added = instance.sync(db)
+    record_cache(cache, not created and not added)
+    return instance
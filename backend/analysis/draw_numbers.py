@@ -0,0 +1,223 @@
+"""
+正規化號碼表 `draw_numbers`：每期 20 列（期號、號碼、開出順序、是否超級獎號）。
+
+入庫時同步寫入，舊資料以 `backfill_draw_numbers` 線上分批回補。
+基本頻率、超級獎號、尾數、區間與號碼對統計都能以有索引的 `GROUP BY` 在資料庫端完成，
+SQLite 與 Postgres 皆可執行。
+
+ANALYTICS_SQL_PUSHDOWN=true 時，基本、超級獎號、尾數、區間與共現分析改用這些查詢，
+結果（含同分排序）與逐期載入計算相同。需先完成回補。
+"""
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, case, exists, func, insert, select
+from sqlalchemy.orm import Session, aliased
+
+from app.config import settings
+from app.models.draw_number import DrawNumber
+from app.models.draw_result import DrawResult
+from analysis.zone_distribution_analyzer import ZONES
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 2000
+
+_numbers = DrawNumber.__table__
+_draws = DrawResult.__table__
+
+
+# ─── Write ────────────────────────────────────────────────
+
+
+def number_rows(draw_term: str, numbers_sequence: str, super_number: str) -> List[Dict]:
+    """一期開獎對應的 draw_numbers 列"""
+    term = int(draw_term)
+    super_n = int(super_number)
+    return [
+        {"term_number": term, "draw_position": pos, "number": n, "is_super": n == super_n}
+        for pos, n in enumerate((int(x) for x in numbers_sequence.split(",")), start=1)
+    ]
+
+
+def insert_number_rows(db: Session, draws) -> int:
+    """寫入多期的號碼列（不 commit，與開獎資料同一交易）"""
+    rows = [r for d in draws for r in number_rows(d["draw_term"], d["numbers_sequence"], d["super_number"])]
+    if rows:
+        db.execute(insert(_numbers), rows)
+    return len(rows)
+
+
+def backfill_draw_numbers(db: Session, batch_size: int = BACKFILL_BATCH_SIZE, pause: float = 0.0) -> int:
+    """
+    回補尚無號碼列的期別，依期號分批、每批獨立交易，不長時間阻擋爬蟲寫入。
+    回傳回補期數
+    """
+    missing = ~exists().where(_numbers.c.term_number == _draws.c.term_number)
+    cursor, filled = -1, 0
+    while True:
+        batch = db.execute(
+            select(_draws.c.term_number, _draws.c.draw_term, _draws.c.numbers_sequence, _draws.c.super_number)
+            .where(_draws.c.term_number > cursor, missing)
+            .order_by(_draws.c.term_number)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            break
+        insert_number_rows(db, [r._mapping for r in batch])
+        db.commit()
+        cursor = batch[-1].term_number
+        filled += len(batch)
+        if pause:
+            time.sleep(pause)
+    if filled:
+        logger.info("號碼表回補: %d 期", filled)
+    return filled
+
+
+# ─── Query pushdown ───────────────────────────────────────
+
+
+def pushdown_enabled() -> bool:
+    return settings.ANALYTICS_SQL_PUSHDOWN
+
+
+def window_start(db: Session, period_range: int) -> Optional[int]:
+    """最近 period_range 期中最舊一期的 term_number（無資料回傳 None）"""
+    return db.execute(
+        select(_draws.c.term_number).order_by(_draws.c.term_number.desc()).offset(period_range - 1).limit(1)
+    ).scalar() or db.execute(select(func.min(_draws.c.term_number))).scalar()
+
+
+def window_size(db: Session, period_range: int) -> int:
+    """最近 period_range 期實際的期數（資料不足時小於 period_range）"""
+    start = window_start(db, period_range)
+    if start is None:
+        return 0
+    return db.execute(select(func.count()).select_from(_draws).where(_draws.c.term_number >= start)).scalar()
+
+
+def _grouped(db: Session, key, period_range: int, *where) -> Dict:
+    start = window_start(db, period_range)
+    if start is None:
+        return {}
+    rows = db.execute(
+        select(key.label("k"), func.count().label("n"))
+        .where(_numbers.c.term_number >= start, *where)
+        .group_by(key)
+    ).all()
+    return {r.k: r.n for r in rows}
+
+
+def number_frequency(db: Session, period_range: int) -> Dict[str, int]:
+    """最近 period_range 期各號碼出現次數"""
+    counts = _grouped(db, _numbers.c.number, period_range)
+    return {f"{n:02d}": counts.get(n, 0) for n in range(1, 81)}
+
+
+def super_frequency(db: Session, period_range: int) -> Dict[str, int]:
+    """最近 period_range 期各號碼成為超級獎號的次數"""
+    counts = _grouped(db, _numbers.c.number, period_range, _numbers.c.is_super.is_(True))
+    return {f"{n:02d}": counts.get(n, 0) for n in range(1, 81)}
+
+
+def tail_counts(db: Session, period_range: int) -> Dict[str, int]:
+    """最近 period_range 期各尾數（0-9）出現次數"""
+    counts = _grouped(db, _numbers.c.number % 10, period_range)
+    return {str(t): counts.get(t, 0) for t in range(10)}
+
+
+def zone_counts(db: Session, period_range: int) -> Dict[str, int]:
+    """最近 period_range 期各區間（A-D）出現次數"""
+    zone = case(*[(_numbers.c.number.between(lo, hi), z) for z, (lo, hi) in ZONES.items()])
+    counts = _grouped(db, zone, period_range)
+    return {z: counts.get(z, 0) for z in ZONES}
+
+
+def number_stats(db: Session, period_range: int, super_only: bool = False) -> Dict[int, Tuple[int, int]]:
+    """最近 period_range 期開出過的號碼 -> (次數, 最近一次的 term_number)"""
+    start = window_start(db, period_range)
+    if start is None:
+        return {}
+    query = (
+        select(_numbers.c.number, func.count().label("n"), func.max(_numbers.c.term_number).label("last"))
+        .where(_numbers.c.term_number >= start)
+        .group_by(_numbers.c.number)
+    )
+    if super_only:
+        query = query.where(_numbers.c.is_super.is_(True))
+    return {r.number: (r.n, r.last) for r in db.execute(query)}
+
+
+def high_tail_draws(db: Session, period_range: int, threshold: int = 5) -> int:
+    """最近 period_range 期中，同一尾數開出至少 threshold 個號碼的期數"""
+    start = window_start(db, period_range)
+    if start is None:
+        return 0
+    heavy = (
+        select(_numbers.c.term_number)
+        .where(_numbers.c.term_number >= start)
+        .group_by(_numbers.c.term_number, _numbers.c.number % 10)
+        .having(func.count() >= threshold)
+        .subquery()
+    )
+    return db.execute(select(func.count(func.distinct(heavy.c.term_number)))).scalar()
+
+
+def zone_counts_by_draw(db: Session, period_range: int) -> List[Tuple[int, Dict[str, int]]]:
+    """最近 period_range 期每期各區間號碼數，新到舊排列"""
+    start = window_start(db, period_range)
+    if start is None:
+        return []
+    zone = case(*[(_numbers.c.number.between(lo, hi), z) for z, (lo, hi) in ZONES.items()])
+    rows = db.execute(
+        select(_numbers.c.term_number, zone.label("zone"), func.count().label("n"))
+        .where(_numbers.c.term_number >= start)
+        .group_by(_numbers.c.term_number, zone)
+    ).all()
+    by_term: Dict[int, Dict[str, int]] = {}
+    for r in rows:
+        by_term.setdefault(r.term_number, dict.fromkeys(ZONES, 0))[r.zone] = r.n
+    return sorted(by_term.items(), reverse=True)
+
+
+def pair_counts(db: Session, period_range: int, top_n: int = 15, consecutive: bool = False) -> List[Dict]:
+    """
+    最近 period_range 期同期開出次數最多的號碼對（consecutive=True 只算相鄰號碼）。
+    同分依最近同期開出的期別、再依號碼排序，與逐期計數的 Counter.most_common 一致
+    """
+    start = window_start(db, period_range)
+    if start is None:
+        return []
+    a, b = aliased(DrawNumber), aliased(DrawNumber)
+    pair_cond = b.number == a.number + 1 if consecutive else b.number > a.number
+    count = func.count().label("n")
+    rows = db.execute(
+        select(a.number, b.number, count)
+        .join(b, and_(b.term_number == a.term_number, pair_cond))
+        .where(a.term_number >= start)
+        .group_by(a.number, b.number)
+        .order_by(count.desc(), func.max(a.term_number).desc(), a.number, b.number)
+        .limit(top_n)
+    ).all()
+    return [{"pair": [f"{x:02d}", f"{y:02d}"], "count": n} for x, y, n in rows]
+
+
+def partner_counts(db: Session, period_range: int, target: int, top_n: int = 5) -> List[Dict]:
+    """最近 period_range 期與 target 同期開出次數最多的號碼（同分排序同 pair_counts）"""
+    start = window_start(db, period_range)
+    if start is None:
+        return []
+    a, b = aliased(DrawNumber), aliased(DrawNumber)
+    count = func.count().label("n")
+    rows = db.execute(
+        select(b.number, count)
+        .select_from(a)
+        .join(b, and_(b.term_number == a.term_number, b.number != a.number))
+        .where(a.term_number >= start, a.number == target)
+        .group_by(b.number)
+        .order_by(count.desc(), func.max(a.term_number).desc(), b.number)
+        .limit(top_n)
+    ).all()
+    return [{"partner": f"{n:02d}", "count": c} for n, c in rows]
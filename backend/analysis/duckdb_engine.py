@@ -0,0 +1,298 @@
+"""
+Optional DuckDB analytics engine over the draw history.
+
+The heavy analyzers are re-expressed as vectorized SQL (unnest + window
+functions) over a `draws(term, numbers, sequence, super_number)` view, newest
+draw first. DuckDB can read that view from three sources:
+
+- a Parquet export of `draw_results` (`scripts.draws_parquet export`), read natively;
+- the live SQLite database, attached read-only through DuckDB's sqlite extension
+  (downloaded by DuckDB on first use, or preinstalled for offline hosts);
+- a snapshot of a SQLAlchemy session, streamed in as Arrow batches (`from_session`).
+
+`co_occurrence` and `cold_hot_cycle` return exactly what the Python analyzers
+return, including the order of ties; only the final per-number formatting is
+shared Python code. With ANALYTICS_ENGINE=duckdb the API routes those two
+analyzers here (see `analysis.offload.run_offloaded`). DuckDB runs queries
+without holding the GIL, so no process pool is needed. `gap_distribution`,
+`triple_co_occurrence` and `position_stats` are long-range, ad-hoc queries with
+no Python counterpart.
+
+duckdb is optional (see requirements-extras.txt); it is imported on first use.
+"""
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from analysis.cold_hot_cycle_analyzer import ALL_NUMBERS, ColdHotCycleAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# Analyzers whose DuckDB implementation returns exactly the Python result
+SQL_ANALYZERS = ("co_occurrence", "cold_hot_cycle")
+
+_ALL = 2 ** 62  # LIMIT for "whole history"
+
+# Last `?` draws, newest first, with idx = 0 for the newest draw
+_WINDOW = """
+    w AS (
+        SELECT term, numbers, row_number() OVER (ORDER BY term DESC) - 1 AS idx
+        FROM draws ORDER BY term DESC LIMIT ?
+    ),
+    nums AS (SELECT idx, unnest(numbers) AS n FROM w)
+"""
+
+
+def _require_duckdb():
+    try:
+        import duckdb
+    except ImportError as e:  # pragma: no cover - depends on environment
+        raise RuntimeError(
+            "duckdb is required for ANALYTICS_ENGINE=duckdb: pip install -r requirements-extras.txt"
+        ) from e
+    return duckdb
+
+
+def _fmt(n: int) -> str:
+    return f"{n:02d}"
+
+
+class DuckDBEngine:
+    def __init__(self, source: str = "", con=None):
+        """`source`: a .parquet file or a SQLite database file."""
+        duckdb = _require_duckdb()
+        self.source = source
+        self._con = con or duckdb.connect()
+        if con is None:
+            if source.endswith(".parquet"):
+                self._con.execute(f"""
+                    CREATE VIEW draws AS
+                    SELECT draw_term AS term,
+                           CAST(numbers_sorted AS INTEGER[]) AS numbers,
+                           CAST(numbers_sequence AS INTEGER[]) AS sequence,
+                           CAST(super_number AS INTEGER) AS super_number
+                    FROM read_parquet('{_quote(source)}')
+                """)
+            else:
+                self._con.execute(f"ATTACH '{_quote(source)}' AS src (TYPE sqlite, READ_ONLY)")
+                self._con.execute("""
+                    CREATE VIEW draws AS
+                    SELECT CAST(draw_term AS BIGINT) AS term,
+                           list_transform(string_split(numbers_sorted, ','), x -> CAST(x AS INTEGER)) AS numbers,
+                           list_transform(string_split(numbers_sequence, ','), x -> CAST(x AS INTEGER)) AS sequence,
+                           CAST(super_number AS INTEGER) AS super_number
+                    FROM src.draw_results
+                """)
+
+    @classmethod
+    def from_session(cls, db: Session) -> "DuckDBEngine":
+        """Snapshot every draw visible to `db` into an in-memory DuckDB table."""
+        duckdb = _require_duckdb()
+        import pyarrow as pa
+
+        from storage.columnar import draw_schema, iter_record_batches
+
+        table = pa.Table.from_batches(list(iter_record_batches(db)), schema=draw_schema())
+        con = duckdb.connect()
+        con.register("draw_snapshot", table)
+        con.execute("""
+            CREATE TABLE draws AS
+            SELECT draw_term AS term,
+                   CAST(numbers_sorted AS INTEGER[]) AS numbers,
+                   CAST(numbers_sequence AS INTEGER[]) AS sequence,
+                   CAST(super_number AS INTEGER) AS super_number
+            FROM draw_snapshot
+        """)
+        con.unregister("draw_snapshot")
+        return cls("session", con=con)
+
+    def _query(self, sql: str, params: Optional[list] = None) -> List[tuple]:
+        # One cursor per call: a DuckDB connection is not safe to share across threads
+        with self._con.cursor() as cur:
+            return cur.execute(sql, params or []).fetchall()
+
+    def close(self):
+        self._con.close()
+
+    def run(self, name: str, **kwargs):
+        if name not in SQL_ANALYZERS:
+            raise KeyError(name)
+        return getattr(self, name)(**kwargs)
+
+    # ─── Parity with the Python analyzers ─────────────────
+
+    def co_occurrence(self, period_range: int = 30, top_n: int = 15, target_number: Optional[str] = None) -> Dict:
+        """Same result as CoOccurrenceAnalyzer.analyze."""
+        total = self._query(f"WITH {_WINDOW} SELECT count(*) FROM w", [period_range])[0][0]
+        if not total:
+            return {"top_pairs": [], "period_range": 0}
+
+        # Counter.most_common keeps first-seen order for ties: newest draw first,
+        # then the pair's position among the sorted combinations of that draw.
+        pairs_sql = f"""
+            WITH {_WINDOW},
+            pairs AS (
+                SELECT a.n AS a, b.n AS b, count(*) AS cnt, min(a.idx) AS first_idx
+                FROM nums a JOIN nums b ON a.idx = b.idx AND a.n < b.n
+                GROUP BY a.n, b.n
+            )
+            SELECT a, b, cnt FROM pairs {{where}}
+            ORDER BY cnt DESC, first_idx, a, b LIMIT ?
+        """
+        rows = self._query(pairs_sql.format(where=""), [period_range, top_n])
+        result = {
+            "top_pairs": [
+                {"pair": [_fmt(a), _fmt(b)], "count": cnt, "co_rate": round(cnt / total * 100, 2)}
+                for a, b, cnt in rows
+            ],
+            "period_range": total,
+        }
+
+        if target_number is not None:
+            target = target_number.zfill(2)
+            t = int(target)
+            rows = self._query(pairs_sql.format(where="WHERE a = ? OR b = ?"), [period_range, t, t, 5])
+            result["target_number"] = target
+            result["target_partners"] = [
+                {"partner": _fmt(a if b == t else b), "count": cnt, "co_rate": round(cnt / total * 100, 2)}
+                for a, b, cnt in rows
+            ]
+        return result
+
+    def cold_hot_cycle(self, period_range: int = 100, recent_window: int = 10, top_n: int = 10) -> Dict:
+        """Same result as ColdHotCycleAnalyzer.analyze."""
+        total = self._query(f"WITH {_WINDOW} SELECT count(*) FROM w", [period_range])[0][0]
+        if not total:
+            return ColdHotCycleAnalyzer(None)._empty_result()
+        actual_recent = min(recent_window, total)
+
+        # ColdHotCycleAnalyzer walks newest → oldest and keeps overwriting
+        # last_seen, so its current_gap is the index of the *oldest* appearance.
+        per_number = {
+            n: (appear, last_idx, max_gap)
+            for n, appear, last_idx, max_gap in self._query(f"""
+                WITH {_WINDOW},
+                gaps AS (SELECT n, idx, idx - lag(idx) OVER (PARTITION BY n ORDER BY idx) AS gap FROM nums)
+                SELECT n, count(*), max(idx), max(gap) FROM gaps GROUP BY n
+            """, [period_range])
+        }
+        number_stats = {}
+        for num in ALL_NUMBERS:
+            appear, last_idx, max_gap = per_number.get(int(num), (0, total, None))
+            number_stats[num] = ColdHotCycleAnalyzer.number_stat(
+                total, appear, last_idx, last_idx if max_gap is None else max_gap
+            )
+
+        hot = self._query(f"""
+            WITH {_WINDOW}
+            SELECT n, count(*) AS cnt FROM nums WHERE idx < ?
+            GROUP BY n ORDER BY cnt DESC, min(idx), n LIMIT ?
+        """, [period_range, actual_recent, top_n])
+
+        # A streak keeps counting until the first draw sharing no number with the newest one
+        streaks = self._query(f"""
+            WITH {_WINDOW},
+            latest AS (SELECT numbers FROM w WHERE idx = 0),
+            cut AS (
+                SELECT coalesce(min(idx), (SELECT count(*) FROM w)) AS k
+                FROM w, latest WHERE idx >= 1 AND NOT list_has_any(w.numbers, latest.numbers)
+            )
+            SELECT n, count(*) AS streak FROM nums, cut, latest
+            WHERE idx < cut.k AND list_contains(latest.numbers, n)
+            GROUP BY n HAVING count(*) >= 2
+            ORDER BY streak DESC, n
+        """, [period_range])
+
+        return {
+            "number_stats": number_stats,
+            "hot_numbers": [{"number": _fmt(n), "recent_count": cnt} for n, cnt in hot],
+            "cold_numbers": ColdHotCycleAnalyzer(None)._get_coldest(number_stats, top_n),
+            "streak_numbers": [{"number": _fmt(n), "streak": s} for n, s in streaks],
+            "period_range": total,
+            "recent_window": actual_recent,
+        }
+
+    # ─── Long-range, ad-hoc ───────────────────────────────
+
+    def gap_distribution(self, number: Optional[int] = None, period_range: Optional[int] = None) -> Dict[int, int]:
+        """Histogram of draws between consecutive appearances (whole history by default)."""
+        params = [period_range or _ALL]
+        where = "gap IS NOT NULL"
+        if number is not None:
+            where += " AND n = ?"
+            params.append(number)
+        rows = self._query(f"""
+            WITH {_WINDOW},
+            gaps AS (SELECT n, idx - lag(idx) OVER (PARTITION BY n ORDER BY idx) AS gap FROM nums)
+            SELECT gap, count(*) FROM gaps WHERE {where}
+            GROUP BY gap ORDER BY gap
+        """, params)
+        return {gap: cnt for gap, cnt in rows}
+
+    def triple_co_occurrence(self, period_range: int = 500, top_n: int = 15) -> List[Dict]:
+        """Most frequent three-number combinations drawn together."""
+        rows = self._query(f"""
+            WITH {_WINDOW}
+            SELECT a.n, b.n, c.n, count(*) AS cnt
+            FROM nums a
+            JOIN nums b ON b.idx = a.idx AND b.n > a.n
+            JOIN nums c ON c.idx = a.idx AND c.n > b.n
+            GROUP BY a.n, b.n, c.n
+            ORDER BY cnt DESC, a.n, b.n, c.n LIMIT ?
+        """, [period_range, top_n])
+        return [{"triple": [_fmt(a), _fmt(b), _fmt(c)], "count": cnt} for a, b, c, cnt in rows]
+
+    def position_stats(self, period_range: Optional[int] = None) -> Dict[str, List[int]]:
+        """Per number, how often it was drawn at each of the 20 draw positions."""
+        rows = self._query("""
+            WITH w AS (SELECT sequence FROM draws ORDER BY term DESC LIMIT ?)
+            SELECT sequence[pos] AS n, pos, count(*)
+            FROM w, range(1, 21) AS t(pos)
+            GROUP BY n, pos
+        """, [period_range or _ALL])
+        stats = {num: [0] * 20 for num in ALL_NUMBERS}
+        for n, pos, cnt in rows:
+            stats[_fmt(n)][pos - 1] = cnt
+        return stats
+
+
+def _quote(path: str) -> str:
+    return path.replace("'", "''")
+
+
+# ─── API integration ──────────────────────────────────────
+
+
+_engine: Optional[DuckDBEngine] = None
+_engine_lock = threading.Lock()
+
+
+def default_source() -> str:
+    """ANALYTICS_DUCKDB_SOURCE, or the SQLite file behind DATABASE_URL."""
+    if settings.ANALYTICS_DUCKDB_SOURCE:
+        return settings.ANALYTICS_DUCKDB_SOURCE
+    url = make_url(settings.DATABASE_URL)
+    if url.get_backend_name() != "sqlite" or url.database in (None, "", ":memory:"):
+        raise RuntimeError("ANALYTICS_ENGINE=duckdb needs ANALYTICS_DUCKDB_SOURCE or a file-based SQLite DATABASE_URL")
+    return url.database
+
+
+def get_engine() -> DuckDBEngine:
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = DuckDBEngine(default_source())
+            logger.info("DuckDB 分析引擎已啟用: %s", _engine.source)
+        return _engine
+
+
+def use_duckdb(name: str) -> bool:
+    return settings.ANALYTICS_ENGINE == "duckdb" and name in SQL_ANALYZERS
+
+
+def run_analyzer(name: str, **kwargs):
+    return get_engine().run(name, **kwargs)
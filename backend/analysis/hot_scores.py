@@ -0,0 +1,197 @@
+"""
+Incrementally maintained exponentially weighted (EWMA) hot scores.
+
+For decay rate λ, a number's hot score after draw t is
+
+    Σ_k x(t-k) · e^(-λk)      x = 1 if the number was drawn, latest draw k = 0
+
+which is the full-history form of `BasicAnalyzer`'s weighted frequency. It
+satisfies S(t) = S(t-1) · e^-λ + x(t), so one new draw costs O(1) per rate.
+Decay is applied lazily: only the 20 drawn numbers (and the super number)
+are touched per draw, and the others are decayed when they are read.
+
+Scores are kept for RATES, for both the 80 numbers and the super number.
+They are persisted to `hot_score_states` by the scheduler after each crawl,
+so a restart resumes from the stored state instead of replaying the whole
+history. Request-time reads catch up in memory with draws newer than the
+state's last term, from the binary history file when DRAW_STORE_PATH is set
+and from SQL for the rest. A historical backfill older than that term is not
+replayed; `reset()` + `sync()` rebuilds from scratch.
+"""
+import json
+import math
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.metrics import record_cache
+from app.models.draw_result import DrawResult
+from app.models.hot_score import HotScoreState
+from storage.binary_store import open_matching_view
+
+RATES = (0.02, 0.05, 0.1)
+KINDS = ("number", "super")
+SYNC_BATCH = 10_000
+
+_table = DrawResult.__table__
+
+
+class _Ewma:
+    """80 lazily decayed EWMA values; `stamp[i]` is the step value i was last brought up to."""
+
+    def __init__(self, rate: float, values: Optional[List[float]] = None):
+        self.rate = rate
+        self.decay = math.exp(-rate)
+        self.values = list(values) if values else [0.0] * 80
+        self.stamp = [0] * 80
+        self.step = 0
+
+    def add(self, numbers: List[int]):
+        self.step += 1
+        for n in numbers:
+            i = n - 1
+            self.values[i] = self.values[i] * self.decay ** (self.step - self.stamp[i]) + 1.0
+            self.stamp[i] = self.step
+
+    def scores(self) -> List[float]:
+        return [v * self.decay ** (self.step - s) for v, s in zip(self.values, self.stamp)]
+
+
+class HotScores:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        self.states: Dict[Tuple[str, float], _Ewma] = {(k, r): _Ewma(r) for k in KINDS for r in RATES}
+        self.last_term: Optional[str] = None
+        self.draws_seen = 0
+        self._persisted_term: Optional[str] = None
+
+    # ─── Persistence ──────────────────────────────────────
+
+    def _load(self, db: Session) -> bool:
+        rows = db.query(HotScoreState).all()
+        by_key = {(r.kind, r.rate): r for r in rows}
+        wanted = [(k, r) for k in KINDS for r in RATES]
+        if any(key not in by_key for key in wanted) or len({by_key[key].last_term for key in wanted}) != 1:
+            return False
+        self.states = {key: _Ewma(key[1], json.loads(by_key[key].scores)) for key in wanted}
+        first = by_key[wanted[0]]
+        self.last_term = self._persisted_term = first.last_term
+        self.draws_seen = first.draws_seen
+        return True
+
+    def _persist(self, db: Session):
+        existing = {(r.kind, r.rate): r for r in db.query(HotScoreState).all()}
+        now = datetime.utcnow()
+        for (kind, rate), ewma in self.states.items():
+            row = existing.get((kind, rate))
+            if row is None:
+                row = HotScoreState(kind=kind, rate=rate)
+                db.add(row)
+            row.last_term = self.last_term
+            row.draws_seen = self.draws_seen
+            row.scores = json.dumps(ewma.scores())
+            row.updated_at = now
+        db.commit()
+        self._persisted_term = self.last_term
+
+    # ─── Maintenance ──────────────────────────────────────
+
+    def _apply(self, numbers, super_number: int):
+        for (kind, _), ewma in self.states.items():
+            ewma.add(numbers if kind == "number" else [super_number])
+
+    def _apply_store(self, db: Session) -> int:
+        """Apply draws newer than `last_term` from the binary history file. Returns draws applied."""
+        view = open_matching_view(db)
+        if view is None:
+            return 0
+        try:
+            start = 0
+            if self.last_term:
+                start = view.find(int(self.last_term)) + 1
+                if start == 0:
+                    return 0  # last_term predates / is missing from the file: use SQL
+            for i in range(start, len(view)):
+                draw = view[i]
+                self._apply(draw.sequence, draw.super_int)
+            applied = len(view) - start
+            if applied:
+                self.last_term = str(view.term(-1))
+                self.draws_seen += applied
+            return applied
+        finally:
+            view.close()
+
+    def sync(self, db: Session, persist: bool = False) -> int:
+        """Apply draws newer than `last_term`. Returns draws applied."""
+        with self.lock:
+            latest = db.execute(select(func.max(_table.c.draw_term))).scalar()
+            if self.last_term and (latest is None or latest < self.last_term):
+                self.reset()  # history was truncated / recreated
+            stored = db.execute(select(func.max(HotScoreState.last_term))).scalar()
+            if stored and stored <= (latest or "") and (self.last_term is None or stored > self.last_term):
+                self._load(db)
+
+            applied = self._apply_store(db)
+            while True:
+                stmt = (
+                    select(_table.c.draw_term, _table.c.numbers_sorted, _table.c.super_number)
+                    .order_by(_table.c.draw_term)
+                    .limit(SYNC_BATCH)
+                )
+                if self.last_term:
+                    stmt = stmt.where(_table.c.draw_term > self.last_term)
+                rows = db.execute(stmt).all()
+                if not rows:
+                    break
+                for row in rows:
+                    self._apply([int(n) for n in row.numbers_sorted.split(",")], int(row.super_number))
+                self.last_term = rows[-1].draw_term
+                self.draws_seen += len(rows)
+                applied += len(rows)
+
+            if persist and self.last_term and self.last_term != self._persisted_term:
+                self._persist(db)
+            return applied
+
+    # ─── Queries ──────────────────────────────────────────
+
+    def scores(self, rate: float, kind: str = "number") -> Dict[str, float]:
+        with self.lock:
+            values = self.states[(kind, rate)].scores()
+        return {f"{i + 1:02d}": v for i, v in enumerate(values)}
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            return {
+                "last_term": self.last_term,
+                "draws_seen": self.draws_seen,
+                "rates": {
+                    str(rate): {kind: self.scores(rate, kind) for kind in KINDS}
+                    for rate in RATES
+                },
+            }
+
+
+_instances: "WeakKeyDictionary" = WeakKeyDictionary()
+_instances_lock = threading.Lock()
+
+
+def get_hot_scores(db: Session, persist: bool = False) -> HotScores:
+    """Process-wide hot scores for the session's engine, caught up with the DB."""
+    engine = db.get_bind()
+    with _instances_lock:
+        hot = _instances.get(engine)
+        created = hot is None
+        if created:
+            hot = _instances[engine] = HotScores()
+    applied = hot.sync(db, persist=persist)
+    record_cache("hot_scores", not created and not applied)
+    return hot
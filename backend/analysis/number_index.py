@@ -0,0 +1,155 @@
+"""
+In-memory inverted index: for each number 01-80, the sorted positions
+(0 = oldest draw) of every draw it appeared in.
+
+Gap, last-seen and pair co-appearance questions become binary searches and
+sorted-array intersections instead of scans over `numbers_sorted` strings.
+
+Alongside it sits a prefix-sum table: row i holds, for all 80 numbers, how
+often each appeared in positions [0, i). The counts for any window [a, b)
+are one row subtraction. It costs 320 bytes per draw, about 22 MB for a
+year of history.
+
+Kept in sync with the database by `draw_index.IncrementalDrawIndex`.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from operator import sub
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from analysis.draw_index import IncrementalDrawIndex, get_synced
+
+NUMBERS = range(1, 81)
+
+
+class NumberIndex(IncrementalDrawIndex):
+    columns = ("numbers_sorted",)
+
+    def _clear(self):
+        self.positions: Dict[int, array] = {n: array("I") for n in NUMBERS}
+        self.prefix = array("I", bytes(4 * 80))  # flat rows of 80 cumulative counts
+
+    def _append_row(self, row):
+        self._append_numbers(int(num) for num in row.numbers_sorted.split(","))
+
+    def _append_stored(self, draw):
+        self._append_numbers(draw.sequence)
+
+    def _append_numbers(self, numbers):
+        pos = len(self.terms) - 1
+        prefix_row = self.prefix[pos * 80:]
+        for n in numbers:
+            self.positions[n].append(pos)
+            prefix_row[n - 1] += 1
+        self.prefix.extend(prefix_row)
+
+    # ─── Queries ──────────────────────────────────────────
+
+    def appearances(self, number: int, start: int = 0, end: Optional[int] = None) -> array:
+        """Positions in [start, end) where `number` appeared, oldest first."""
+        pos = self.positions[number]
+        end = len(self.terms) if end is None else end
+        return pos[bisect_left(pos, start):bisect_left(pos, end)]
+
+    def count(self, number: int, start: int = 0, end: Optional[int] = None) -> int:
+        pos = self.positions[number]
+        end = len(self.terms) if end is None else end
+        return bisect_left(pos, end) - bisect_left(pos, start)
+
+    def window_counts(self, start: int, end: int) -> List[int]:
+        """Appearances of numbers 1-80 in positions [start, end), via the prefix table."""
+        return list(map(sub, self.prefix[end * 80:(end + 1) * 80], self.prefix[start * 80:(start + 1) * 80]))
+
+    def contains(self, number: int, pos: int) -> bool:
+        plist = self.positions[number]
+        i = bisect_left(plist, pos)
+        return i < len(plist) and plist[i] == pos
+
+    def numbers_at(self, pos: int) -> List[int]:
+        return [n for n in NUMBERS if self.contains(n, pos)]
+
+    def last_seen(self, number: int, before: Optional[int] = None) -> Optional[int]:
+        """Latest position < `before` where `number` appeared, or None."""
+        pos = self.positions[number]
+        i = bisect_left(pos, len(self.terms) if before is None else before)
+        return pos[i - 1] if i else None
+
+    def position_of(self, term: int) -> Optional[int]:
+        i = bisect_left(self.terms, term)
+        return i if i < len(self.terms) and self.terms[i] == term else None
+
+    def co_appearances(self, a: int, b: int, start: int = 0) -> List[int]:
+        """Positions ≥ `start` where both numbers appeared (sorted-array intersection)."""
+        pa, pb = self.appearances(a, start), self.appearances(b, start)
+        i = j = 0
+        both = []
+        while i < len(pa) and j < len(pb):
+            if pa[i] == pb[j]:
+                both.append(pa[i])
+                i += 1
+                j += 1
+            elif pa[i] < pb[j]:
+                i += 1
+            else:
+                j += 1
+        return both
+
+    def last_co_appearance(self, a: int, b: int) -> Optional[int]:
+        """Latest position where both numbers appeared, walking back from the end."""
+        pa, pb = self.positions[a], self.positions[b]
+        i, j = len(pa) - 1, len(pb) - 1
+        while i >= 0 and j >= 0:
+            if pa[i] == pb[j]:
+                return pa[i]
+            if pa[i] > pb[j]:
+                i = bisect_right(pa, pb[j], 0, i) - 1
+            else:
+                j = bisect_right(pb, pa[i], 0, j) - 1
+        return None
+
+    def timeline(
+        self,
+        number: int,
+        window: Optional[int] = None,
+        with_number: Optional[int] = None,
+        limit: int = 100,
+    ) -> Dict:
+        """Appearances, gaps and (optionally) pair stats; `terms` lists the newest `limit` hits."""
+        with self.lock:
+            total = len(self.terms)
+            start = self.window_start(window)
+            hits = self.appearances(number, start)
+            gaps = [b - a for a, b in zip(hits, hits[1:])]
+            last = hits[-1] if hits else self.last_seen(number)
+
+            result = {
+                "number": f"{number:02d}",
+                "window": total - start,
+                "appearances": len(hits),
+                "terms": [str(self.terms[p]) for p in reversed(hits[-limit:])],
+                "last_seen_term": str(self.terms[last]) if last is not None else None,
+                "current_gap": total - 1 - last if last is not None else None,
+                "gap_stats": {
+                    "mean": round(sum(gaps) / len(gaps), 2) if gaps else None,
+                    "min": min(gaps) if gaps else None,
+                    "max": max(gaps) if gaps else None,
+                    "distribution": {str(g): c for g, c in sorted(Counter(gaps).items())},
+                },
+            }
+            if with_number is not None:
+                both = self.co_appearances(number, with_number, start)
+                last_both = self.last_co_appearance(number, with_number)
+                result["pair"] = {
+                    "number": f"{with_number:02d}",
+                    "count": len(both),
+                    "last_term": str(self.terms[last_both]) if last_both is not None else None,
+                }
+            return result
+
+
+def get_number_index(db: Session) -> NumberIndex:
+    """Process-wide index for the session's engine, caught up with the DB."""
+    return get_synced(db, "numbers", NumberIndex, cache="number_index")
@@ -0,0 +1,165 @@
+"""
+Process-pool offload for CPU-bound analyzers.
+
+CoOccurrenceAnalyzer (about 95k pair updates at period_range=500) and
+ColdHotCycleAnalyzer (an 80 × period_range loop) are pure-Python CPU work.
+On a request thread they hold the GIL and stall every other request in the
+same gunicorn worker. This module runs them in a per-worker process pool:
+
+- The request side loads the draw window once and packs it into the
+  fixed-width records of `storage.binary_store` (32 bytes per draw). Pool
+  processes never open the database.
+- A pool process decodes the records into `StoredDraw` objects, which expose
+  the attributes the analyzers read. It then runs the analyzer on that
+  preloaded window.
+- ANALYSIS_POOL_PROCESSES caps the number of processes per web worker
+  (0 = run inline). ANALYSIS_POOL_MAX_PENDING caps submitted-but-unfinished
+  jobs. Past that, `PoolSaturated` is raised and the API answers 503 instead
+  of queueing without bound.
+
+With ANALYTICS_ENGINE=duckdb both analyzers run as SQL in DuckDB instead
+(`analysis.duckdb_engine`), which needs neither the pool nor a packed window.
+With ANALYTICS_SQL_PUSHDOWN, co-occurrence is a GROUP BY on `draw_numbers`
+and runs inline on the request's session.
+"""
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.metrics import ANALYSIS_POOL_JOBS, ANALYSIS_POOL_PENDING
+from app.models.draw_result import DrawResult
+from analysis import draw_numbers, duckdb_engine
+from analysis.co_occurrence_analyzer import CoOccurrenceAnalyzer
+from analysis.cold_hot_cycle_analyzer import ColdHotCycleAnalyzer
+from storage.binary_store import RECORD, RECORD_SIZE, StoredDraw, encode_draw
+
+logger = logging.getLogger(__name__)
+
+# name: (analyzer class, draws needed for the given analyze() kwargs)
+OFFLOADABLE: Dict[str, tuple] = {
+    "co_occurrence": (CoOccurrenceAnalyzer, lambda kw: kw.get("period_range", 30)),
+    "cold_hot_cycle": (ColdHotCycleAnalyzer, lambda kw: kw.get("period_range", 100)),
+}
+
+_table = DrawResult.__table__
+_WINDOW_COLUMNS = (
+    _table.c.draw_term, _table.c.draw_datetime, _table.c.numbers_sequence, _table.c.super_number,
+    _table.c.high_low_result, _table.c.odd_even_result, _table.c.high_count, _table.c.odd_count,
+)
+
+
+class PoolSaturated(RuntimeError):
+    """Too many analysis jobs are already queued in this worker."""
+
+
+# ─── Draw windows ─────────────────────────────────────────
+
+
+def pack_window(db: Session, limit: int) -> bytes:
+    """Newest `limit` draws, newest first, as concatenated binary_store records."""
+    rows = db.execute(select(*_WINDOW_COLUMNS).order_by(_table.c.draw_term.desc()).limit(limit)).all()
+    return b"".join(encode_draw(dict(r._mapping)) for r in rows)
+
+
+def unpack_window(buf: bytes) -> List[StoredDraw]:
+    return [StoredDraw(RECORD.unpack_from(buf, off)) for off in range(0, len(buf), RECORD_SIZE)]
+
+
+def _analyze_window(name: str, window: bytes, kwargs: Dict[str, Any]) -> Any:
+    analyzer_cls, _ = OFFLOADABLE[name]
+    return analyzer_cls(None, draws=unpack_window(window)).analyze(**kwargs)
+
+
+# ─── Pool ─────────────────────────────────────────────────
+
+
+class AnalysisPool:
+    def __init__(self, processes: int, max_pending: int):
+        self.processes = processes
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn: web workers are multi-threaded, forking them is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.processes, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def submit(self, fn: Callable, *args) -> Future:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                ANALYSIS_POOL_JOBS.inc(result="rejected")
+                raise PoolSaturated(f"analysis pool has {self._pending} pending jobs")
+            self._pending += 1
+            ANALYSIS_POOL_PENDING.set(self._pending)
+            try:
+                future = self._get_executor().submit(fn, *args)
+            except BaseException:
+                self._pending -= 1
+                raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future: Future):
+        with self._lock:
+            self._pending -= 1
+            ANALYSIS_POOL_PENDING.set(self._pending)
+        ANALYSIS_POOL_JOBS.inc(result="error" if future.exception() else "ok")
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_pool: Optional[AnalysisPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_analysis_pool() -> Optional[AnalysisPool]:
+    """This worker's pool, or None when offload is disabled or we already run inside a pool process."""
+    global _pool
+    if settings.ANALYSIS_POOL_PROCESSES <= 0 or multiprocessing.parent_process() is not None:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = AnalysisPool(settings.ANALYSIS_POOL_PROCESSES, settings.ANALYSIS_POOL_MAX_PENDING)
+        return _pool
+
+
+def shutdown_analysis_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = None
+
+
+def run_offloaded(db: Session, name: str, **kwargs) -> Any:
+    """Run analyzer `name` on a packed draw window, in the pool when one is available."""
+    if duckdb_engine.use_duckdb(name):
+        return duckdb_engine.run_analyzer(name, **kwargs)
+    if name == "co_occurrence" and draw_numbers.pushdown_enabled():
+        return CoOccurrenceAnalyzer(db).analyze(**kwargs)
+    _, window_size = OFFLOADABLE[name]
+    window = pack_window(db, window_size(kwargs))
+    pool = get_analysis_pool()
+    if pool is None:
+        return _analyze_window(name, window, kwargs)
+    return pool.submit(_analyze_window, name, window, kwargs).result()
@@ -0,0 +1,255 @@
+"""
+預測快照與命中率追蹤：
+
+1. 每次入庫後，為下一期計算一次標準預測（基本 top-N、超級獎號、猜大小、猜單雙、
+   智能選號），每個分析期數一筆，寫入 `predictions`。
+2. 當該期開出後，對快照評分（命中號碼數 / 是否猜中），累加到
+   `prediction_accuracy`（總計 + 最近 ROLLING_WINDOW 期）。
+
+API 讀取「目前預測」只需一次索引查詢，不必重新計算。
+"""
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.draw_result import DrawResult
+from app.models.prediction import Prediction
+from app.models.prediction_accuracy import PredictionAccuracy
+from analysis.basic_analyzer import BasicAnalyzer
+from analysis.high_low_analyzer import HighLowAnalyzer
+from analysis.odd_even_analyzer import OddEvenAnalyzer
+from analysis.smart_pick_engine import SmartPickEngine
+from analysis.super_number_analyzer import SuperNumberAnalyzer
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PERIOD_RANGES = (10, 30, 100)
+PREDICTION_TYPES = ("basic", "super_number", "high_low", "odd_even", "smart_pick")
+NUMBER_TYPES = {"basic", "smart_pick"}
+BASIC_TOP_N = 10
+SUPER_TOP_N = 10
+SMART_PICK_COUNT = 10
+ROLLING_WINDOW = 100
+
+
+# ─── Snapshot ─────────────────────────────────────────────
+
+
+def _build_predictions(db: Session, period_range: int) -> List[Dict]:
+    """回傳該期數下各類型預測的欄位（不含期號）"""
+    rows = []
+
+    basic = BasicAnalyzer(db).analyze(period_range, top_n=BASIC_TOP_N)
+    if basic["predictions"]:
+        rows.append({
+            "prediction_type": "basic",
+            "predicted_numbers": [n for n, _ in basic["predictions"]],
+            "confidence_scores": {"scores": [s for _, s in basic["predictions"]]},
+        })
+
+    super_result = SuperNumberAnalyzer(db).analyze(period_range, top_n=SUPER_TOP_N)
+    if super_result["predictions"]:
+        rows.append({
+            "prediction_type": "super_number",
+            "predicted_numbers": [n for n, _ in super_result["predictions"]],
+            "confidence_scores": {"frequencies": [f for _, f in super_result["predictions"]]},
+        })
+
+    for name, analyzer in (("high_low", HighLowAnalyzer), ("odd_even", OddEvenAnalyzer)):
+        result = analyzer(db).analyze(period_range)
+        if result["prediction"]:
+            rows.append({
+                "prediction_type": name,
+                "predicted_result": result["prediction"],
+                "result_probability": result["confidence"],
+                "confidence_scores": {"reason": result["reason"]},
+            })
+
+    smart = SmartPickEngine(db).pick(period_range, pick_count=SMART_PICK_COUNT)
+    if smart["picks"]:
+        rows.append({
+            "prediction_type": "smart_pick",
+            "predicted_numbers": [p["number"] for p in smart["picks"]],
+            "confidence_scores": {
+                "scores": [p["final_score"] for p in smart["picks"]],
+                "star_combos": smart["star_combos"],
+            },
+        })
+    return rows
+
+
+def snapshot_predictions(db: Session) -> int:
+    """為最新一期的下一期寫入預測快照；已存在的（類型, 期數）略過。回傳新增筆數"""
+    latest = db.execute(select(DrawResult.draw_term).order_by(DrawResult.draw_term.desc()).limit(1)).scalar()
+    if not latest:
+        return 0
+    target = str(int(latest) + 1)
+    existing = {
+        (t, p)
+        for t, p in db.execute(
+            select(Prediction.prediction_type, Prediction.period_range).where(Prediction.target_term == target)
+        ).all()
+    }
+
+    added = 0
+    for period_range in SNAPSHOT_PERIOD_RANGES:
+        if all((t, period_range) in existing for t in PREDICTION_TYPES):
+            continue
+        for row in _build_predictions(db, period_range):
+            if (row["prediction_type"], period_range) in existing:
+                continue
+            db.add(Prediction(
+                prediction_type=row["prediction_type"],
+                period_range=period_range,
+                predicted_numbers=json.dumps(row.get("predicted_numbers")),
+                predicted_result=row.get("predicted_result"),
+                result_probability=row.get("result_probability"),
+                confidence_scores=json.dumps(row.get("confidence_scores"), ensure_ascii=False),
+                based_on_latest_term=latest,
+                target_term=target,
+            ))
+            added += 1
+    db.commit()
+    return added
+
+
+# ─── Scoring ──────────────────────────────────────────────
+
+
+def _score(prediction: Prediction, draw: DrawResult) -> Dict:
+    """回傳 hits / picks / is_correct / actual_result"""
+    ptype = prediction.prediction_type
+    if ptype in NUMBER_TYPES:
+        picked = json.loads(prediction.predicted_numbers or "[]")
+        drawn = set(draw.get_numbers_list())
+        hits = len([n for n in picked if n in drawn])
+        return {"hits": hits, "picks": len(picked), "is_correct": None, "actual_result": draw.numbers_sorted}
+    if ptype == "super_number":
+        correct = draw.super_number in json.loads(prediction.predicted_numbers or "[]")
+        actual = draw.super_number
+    else:
+        actual = draw.high_low_result if ptype == "high_low" else draw.odd_even_result
+        correct = prediction.predicted_result == actual
+    return {"hits": int(correct), "picks": 1, "is_correct": correct, "actual_result": actual}
+
+
+def _accumulate(db: Session, cache: Dict, prediction: Prediction, hits: int, picks: int):
+    key = (prediction.prediction_type, prediction.period_range)
+    acc = cache.get(key)
+    if acc is None:
+        acc = (
+            db.query(PredictionAccuracy)
+            .filter_by(prediction_type=key[0], period_range=key[1])
+            .first()
+        )
+        if acc is None:
+            acc = PredictionAccuracy(
+                prediction_type=key[0], period_range=key[1], samples=0, hit_sum=0, pick_sum=0, recent="[]",
+            )
+            db.add(acc)
+        cache[key] = acc
+    acc.samples += 1
+    acc.hit_sum += hits
+    acc.pick_sum += picks
+    acc.recent = json.dumps((json.loads(acc.recent) + [[hits, picks]])[-ROLLING_WINDOW:])
+    acc.last_term = prediction.target_term
+
+
+def score_predictions(db: Session) -> int:
+    """對所有目標期已開出、尚未評分的預測評分。回傳評分筆數"""
+    rows = db.execute(
+        select(Prediction, DrawResult)
+        .join(DrawResult, DrawResult.draw_term == Prediction.target_term)
+        .where(Prediction.scored_at.is_(None))
+        .order_by(Prediction.target_term)
+    ).all()
+    if not rows:
+        return 0
+
+    now = datetime.utcnow()
+    cache: Dict = {}
+    for prediction, draw in rows:
+        result = _score(prediction, draw)
+        prediction.hits = result["hits"]
+        prediction.is_correct = result["is_correct"]
+        prediction.actual_result = result["actual_result"]
+        prediction.scored_at = now
+        _accumulate(db, cache, prediction, result["hits"], result["picks"])
+    db.commit()
+    return len(rows)
+
+
+def run_prediction_cycle(db: Session) -> Dict[str, int]:
+    """入庫後呼叫：先評分已開出的預測，再為下一期建立快照"""
+    scored = score_predictions(db)
+    created = snapshot_predictions(db)
+    if scored or created:
+        logger.info("預測追蹤: 評分 %d 筆, 新增快照 %d 筆", scored, created)
+    return {"scored": scored, "created": created}
+
+
+# ─── Reads ────────────────────────────────────────────────
+
+
+def current_prediction(db: Session, prediction_type: str, period_range: int) -> Optional[Prediction]:
+    """最新一筆快照（ix_predictions_lookup 索引查詢）"""
+    return (
+        db.query(Prediction)
+        .filter_by(prediction_type=prediction_type, period_range=period_range)
+        .order_by(Prediction.target_term.desc())
+        .first()
+    )
+
+
+def prediction_to_dict(p: Prediction) -> Dict:
+    return {
+        "prediction_type": p.prediction_type,
+        "period_range": p.period_range,
+        "target_term": p.target_term,
+        "based_on_latest_term": p.based_on_latest_term,
+        "predicted_numbers": json.loads(p.predicted_numbers) if p.predicted_numbers else None,
+        "predicted_result": p.predicted_result,
+        "confidence": p.result_probability,
+        "details": json.loads(p.confidence_scores) if p.confidence_scores else None,
+        "hits": p.hits,
+        "is_correct": p.is_correct,
+        "scored_at": p.scored_at,
+        "created_at": p.created_at,
+    }
+
+
+def _baseline(prediction_type: str) -> Optional[float]:
+    """隨機選號的期望命中率（猜大小 / 單雙含和局，不提供）"""
+    if prediction_type in NUMBER_TYPES:
+        return 20 / 80
+    if prediction_type == "super_number":
+        return SUPER_TOP_N / 80
+    return None
+
+
+def accuracy_table(db: Session) -> List[Dict]:
+    rows = (
+        db.query(PredictionAccuracy)
+        .order_by(PredictionAccuracy.prediction_type, PredictionAccuracy.period_range)
+        .all()
+    )
+    out = []
+    for acc in rows:
+        recent = json.loads(acc.recent)
+        recent_hits = sum(h for h, _ in recent)
+        recent_picks = sum(p for _, p in recent)
+        out.append({
+            "prediction_type": acc.prediction_type,
+            "period_range": acc.period_range,
+            "samples": acc.samples,
+            "hit_rate": round(acc.hit_sum / acc.pick_sum, 4) if acc.pick_sum else None,
+            "rolling_samples": len(recent),
+            "rolling_hit_rate": round(recent_hits / recent_picks, 4) if recent_picks else None,
+            "baseline": _baseline(acc.prediction_type),
+            "last_term": acc.last_term,
+        })
+    return out
@@ -3,9 +3,9 @@ from collections import Counter
 from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
 
+from app.profiling import timed
 from analysis.basic_analyzer import BasicAnalyzer
-from analysis.cold_hot_cycle_analyzer import ColdHotCycleAnalyzer
-from analysis.co_occurrence_analyzer import CoOccurrenceAnalyzer
+from analysis.offload import run_offloaded
 from analysis.tail_number_analyzer import TailNumberAnalyzer
 from analysis.zone_distribution_analyzer import ZoneDistributionAnalyzer, ZONES
 
@@ -31,15 +31,34 @@ class SmartPickEngine:
         pick_count: int = 10,
         star_level: int = 3,
     ) -> Dict:
-        basic = BasicAnalyzer(self.db).analyze(period_range, top_n=20, use_weighted=True)
-        cycle = ColdHotCycleAnalyzer(self.db).analyze(period_range=max(period_range, 50), recent_window=10)
-        co_occ = CoOccurrenceAnalyzer(self.db).analyze(period_range, top_n=20)
-        tail = TailNumberAnalyzer(self.db).analyze(period_range, top_n=3)
-        zone = ZoneDistributionAnalyzer(self.db).analyze(period_range)
+        with timed("analyzer.basic"):
+            basic = BasicAnalyzer(self.db).analyze(period_range, top_n=20, use_weighted=True)
+        # CPU-heavy: run in the analysis process pool (see analysis.offload)
+        with timed("analyzer.cold_hot_cycle"):
+            cycle = run_offloaded(self.db, "cold_hot_cycle", period_range=max(period_range, 50), recent_window=10)
+        with timed("analyzer.co_occurrence"):
+            co_occ = run_offloaded(self.db, "co_occurrence", period_range=period_range, top_n=20)
+        with timed("analyzer.tail_number"):
+            tail = TailNumberAnalyzer(self.db).analyze(period_range, top_n=3)
+        with timed("analyzer.zone_distribution"):
+            zone = ZoneDistributionAnalyzer(self.db).analyze(period_range)
 
         if not basic["predictions"]:
             return self._empty_result()
 
+        with timed("scoring"):
+            return self._score(basic, cycle, co_occ, tail, zone, pick_count, star_level)
+
+    def _score(
+        self,
+        basic: Dict,
+        cycle: Dict,
+        co_occ: Dict,
+        tail: Dict,
+        zone: Dict,
+        pick_count: int,
+        star_level: int,
+    ) -> Dict:
         anchors = self._select_anchors(cycle)
 
         scores = self._build_base_scores(basic)
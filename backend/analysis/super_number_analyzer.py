@@ -3,6 +3,7 @@ from typing import Dict
 from sqlalchemy.orm import Session
 
 from app.models.draw_result import DrawResult
+from analysis import draw_numbers
 
 
 class SuperNumberAnalyzer:
@@ -12,6 +13,8 @@ class SuperNumberAnalyzer:
         self.db = db_session
 
     def analyze(self, period_range: int = 30, top_n: int = 10) -> Dict:
+        if draw_numbers.pushdown_enabled():
+            return self._analyze_pushdown(period_range, top_n)
         draws = (
             self.db.query(DrawResult)
             .order_by(DrawResult.draw_term.desc())
@@ -38,3 +41,16 @@ class SuperNumberAnalyzer:
             "period_range": len(draws),
         }
 
+    def _analyze_pushdown(self, period_range: int, top_n: int) -> Dict:
+        """同 analyze，改以 draw_numbers 分組計數（同分依最近開出期別排序）"""
+        total = draw_numbers.window_size(self.db, period_range)
+        if not total:
+            return {"predictions": [], "all_stats": {}, "period_range": 0}
+
+        stats = draw_numbers.number_stats(self.db, period_range, super_only=True)
+        ranked = sorted(stats, key=lambda n: (-stats[n][0], -stats[n][1]))
+        return {
+            "predictions": [(f"{n:02d}", stats[n][0]) for n in ranked[:top_n]],
+            "all_stats": {f"{n:02d}": stats.get(n, (0, 0))[0] for n in range(1, 81)},
+            "period_range": total,
+        }
@@ -3,6 +3,7 @@ from typing import Dict, List
 from sqlalchemy.orm import Session
 
 from app.models.draw_result import DrawResult
+from analysis import draw_numbers
 
 TAIL_GROUPS = {i: [f"{n:02d}" for n in range(1, 81) if n % 10 == i] for i in range(10)}
 TAIL_GROUPS[0] = [f"{n:02d}" for n in range(10, 81, 10)]
@@ -15,6 +16,8 @@ class TailNumberAnalyzer:
         self.db = db_session
 
     def analyze(self, period_range: int = 30, top_n: int = 3) -> Dict:
+        if draw_numbers.pushdown_enabled():
+            return self._analyze_pushdown(period_range, top_n)
         draws = self._fetch_draws(period_range)
         if not draws:
             return self._empty_result()
@@ -37,6 +40,25 @@ class TailNumberAnalyzer:
             if max_tail_count >= 5:
                 high_tail_draws += 1
 
+        counter = Counter()
+        for draw in draws:
+            counter.update(draw.get_numbers_list())
+        return self._build_result(tail_counts, counter, high_tail_draws, total, top_n)
+
+    def _analyze_pushdown(self, period_range: int, top_n: int) -> Dict:
+        """同 analyze，尾數、號碼次數與重尾期數改由 draw_numbers 分組計算"""
+        total = draw_numbers.window_size(self.db, period_range)
+        if not total:
+            return self._empty_result()
+
+        tail_counts = {int(t): c for t, c in draw_numbers.tail_counts(self.db, period_range).items()}
+        counter = draw_numbers.number_frequency(self.db, period_range)
+        high_tail_draws = draw_numbers.high_tail_draws(self.db, period_range, threshold=5)
+        return self._build_result(tail_counts, counter, high_tail_draws, total, top_n)
+
+    def _build_result(
+        self, tail_counts: Dict[int, int], counter: Dict[str, int], high_tail_draws: int, total: int, top_n: int
+    ) -> Dict:
         tail_stats = {}
         for tail in range(10):
             count = tail_counts.get(tail, 0)
@@ -57,7 +79,7 @@ class TailNumberAnalyzer:
             for t, s in sorted_tails[:top_n]
         ]
 
-        hot_tail_numbers = self._get_hot_numbers_in_tails(draws, hot_tails)
+        hot_tail_numbers = self._get_hot_numbers_in_tails(counter, hot_tails)
 
         return {
             "tail_stats": tail_stats,
@@ -67,12 +89,8 @@ class TailNumberAnalyzer:
             "period_range": total,
         }
 
-    def _get_hot_numbers_in_tails(self, draws, hot_tails) -> List[Dict]:
+    def _get_hot_numbers_in_tails(self, counter: Dict[str, int], hot_tails) -> List[Dict]:
         """找出熱門尾號組中頻率最高的具體號碼"""
-        counter = Counter()
-        for draw in draws:
-            counter.update(draw.get_numbers_list())
-
         result = []
         for ht in hot_tails:
             tail = int(ht["tail"])
@@ -1,8 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Dict, List, Tuple
+from typing import Dict, Tuple
 from sqlalchemy.orm import Session
 
-from app.models.draw_result import DrawResult
+from analysis.trend_series import get_trend_series
 
 STREAK_REVERSAL_THRESHOLD = 3
 STREAK_BASE_CONFIDENCE = 0.60
@@ -19,17 +19,11 @@ THEORETICAL_AVG = 10.0
 class TrendAnalyzer(ABC):
     """趨勢分析基底類別：連莊反轉 > 均值回歸 > 比例失衡 > 多數優先"""
 
+    series: str = ""  # trend_series.SERIES key
+
     def __init__(self, db_session: Session):
         self.db = db_session
 
-    @abstractmethod
-    def _get_result(self, draw: DrawResult) -> str:
-        """取得該期的結果字串（大/小、單/雙）"""
-
-    @abstractmethod
-    def _get_count(self, draw: DrawResult) -> float:
-        """取得該期的正向計數值（high_count 或 odd_count）"""
-
     @abstractmethod
     def _labels(self) -> Tuple[str, str, str]:
         """回傳 (positive_label, negative_label, tie_label)"""
@@ -39,21 +33,18 @@ class TrendAnalyzer(ABC):
         """回傳統計字典的 key 前綴 (pos_key, neg_key, avg_key)，保持 API 向後相容"""
 
     def analyze(self, period_range: int = 30) -> Dict:
-        draws = self._fetch_draws(period_range)
-        if not draws:
+        series = get_trend_series(self.db, self.series)
+        with series.lock:
+            stats = series.window_stats(period_range)
+        if not stats["size"]:
             return {"prediction": None, "statistics": {}, "period_range": 0}
 
-        pos_label, neg_label, tie_label = self._labels()
         pos_key, neg_key, avg_key = self._stat_keys()
-        results = [self._get_result(d) for d in draws]
-
-        pos_n = results.count(pos_label)
-        neg_n = results.count(neg_label)
-        tie_n = results.count(tie_label)
+        pos_n, neg_n, tie_n = stats["pos"], stats["neg"], stats["tie"]
         total = pos_n + neg_n
 
-        streak = self._calc_streak(results, tie_label)
-        avg_count = sum(self._get_count(d) for d in draws) / len(draws)
+        streak = stats["streak"]
+        avg_count = stats["count_sum"] / stats["size"]
         prediction = self._predict(pos_n, neg_n, total, streak, avg_count)
 
         return {
@@ -69,27 +60,21 @@ class TrendAnalyzer(ABC):
                 "current_streak": streak,
                 f"avg_{avg_key}_numbers": round(avg_count, 1),
             },
-            "period_range": len(draws),
+            "period_range": stats["size"],
         }
 
-    def _calc_streak(self, results: List[str], tie_label: str) -> Dict:
-        streak_type = None
-        streak_count = 0
-
-        for r in results:
-            if r == tie_label:
-                if streak_type is not None:
-                    break
-                continue
-            if streak_type is None:
-                streak_type = r
-                streak_count = 1
-            elif r == streak_type:
-                streak_count += 1
-            else:
-                break
-
-        return {"type": streak_type, "count": streak_count}
+    def history(self, limit: int = 100, before_term=None, window=None) -> Dict:
+        """連莊壓縮序列（新到舊）、目前連莊與連莊長度分佈"""
+        series = get_trend_series(self.db, self.series)
+        with series.lock:
+            runs = series.runs(limit, before_term)
+            return {
+                "series": self.series,
+                "current_streak": series.current_streak(),
+                "runs": runs,
+                "next_before_term": int(runs[-1]["start_term"]) if len(runs) == limit else None,
+                "streak_histogram": series.histogram(window),
+            }
 
     def _predict(
         self, pos_n: int, neg_n: int, total: int, streak: Dict, avg_count: float
@@ -145,11 +130,3 @@ class TrendAnalyzer(ABC):
             "confidence": MAJORITY_CONFIDENCE,
             "reason": "根據歷史多數",
         }
-
-    def _fetch_draws(self, limit: int):
-        return (
-            self.db.query(DrawResult)
-            .order_by(DrawResult.draw_term.desc())
-            .limit(limit)
-            .all()
-        )
@@ -0,0 +1,130 @@
+"""
+Run-length encoded 大小 / 單雙 result series over the full draw history.
+
+Each series keeps:
+- runs            (label code, start position), appended as draws arrive
+- label prefix    cumulative count per label, for windowed ratios
+- count prefix    running sum of high_count / odd_count, for windowed averages
+
+So the current streak, windowed counts and averages, and the streak-length
+histogram ("how often does a 4-streak reverse") are answered without
+rescanning rows.
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from analysis.draw_index import IncrementalDrawIndex, get_synced
+
+SERIES: Dict[str, Tuple[str, str, Tuple[str, str, str]]] = {
+    # name: (result column, count column, (positive, negative, tie) labels)
+    "high_low": ("high_low_result", "high_count", ("大", "小", "－")),
+    "odd_even": ("odd_even_result", "odd_count", ("單", "雙", "－")),
+}
+TIE = 2
+
+
+class TrendSeries(IncrementalDrawIndex):
+    def __init__(self, name: str):
+        self.name = name
+        self.result_column, self.count_column, self.labels = SERIES[name]
+        self.columns = (self.result_column, self.count_column)
+        super().__init__()
+
+    def _clear(self):
+        self.run_codes = array("B")
+        self.run_starts = array("I")
+        self.label_prefix = [array("I", [0]) for _ in self.labels]
+        self.count_prefix = array("Q", [0])
+
+    def _append_row(self, row):
+        pos = len(self.terms) - 1
+        label = getattr(row, self.result_column) or self.labels[TIE]
+        code = self.labels.index(label) if label in self.labels else TIE
+        if not self.run_codes or self.run_codes[-1] != code:
+            self.run_codes.append(code)
+            self.run_starts.append(pos)
+        for c, prefix in enumerate(self.label_prefix):
+            prefix.append(prefix[-1] + (c == code))
+        self.count_prefix.append(self.count_prefix[-1] + (getattr(row, self.count_column) or 0))
+
+    # ─── Queries ──────────────────────────────────────────
+
+    def _run_end(self, i: int) -> int:
+        return self.run_starts[i + 1] if i + 1 < len(self.run_starts) else len(self.terms)
+
+    def window_stats(self, window: Optional[int]) -> Dict:
+        """Label counts, count sum and current streak over the newest `window` draws."""
+        total = len(self.terms)
+        start = self.window_start(window)
+        counts = [p[total] - p[start] for p in self.label_prefix]
+        return {
+            "size": total - start,
+            "pos": counts[0],
+            "neg": counts[1],
+            "tie": counts[TIE],
+            "count_sum": self.count_prefix[total] - self.count_prefix[start],
+            "streak": self.current_streak(start),
+        }
+
+    def current_streak(self, start: int = 0) -> Dict:
+        """Newest non-tie run clipped to [start, end); leading ties are skipped."""
+        end = len(self.terms)
+        i = len(self.run_starts) - 1
+        while i >= 0 and end > start:
+            run_start = max(self.run_starts[i], start)
+            if self.run_codes[i] != TIE:
+                return {"type": self.labels[self.run_codes[i]], "count": end - run_start}
+            end = run_start
+            i -= 1
+        return {"type": None, "count": 0}
+
+    def histogram(self, window: Optional[int] = None) -> Dict:
+        """
+        Lengths of completed runs per label inside the window (the ongoing
+        run is excluded), plus the reversal rate at each length: of the runs
+        that reached length k, the share that ended exactly at k.
+        """
+        start = self.window_start(window)
+        first = bisect_left(self.run_starts, start)
+        lengths: Dict[str, Counter] = {label: Counter() for label in self.labels}
+        for i in range(first, len(self.run_starts) - 1):
+            lengths[self.labels[self.run_codes[i]]][self._run_end(i) - self.run_starts[i]] += 1
+
+        result = {}
+        for label, counter in lengths.items():
+            reached = sum(counter.values())
+            rows = {}
+            for k in sorted(counter):
+                rows[str(k)] = {
+                    "runs": counter[k],
+                    "reached": reached,
+                    "reversal_rate": round(counter[k] / reached, 4),
+                }
+                reached -= counter[k]
+            result[label] = rows
+        return result
+
+    def runs(self, limit: int = 100, before_term: Optional[int] = None) -> List[Dict]:
+        """Compressed runs, newest first; `before_term` pages to runs starting before it."""
+        end_run = len(self.run_starts)
+        if before_term is not None:
+            end_run = bisect_right(self.run_starts, bisect_left(self.terms, before_term) - 1)
+        out = []
+        for i in range(end_run - 1, max(end_run - limit, 0) - 1, -1):
+            start, end = self.run_starts[i], self._run_end(i)
+            out.append({
+                "result": self.labels[self.run_codes[i]],
+                "length": end - start,
+                "start_term": str(self.terms[start]),
+                "end_term": str(self.terms[end - 1]),
+            })
+        return out
+
+
+def get_trend_series(db: Session, name: str) -> TrendSeries:
+    """Process-wide series for the session's engine, caught up with the DB."""
+    return get_synced(db, f"trend:{name}", lambda: TrendSeries(name), cache="trend_series")
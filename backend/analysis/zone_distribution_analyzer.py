@@ -20,26 +20,37 @@ class ZoneDistributionAnalyzer:
         self.db = db_session
 
     def analyze(self, period_range: int = 30) -> Dict:
+        from analysis import draw_numbers  # imports ZONES from this module
+
+        if draw_numbers.pushdown_enabled():
+            # 每期各區間號碼數由 draw_numbers 分組計算
+            per_draw = draw_numbers.zone_counts_by_draw(self.db, period_range)
+            return self._build_result([str(term) for term, _ in per_draw], [z for _, z in per_draw])
+
         draws = self._fetch_draws(period_range)
-        if not draws:
+        zone_per_draw: List[Dict[str, int]] = []
+        for draw in draws:
+            nums = [int(n) for n in draw.get_numbers_list()]
+            zone_per_draw.append({
+                zone_name: sum(1 for n in nums if lo <= n <= hi)
+                for zone_name, (lo, hi) in ZONES.items()
+            })
+        return self._build_result([d.draw_term for d in draws], zone_per_draw)
+
+    def _build_result(self, terms: List[str], zone_per_draw: List[Dict[str, int]]) -> Dict:
+        """terms / zone_per_draw 皆為新到舊排列"""
+        if not zone_per_draw:
             return self._empty_result()
 
-        total = len(draws)
+        total = len(zone_per_draw)
         zone_totals: Dict[str, int] = defaultdict(int)
-        zone_per_draw: List[Dict[str, int]] = []
         zone_high_draws: Dict[str, List[Dict[str, float]]] = {
             z: [] for z in ZONES
         }
 
-        for draw in draws:
-            nums = [int(n) for n in draw.get_numbers_list()]
-            draw_zones: Dict[str, int] = {}
-            for zone_name, (lo, hi) in ZONES.items():
-                count = sum(1 for n in nums if lo <= n <= hi)
-                draw_zones[zone_name] = count
-                zone_totals[zone_name] += count
-
-            zone_per_draw.append(draw_zones)
+        for draw_zones in zone_per_draw:
+            for zone_name in ZONES:
+                zone_totals[zone_name] += draw_zones[zone_name]
 
             for zone_name in ZONES:
                 if draw_zones[zone_name] >= 7:
@@ -88,7 +99,7 @@ class ZoneDistributionAnalyzer:
                     "draw_index": i,
                     "zones": draw_zones,
                     "diff": diff,
-                    "draw_term": draws[i].draw_term,
+                    "draw_term": terms[i],
                 }
 
         return {
@@ -1,10 +1,118 @@
-from fastapi import APIRouter, Depends, Query
+import csv
+import io
+import json
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.database import get_db
+from app.profiling import TimedRoute
 from app.models.draw_result import DrawResult
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
+
+_table = DrawResult.__table__
+QUERY_COLUMNS = [
+    _table.c.term_number, _table.c.draw_term, _table.c.draw_datetime, _table.c.numbers_sorted,
+    _table.c.super_number, _table.c.high_low_result, _table.c.odd_even_result,
+]
+CSV_HEADER = ["draw_term", "draw_datetime", "numbers_sorted", "super_number", "high_low_result", "odd_even_result"]
+STREAM_BATCH = 1000
+
+
+def _query_stmt(
+    from_date: Optional[date],
+    to_date: Optional[date],
+    before_term: Optional[int],
+    after_term: Optional[int],
+    order: str,
+):
+    stmt = select(*QUERY_COLUMNS)
+    if from_date:
+        stmt = stmt.where(_table.c.draw_datetime >= datetime.combine(from_date, time.min))
+    if to_date:
+        stmt = stmt.where(_table.c.draw_datetime < datetime.combine(to_date + timedelta(days=1), time.min))
+    if before_term is not None:
+        stmt = stmt.where(_table.c.term_number < before_term)
+    if after_term is not None:
+        stmt = stmt.where(_table.c.term_number > after_term)
+    key = _table.c.term_number
+    return stmt.order_by(key.asc() if order == "asc" else key.desc())
+
+
+def _row_dict(row) -> dict:
+    return {
+        "draw_term": row.draw_term,
+        "draw_datetime": row.draw_datetime.isoformat(),
+        "numbers_sorted": row.numbers_sorted.split(","),
+        "super_number": row.super_number,
+        "high_low_result": row.high_low_result,
+        "odd_even_result": row.odd_even_result,
+    }
+
+
+def _stream_rows(db: Session, stmt, fmt: str):
+    """Yield ndjson / csv chunks from a server-side cursor (constant memory)."""
+    try:
+        result = db.execute(stmt.execution_options(yield_per=STREAM_BATCH))
+        buf = io.StringIO()
+        writer = csv.writer(buf) if fmt == "csv" else None
+        if writer:
+            writer.writerow(CSV_HEADER)
+        for rows in result.partitions():
+            for row in rows:
+                if writer:
+                    writer.writerow([
+                        row.draw_term, row.draw_datetime.isoformat(), row.numbers_sorted,
+                        row.super_number, row.high_low_result, row.odd_even_result,
+                    ])
+                else:
+                    buf.write(json.dumps(_row_dict(row), ensure_ascii=False))
+                    buf.write("\n")
+            yield buf.getvalue().encode()
+            buf.seek(0)
+            buf.truncate()
+        tail = buf.getvalue()
+        if tail:
+            yield tail.encode()
+    finally:
+        db.close()
+
+
+@router.get("")
+def query_draws(
+    from_date: Optional[date] = Query(None, description="起始日期（含）"),
+    to_date: Optional[date] = Query(None, description="結束日期（含）"),
+    before_term: Optional[int] = Query(None, description="只取此期號之前（游標）"),
+    after_term: Optional[int] = Query(None, description="只取此期號之後（游標）"),
+    order: str = Query("desc", pattern="^(asc|desc)$", description="期號排序"),
+    limit: int = Query(100, ge=1, le=1000, description="每頁筆數（json）"),
+    format: str = Query("json", pattern="^(json|ndjson|csv)$", description="json / ndjson / csv"),
+    db: Session = Depends(get_db),
+):
+    """依日期區間查詢開獎紀錄（keyset 分頁，ndjson / csv 串流匯出）"""
+    stmt = _query_stmt(from_date, to_date, before_term, after_term, order)
+
+    if format != "json":
+        media_type = "application/x-ndjson" if format == "ndjson" else "text/csv; charset=utf-8"
+        return StreamingResponse(
+            _stream_rows(db, stmt, format),
+            media_type=media_type,
+            headers={"Content-Disposition": f'attachment; filename="draws.{format}"'},
+        )
+
+    rows = db.execute(stmt.limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more:
+        key = "after_term" if order == "asc" else "before_term"
+        next_cursor = {key: rows[-1].term_number}
+    return {"items": [_row_dict(r) for r in rows], "next_cursor": next_cursor}
 
 
 @router.get("/latest")
@@ -32,12 +140,83 @@ def get_latest_draws(
     ]
 
 
+EXPORT_MEDIA_TYPES = {
+    "parquet": ("application/vnd.apache.parquet", "draws.parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "draws.arrows"),
+}
+
+
+@router.get("/export")
+def export_draws(
+    format: str = Query("parquet", pattern="^(parquet|arrow)$", description="parquet / arrow"),
+    db: Session = Depends(get_db),
+):
+    """串流匯出全部開獎紀錄（Parquet 或 Arrow IPC stream）"""
+    try:
+        from storage.columnar import stream_arrow, stream_parquet, _require_pyarrow
+        _require_pyarrow()
+    except RuntimeError as e:
+        raise HTTPException(status_code=501, detail=str(e))
+
+    media_type, filename = EXPORT_MEDIA_TYPES[format]
+    stream = stream_parquet if format == "parquet" else stream_arrow
+
+    def body():
+        try:
+            yield from stream(db)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+CHANGE_COLUMNS = [
+    _table.c.draw_term, _table.c.draw_datetime, _table.c.numbers_sequence,
+    _table.c.super_number, _table.c.high_low_result, _table.c.odd_even_result,
+]
+
+
+@router.get("/changes")
+def get_changes(
+    since_id: int = Query(0, ge=0, description="只取此入庫序號之後的開獎（複本上次收到的 next_since_id）"),
+    limit: int = Query(500, ge=1, le=5000, description="每批筆數"),
+    db: Session = Depends(get_db),
+):
+    """
+    入庫變更串流（依入庫序號 draw_results.id 排序），供複本節點增量同步。
+    補入的舊期別（封存重播、Parquet 匯入、補抓前一天）也會出現在串流中。
+    每列只含無法推導的欄位，排序號碼與大小單雙個數由複本自行計算
+    """
+    rows = db.execute(
+        select(_table.c.id, *CHANGE_COLUMNS)
+        .where(_table.c.id > since_id)
+        .order_by(_table.c.id)
+        .limit(limit + 1)
+    ).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        "since_id": since_id,
+        "columns": [c.name for c in CHANGE_COLUMNS],
+        "rows": [
+            [r.draw_term, r.draw_datetime.isoformat(), r.numbers_sequence,
+             r.super_number, r.high_low_result, r.odd_even_result]
+            for r in rows
+        ],
+        "next_since_id": rows[-1].id if rows else since_id,
+        "has_more": has_more,
+    }
+
+
 @router.get("/{draw_term}")
 def get_draw_by_term(draw_term: str, db: Session = Depends(get_db)):
     """取得特定期號資料"""
     draw = db.query(DrawResult).filter_by(draw_term=draw_term).first()
     if not draw:
-        from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="期號不存在")
     return {
         "draw_term": draw.draw_term,
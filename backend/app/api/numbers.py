@@ -0,0 +1,22 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Path, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.profiling import TimedRoute
+from analysis.number_index import get_number_index
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.get("/{number}/timeline")
+def get_number_timeline(
+    number: int = Path(..., ge=1, le=80),
+    window: Optional[int] = Query(None, ge=1, description="最近 N 期（預設全部歷史）"),
+    with_number: Optional[int] = Query(None, ge=1, le=80, description="同時查詢與此號碼共同出現"),
+    limit: int = Query(100, ge=1, le=5000, description="回傳最近幾次出現的期號"),
+    db: Session = Depends(get_db),
+):
+    """號碼出現期號、遺漏間隔分佈與共同出現紀錄"""
+    return get_number_index(db).timeline(number, window, with_number, limit)
@@ -1,29 +1,66 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional
 
 from app.database import get_db
+from app.metrics import record_cache
+from app.precomputed import StandardRequest, latest_term, lookup, request_key
+from app.profiling import TimedRoute, profiled_call, timed_call
+from app.singleflight import PREDICTIONS_FLIGHT
 from analysis.basic_analyzer import BasicAnalyzer
+from analysis.daily_stats import window_stats
+from analysis.hot_scores import get_hot_scores
+from analysis.offload import PoolSaturated, run_offloaded
+from analysis.prediction_tracker import (
+    PREDICTION_TYPES,
+    accuracy_table,
+    current_prediction,
+    prediction_to_dict,
+)
 from analysis.super_number_analyzer import SuperNumberAnalyzer
 from analysis.high_low_analyzer import HighLowAnalyzer
 from analysis.odd_even_analyzer import OddEvenAnalyzer
-from analysis.co_occurrence_analyzer import CoOccurrenceAnalyzer
 from analysis.tail_number_analyzer import TailNumberAnalyzer
 from analysis.zone_distribution_analyzer import ZoneDistributionAnalyzer
-from analysis.cold_hot_cycle_analyzer import ColdHotCycleAnalyzer
 from analysis.consecutive_number_analyzer import ConsecutiveNumberAnalyzer
 from analysis.smart_pick_engine import SmartPickEngine
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
-@router.get("/basic")
-def get_basic_prediction(
-    period_range: int = Query(30, ge=5, le=500),
-    top_n: int = Query(10, ge=5, le=20),
-    use_weighted: bool = Query(True),
-    db: Session = Depends(get_db),
-):
+def _serve(db: Session, name: str, **params) -> Any:
+    """
+    Prebuilt bytes when the post-ingest job has stored this exact request for
+    the current latest term; otherwise compute live, sharing one computation
+    among concurrent identical requests.
+    """
+    term = latest_term(db)
+    key = request_key(name, params)
+    body = lookup(db, key, term)
+    record_cache("precomputed", body is not None)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+    return PREDICTIONS_FLIGHT.do(key, lambda: BUILDERS[name](db, **params), version=term)
+
+
+async def _serve_offloaded(db: Session, name: str, **params) -> Any:
+    """
+    `_serve` for CPU-heavy builders: the event loop awaits a threadpool thread
+    that waits, without holding the GIL, on the analysis process pool.
+    """
+    try:
+        return await run_in_threadpool(profiled_call, _serve, db, name, **params)
+    except PoolSaturated:
+        raise HTTPException(status_code=503, detail="分析佇列已滿，請稍後再試", headers={"Retry-After": "1"})
+
+
+# ─── Response builders (shared by endpoints and precomputation) ───
+
+
+def _basic_response(db: Session, period_range: int, top_n: int, use_weighted: bool) -> Dict:
     result = BasicAnalyzer(db).analyze(period_range, top_n, use_weighted)
     return {
         "prediction_type": "basic",
@@ -38,15 +75,8 @@ def get_basic_prediction(
     }
 
 
-@router.get("/basic/batch")
-def get_basic_batch(
-    period_ranges: List[int] = Query([5, 10, 20, 30, 50, 100]),
-    top_n: int = Query(10, ge=5, le=20),
-    use_weighted: bool = Query(True),
-    db: Session = Depends(get_db),
-):
-    analyzer = BasicAnalyzer(db)
-    results = analyzer.batch_analyze(period_ranges, top_n, use_weighted)
+def _basic_batch_response(db: Session, period_ranges: List[int], top_n: int, use_weighted: bool) -> Dict:
+    results = BasicAnalyzer(db).batch_analyze(period_ranges, top_n, use_weighted)
     return {
         str(p): {
             "predictions": [
@@ -59,12 +89,7 @@ def get_basic_batch(
     }
 
 
-@router.get("/super-number")
-def get_super_prediction(
-    period_range: int = Query(30, ge=5, le=500),
-    top_n: int = Query(10, ge=5, le=20),
-    db: Session = Depends(get_db),
-):
+def _super_number_response(db: Session, period_range: int, top_n: int) -> Dict:
     result = SuperNumberAnalyzer(db).analyze(period_range, top_n)
     return {
         "prediction_type": "super_number",
@@ -76,12 +101,157 @@ def get_super_prediction(
     }
 
 
+def _all_response(db: Session, period_range: int) -> Dict:
+    return {
+        "basic": timed_call("analyzer.basic", BasicAnalyzer(db).analyze, period_range),
+        "super_number": timed_call("analyzer.super_number", SuperNumberAnalyzer(db).analyze, period_range),
+        "high_low": timed_call("analyzer.high_low", HighLowAnalyzer(db).analyze, period_range),
+        "odd_even": timed_call("analyzer.odd_even", OddEvenAnalyzer(db).analyze, period_range),
+        "co_occurrence": timed_call(
+            "analyzer.co_occurrence", run_offloaded, db, "co_occurrence", period_range=period_range
+        ),
+        "tail_number": timed_call("analyzer.tail_number", TailNumberAnalyzer(db).analyze, period_range),
+        "zone_distribution": timed_call(
+            "analyzer.zone_distribution", ZoneDistributionAnalyzer(db).analyze, period_range
+        ),
+        "cold_hot_cycle": timed_call(
+            "analyzer.cold_hot_cycle", run_offloaded, db, "cold_hot_cycle", period_range=period_range
+        ),
+        "consecutive": timed_call("analyzer.consecutive", ConsecutiveNumberAnalyzer(db).analyze, period_range),
+        "period_range": period_range,
+    }
+
+
+BUILDERS: Dict[str, Callable[..., Any]] = {
+    "basic": _basic_response,
+    "basic-batch": _basic_batch_response,
+    "super-number": _super_number_response,
+    "high-low": lambda db, period_range: HighLowAnalyzer(db).analyze(period_range),
+    "odd-even": lambda db, period_range: OddEvenAnalyzer(db).analyze(period_range),
+    "co-occurrence": lambda db, **kw: run_offloaded(db, "co_occurrence", **kw),
+    "tail-number": lambda db, **kw: TailNumberAnalyzer(db).analyze(**kw),
+    "zone-distribution": lambda db, period_range: ZoneDistributionAnalyzer(db).analyze(period_range),
+    "cold-hot-cycle": lambda db, **kw: run_offloaded(db, "cold_hot_cycle", **kw),
+    "consecutive": lambda db, period_range: ConsecutiveNumberAnalyzer(db).analyze(period_range),
+    "smart-pick": lambda db, **kw: SmartPickEngine(db).pick(**kw),
+    "all": _all_response,
+}
+
+# PeriodSelector.vue options, with the parameters the frontend sends (services/api.js)
+STANDARD_PERIOD_RANGES = [5, 10, 20, 30, 50, 100]
+STANDARD_REQUESTS: List[StandardRequest] = [
+    (name, dict(period_range=p, **extra))
+    for p in STANDARD_PERIOD_RANGES
+    for name, extra in [
+        ("all", {}),
+        ("basic", {"top_n": 10, "use_weighted": True}),
+        ("super-number", {"top_n": 10}),
+        ("high-low", {}),
+        ("odd-even", {}),
+        ("co-occurrence", {"top_n": 15, "target_number": None}),
+        ("tail-number", {"top_n": 3}),
+        ("zone-distribution", {}),
+        ("consecutive", {}),
+    ] + [("smart-pick", {"pick_count": 10, "star_level": s}) for s in range(1, 6)]
+] + [
+    ("cold-hot-cycle", {"period_range": p, "recent_window": 10, "top_n": 10})
+    for p in STANDARD_PERIOD_RANGES if p >= 10
+] + [
+    ("basic-batch", {"period_ranges": STANDARD_PERIOD_RANGES, "top_n": 10, "use_weighted": True}),
+]
+
+
+# ─── Endpoints ────────────────────────────────────────────
+
+
+@router.get("/basic")
+def get_basic_prediction(
+    period_range: int = Query(30, ge=5, le=500),
+    top_n: int = Query(10, ge=5, le=20),
+    use_weighted: bool = Query(True),
+    db: Session = Depends(get_db),
+):
+    return _serve(db, "basic", period_range=period_range, top_n=top_n, use_weighted=use_weighted)
+
+
+@router.get("/basic/batch")
+def get_basic_batch(
+    period_ranges: List[int] = Query([5, 10, 20, 30, 50, 100]),
+    top_n: int = Query(10, ge=5, le=20),
+    use_weighted: bool = Query(True),
+    db: Session = Depends(get_db),
+):
+    return _serve(db, "basic-batch", period_ranges=period_ranges, top_n=top_n, use_weighted=use_weighted)
+
+
+@router.get("/hot-scores")
+def get_hot_scores_snapshot(db: Session = Depends(get_db)):
+    """各衰減率的號碼 / 超級獎號 EWMA 熱度（每期增量更新）"""
+    return get_hot_scores(db).snapshot()
+
+
+@router.get("/current")
+def get_current_prediction(
+    prediction_type: str = Query("basic", pattern="^(" + "|".join(PREDICTION_TYPES) + ")$"),
+    period_range: int = Query(30),
+    db: Session = Depends(get_db),
+):
+    """下一期的預測快照（入庫時已計算好）"""
+    prediction = current_prediction(db, prediction_type, period_range)
+    if prediction is None:
+        raise HTTPException(status_code=404, detail="尚無預測快照")
+    return prediction_to_dict(prediction)
+
+
+@router.get("/accuracy")
+def get_prediction_accuracy(db: Session = Depends(get_db)):
+    """各預測類型 / 期數的累計與近期命中率"""
+    return accuracy_table(db)
+
+
+@router.get("/long-range")
+def get_long_range(
+    days: Optional[int] = Query(None, ge=1, le=3650, description="最近 N 天（如 7 / 30 / 365）"),
+    from_date: Optional[date] = Query(None),
+    to_date: Optional[date] = Query(None),
+    top_n: int = Query(10, ge=5, le=20),
+    db: Session = Depends(get_db),
+):
+    """以每日彙總表回答長期間統計（最近 N 天或自訂日期區間）"""
+    if days is None and from_date is None and to_date is None:
+        days = 30
+    if days is not None and from_date is not None:
+        raise HTTPException(status_code=400, detail="days 與 from_date 不可同時指定")
+    if from_date and to_date and from_date > to_date:
+        raise HTTPException(status_code=400, detail="from_date 不可晚於 to_date")
+    return window_stats(db, days=days, from_date=from_date, to_date=to_date, top_n=top_n)
+
+
+@router.get("/super-number")
+def get_super_prediction(
+    period_range: int = Query(30, ge=5, le=500),
+    top_n: int = Query(10, ge=5, le=20),
+    db: Session = Depends(get_db),
+):
+    return _serve(db, "super-number", period_range=period_range, top_n=top_n)
+
+
 @router.get("/high-low")
 def get_high_low_prediction(
     period_range: int = Query(30, ge=5, le=500),
     db: Session = Depends(get_db),
 ):
-    return HighLowAnalyzer(db).analyze(period_range)
+    return _serve(db, "high-low", period_range=period_range)
+
+
+@router.get("/high-low/history")
+def get_high_low_history(
+    limit: int = Query(100, ge=1, le=1000),
+    before_term: Optional[int] = Query(None, description="分頁游標：只取此期之前開始的連莊"),
+    window: Optional[int] = Query(None, ge=1, description="連莊分佈統計期數（預設全部歷史）"),
+    db: Session = Depends(get_db),
+):
+    return HighLowAnalyzer(db).history(limit, before_term, window)
 
 
 @router.get("/odd-even")
@@ -89,17 +259,29 @@ def get_odd_even_prediction(
     period_range: int = Query(30, ge=5, le=500),
     db: Session = Depends(get_db),
 ):
-    return OddEvenAnalyzer(db).analyze(period_range)
+    return _serve(db, "odd-even", period_range=period_range)
+
+
+@router.get("/odd-even/history")
+def get_odd_even_history(
+    limit: int = Query(100, ge=1, le=1000),
+    before_term: Optional[int] = Query(None, description="分頁游標：只取此期之前開始的連莊"),
+    window: Optional[int] = Query(None, ge=1, description="連莊分佈統計期數（預設全部歷史）"),
+    db: Session = Depends(get_db),
+):
+    return OddEvenAnalyzer(db).history(limit, before_term, window)
 
 
 @router.get("/co-occurrence")
-def get_co_occurrence(
+async def get_co_occurrence(
     period_range: int = Query(30, ge=5, le=500),
     top_n: int = Query(15, ge=5, le=30),
     target_number: Optional[str] = Query(None),
     db: Session = Depends(get_db),
 ):
-    return CoOccurrenceAnalyzer(db).analyze(period_range, top_n, target_number)
+    return await _serve_offloaded(
+        db, "co-occurrence", period_range=period_range, top_n=top_n, target_number=target_number
+    )
 
 
 @router.get("/tail-number")
@@ -108,7 +290,7 @@ def get_tail_number(
     top_n: int = Query(3, ge=1, le=10),
     db: Session = Depends(get_db),
 ):
-    return TailNumberAnalyzer(db).analyze(period_range, top_n)
+    return _serve(db, "tail-number", period_range=period_range, top_n=top_n)
 
 
 @router.get("/zone-distribution")
@@ -116,17 +298,19 @@ def get_zone_distribution(
     period_range: int = Query(30, ge=5, le=500),
     db: Session = Depends(get_db),
 ):
-    return ZoneDistributionAnalyzer(db).analyze(period_range)
+    return _serve(db, "zone-distribution", period_range=period_range)
 
 
 @router.get("/cold-hot-cycle")
-def get_cold_hot_cycle(
+async def get_cold_hot_cycle(
     period_range: int = Query(100, ge=10, le=500),
     recent_window: int = Query(10, ge=5, le=50),
     top_n: int = Query(10, ge=5, le=20),
     db: Session = Depends(get_db),
 ):
-    return ColdHotCycleAnalyzer(db).analyze(period_range, recent_window, top_n)
+    return await _serve_offloaded(
+        db, "cold-hot-cycle", period_range=period_range, recent_window=recent_window, top_n=top_n
+    )
 
 
 @router.get("/consecutive")
@@ -134,33 +318,24 @@ def get_consecutive(
     period_range: int = Query(30, ge=5, le=500),
     db: Session = Depends(get_db),
 ):
-    return ConsecutiveNumberAnalyzer(db).analyze(period_range)
+    return _serve(db, "consecutive", period_range=period_range)
 
 
 @router.get("/smart-pick")
-def get_smart_pick(
+async def get_smart_pick(
     period_range: int = Query(30, ge=5, le=500),
     pick_count: int = Query(10, ge=3, le=20),
     star_level: int = Query(3, ge=1, le=5),
     db: Session = Depends(get_db),
 ):
-    return SmartPickEngine(db).pick(period_range, pick_count, star_level)
+    return await _serve_offloaded(
+        db, "smart-pick", period_range=period_range, pick_count=pick_count, star_level=star_level
+    )
 
 
 @router.get("/all")
-def get_all_predictions(
+async def get_all_predictions(
     period_range: int = Query(30, ge=5, le=500),
     db: Session = Depends(get_db),
 ):
-    return {
-        "basic": BasicAnalyzer(db).analyze(period_range),
-        "super_number": SuperNumberAnalyzer(db).analyze(period_range),
-        "high_low": HighLowAnalyzer(db).analyze(period_range),
-        "odd_even": OddEvenAnalyzer(db).analyze(period_range),
-        "co_occurrence": CoOccurrenceAnalyzer(db).analyze(period_range),
-        "tail_number": TailNumberAnalyzer(db).analyze(period_range),
-        "zone_distribution": ZoneDistributionAnalyzer(db).analyze(period_range),
-        "cold_hot_cycle": ColdHotCycleAnalyzer(db).analyze(period_range),
-        "consecutive": ConsecutiveNumberAnalyzer(db).analyze(period_range),
-        "period_range": period_range,
-    }
+    return await _serve_offloaded(db, "all", period_range=period_range)
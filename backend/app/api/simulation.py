@@ -8,11 +8,16 @@ from typing import List, Optional
 
 from app.config import settings
 from app.database import get_db
+from app.profiling import TimedRoute
 from app.models.draw_result import DrawResult
 from app.models.simulated_bet import SimulatedBet
+from app.models.archived_bet import BetDailySummary
+from app.models.auto_bet_subscription import AutoBetSubscription
+from analysis.auto_bet import MAX_COMBOS, MAX_STAR_LEVEL, STRATEGIES, subscription_to_dict
+from analysis.bet_placement import bet_rows, insert_bets
 from analysis.bet_settler import auto_settle_all
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 def get_session_id(x_session_id: str = Header(None)) -> str:
@@ -98,9 +103,21 @@ def get_next_draw(db: Session = Depends(get_db)):
     return _calc_next_draw_time(latest_term, db)
 
 
-@router.post("/bet")
-def place_bet(req: PlaceBetRequest, db: Session = Depends(get_db), session_id: str = Depends(get_session_id)):
-    """下注（支援多期）"""
+MAX_BULK_BETS = 5000
+
+
+class BulkBetRequest(BaseModel):
+    bets: List[PlaceBetRequest]
+
+    @field_validator("bets")
+    @classmethod
+    def validate_bets(cls, v: List[PlaceBetRequest]) -> List[PlaceBetRequest]:
+        if not 1 <= len(v) <= MAX_BULK_BETS:
+            raise ValueError(f"一次最多 {MAX_BULK_BETS} 筆投注")
+        return v
+
+
+def _validate_bet(req: PlaceBetRequest):
     if req.bet_type == "basic":
         if req.star_level is None or not 1 <= req.star_level <= 10:
             raise HTTPException(400, "基本玩法需要 star_level (1-10)")
@@ -119,31 +136,55 @@ def place_bet(req: PlaceBetRequest, db: Session = Depends(get_db), session_id: s
         if not req.selected_option or req.selected_option not in VALID_OPTIONS:
             raise HTTPException(400, f"需要 selected_option: {VALID_OPTIONS}")
 
-    latest_term = _get_latest_draw_term(db)
-    numbers_str = ",".join(req.selected_numbers) if req.selected_numbers else None
-
-    created_bets = []
-    for i in range(req.bet_periods):
-        target_term = str(latest_term + 1 + i)
-        bet = SimulatedBet(
-            session_id=session_id,
-            bet_type=req.bet_type,
-            star_level=req.star_level,
-            selected_numbers=numbers_str,
-            selected_option=req.selected_option,
-            bet_amount=25,
-            multiplier=req.multiplier,
-            target_draw_term=target_term,
-            status="pending",
-        )
-        db.add(bet)
-        created_bets.append(bet)
 
+def _rows_for(req: PlaceBetRequest, session_id: str, latest_term: int, now: datetime) -> List[dict]:
+    return bet_rows(
+        session_id,
+        req.bet_type,
+        latest_term + 1,
+        star_level=req.star_level,
+        selected_numbers=req.selected_numbers,
+        selected_option=req.selected_option,
+        multiplier=req.multiplier,
+        bet_periods=req.bet_periods,
+        now=now,
+    )
+
+
+@router.post("/bet")
+def place_bet(req: PlaceBetRequest, db: Session = Depends(get_db), session_id: str = Depends(get_session_id)):
+    """下注（支援多期）"""
+    _validate_bet(req)
+    latest_term = _get_latest_draw_term(db)
+    created = insert_bets(db, _rows_for(req, session_id, latest_term, datetime.utcnow()))
     db.commit()
-    for b in created_bets:
-        db.refresh(b)
+    return [_bet_to_dict(b) for b in created]
+
+
+@router.post("/bets/bulk")
+def place_bets_bulk(
+    req: BulkBetRequest, db: Session = Depends(get_db), session_id: str = Depends(get_session_id)
+):
+    """批次下注：全部驗證通過才寫入，單一交易"""
+    errors = []
+    for i, bet in enumerate(req.bets):
+        try:
+            _validate_bet(bet)
+        except HTTPException as e:
+            errors.append({"index": i, "error": e.detail})
+    if errors:
+        raise HTTPException(400, {"message": "投注驗證失敗", "errors": errors})
 
-    return [_bet_to_dict(b) for b in created_bets]
+    latest_term = _get_latest_draw_term(db)
+    now = datetime.utcnow()
+    rows = [row for bet in req.bets for row in _rows_for(bet, session_id, latest_term, now)]
+    created = insert_bets(db, rows)
+    db.commit()
+    return {
+        "count": len(created),
+        "ids": [b.id for b in created],
+        "total_cost": sum(b.bet_amount * b.multiplier for b in created),
+    }
 
 
 @router.get("/bets")
@@ -184,6 +225,18 @@ def get_stats(db: Session = Depends(get_db), session_id: str = Depends(get_sessi
         SimulatedBet.status == "pending",
     ).scalar()
 
+    # Bets moved out by the retention job only survive as daily totals
+    archived = db.query(
+        func.coalesce(func.sum(BetDailySummary.bets), 0),
+        func.coalesce(func.sum(BetDailySummary.wins), 0),
+        func.coalesce(func.sum(BetDailySummary.total_cost), 0),
+        func.coalesce(func.sum(BetDailySummary.total_prize), 0),
+    ).filter(BetDailySummary.session_id == session_id).one()
+    total_bets += archived[0]
+    wins += archived[1]
+    total_cost += archived[2]
+    total_prize += archived[3]
+
     return {
         "total_bets": total_bets,
         "wins": wins,
@@ -227,6 +280,109 @@ def cancel_bet(bet_id: int, db: Session = Depends(get_db), session_id: str = Dep
     return {"ok": True, "id": bet_id}
 
 
+# ─── Auto-bet subscriptions ───────────────────────────────
+
+MAX_ACTIVE_SUBSCRIPTIONS = 20
+
+
+class AutoBetRequest(BaseModel):
+    strategy: str
+    period_range: int = 30
+    star_level: Optional[int] = None
+    combo_count: int = 1
+    multiplier: int = 1
+    draws: int
+
+    @field_validator("strategy")
+    @classmethod
+    def validate_strategy(cls, v: str) -> str:
+        if v not in STRATEGIES:
+            raise ValueError(f"strategy 必須是 {STRATEGIES} 之一")
+        return v
+
+    @field_validator("period_range")
+    @classmethod
+    def validate_period_range(cls, v: int) -> int:
+        if not 5 <= v <= 500:
+            raise ValueError("分析期數必須在 5~500 之間")
+        return v
+
+    @field_validator("combo_count")
+    @classmethod
+    def validate_combo_count(cls, v: int) -> int:
+        if not 1 <= v <= MAX_COMBOS:
+            raise ValueError(f"組合數必須在 1~{MAX_COMBOS} 之間")
+        return v
+
+    @field_validator("multiplier")
+    @classmethod
+    def validate_multiplier(cls, v: int) -> int:
+        if not 1 <= v <= 50:
+            raise ValueError("倍數必須在 1~50 之間")
+        return v
+
+    @field_validator("draws")
+    @classmethod
+    def validate_draws(cls, v: int) -> int:
+        if not 1 <= v <= 500:
+            raise ValueError("期數必須在 1~500 之間")
+        return v
+
+
+@router.post("/auto-bets")
+def create_auto_bet(req: AutoBetRequest, db: Session = Depends(get_db), session_id: str = Depends(get_session_id)):
+    """建立自動投注訂閱（每期開獎入庫後由排程下注）"""
+    if req.strategy == "smart_pick":
+        if req.star_level is None or not 1 <= req.star_level <= MAX_STAR_LEVEL:
+            raise HTTPException(400, f"智能選號需要 star_level (1-{MAX_STAR_LEVEL})")
+    active = db.query(func.count(AutoBetSubscription.id)).filter(
+        AutoBetSubscription.session_id == session_id,
+        AutoBetSubscription.status == "active",
+    ).scalar()
+    if active >= MAX_ACTIVE_SUBSCRIPTIONS:
+        raise HTTPException(400, f"進行中的訂閱最多 {MAX_ACTIVE_SUBSCRIPTIONS} 個")
+
+    sub = AutoBetSubscription(
+        session_id=session_id,
+        strategy=req.strategy,
+        period_range=req.period_range,
+        star_level=req.star_level if req.strategy == "smart_pick" else None,
+        combo_count=req.combo_count if req.strategy == "smart_pick" else 1,
+        multiplier=req.multiplier,
+        draws_total=req.draws,
+        draws_done=0,
+        status="active",
+    )
+    db.add(sub)
+    db.commit()
+    return subscription_to_dict(sub)
+
+
+@router.get("/auto-bets")
+def list_auto_bets(db: Session = Depends(get_db), session_id: str = Depends(get_session_id)):
+    """取得自動投注訂閱"""
+    subs = db.query(AutoBetSubscription).filter(
+        AutoBetSubscription.session_id == session_id
+    ).order_by(AutoBetSubscription.id.desc()).all()
+    return [subscription_to_dict(s) for s in subs]
+
+
+@router.delete("/auto-bets/{sub_id}")
+def cancel_auto_bet(sub_id: int, db: Session = Depends(get_db), session_id: str = Depends(get_session_id)):
+    """取消自動投注訂閱（已下的投注保留）"""
+    sub = db.query(AutoBetSubscription).filter(
+        AutoBetSubscription.id == sub_id,
+        AutoBetSubscription.session_id == session_id,
+    ).first()
+    if not sub:
+        raise HTTPException(404, "訂閱不存在")
+    if sub.status != "active":
+        raise HTTPException(400, "只能取消進行中的訂閱")
+    sub.status = "cancelled"
+    db.commit()
+    return subscription_to_dict(sub)
+
+
 def _validate_numbers(numbers: List[str]):
     for n in numbers:
         try:
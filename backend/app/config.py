@@ -7,10 +7,45 @@ class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///./bingo.db"
     CRAWLER_INTERVAL_MINUTES: int = 6
     CRAWLER_RELAX_TLS_STRICT: bool = False
+    CRAWLER_API_BASE_URL: str = "https://api.taiwanlottery.com/TLCAPIWeB/Lottery/BingoResult"
+    CRAWLER_PAGE_SIZE: int = 50
+    CRAWLER_MAX_PAGES: int = 1
+    CRAWLER_MAX_RETRIES: int = 2
+    CRAWLER_RETRY_BACKOFF: float = 0.5
+    CRAWLER_ARCHIVE_DIR: str = ""  # content-addressed store of raw API pages for offline replay (empty = off)
     ENV: str = "development"
     BINGO_FIRST_DRAW_HOUR: int = 7
     BINGO_FIRST_DRAW_MINUTE: int = 5
     ALLOWED_ORIGINS: List[str] = []
+    SERVER_TIMING_ENABLED: bool = True
+    SERVER_TIMING_ORM: bool = False  # buffer ORM SELECTs to time hydration separately ("orm" phase)
+    ADMIN_TOKEN: str = ""  # enables ?profile=1 for requests sending X-Admin-Token
+    METRICS_ENABLED: bool = True
+    METRICS_MULTIPROC_DIR: str = ""  # shared dir so /metrics aggregates all gunicorn workers
+    METRICS_FLUSH_SECONDS: float = 1.0
+    DRAW_STORE_PATH: str = ""  # append-only binary history file (empty = disabled)
+    SINGLEFLIGHT_DIR: str = ""  # shared dir so identical computations coalesce across workers
+    SINGLEFLIGHT_SHARED_TTL: float = 5.0  # seconds another worker may reuse a published result
+    ANALYSIS_POOL_PROCESSES: int = 2  # per web worker, for CPU-heavy analyzers (0 = run inline)
+    ANALYSIS_POOL_MAX_PENDING: int = 16  # queued jobs per web worker before answering 503
+    ANALYTICS_ENGINE: str = "python"  # "duckdb" runs co-occurrence / cold-hot-cycle as SQL (needs duckdb)
+    ANALYTICS_DUCKDB_SOURCE: str = ""  # Parquet export for DuckDB (empty = attach the SQLite DATABASE_URL)
+    ANALYTICS_SQL_PUSHDOWN: bool = False  # count with GROUP BY on draw_numbers (run scripts.backfill_draw_numbers first)
+    SCHEDULER_ENABLED: bool = True  # run crawl / post-ingest jobs in web workers (false with scheduler.worker)
+    NOTIFY_DIR: str = ""  # Unix socket dir for new-draw notifications (empty = web workers poll the DB)
+    NOTIFY_POLL_SECONDS: float = 5.0  # DB poll interval when NOTIFY_DIR is empty
+    SYNC_PRIMARY_URL: str = ""  # replica mode: pull draws from this primary instead of crawling
+    SYNC_INTERVAL_SECONDS: int = 10  # replica pull interval
+    SYNC_BATCH_SIZE: int = 1000  # draws per /api/draws/changes request
+    PIPELINE_WORKERS: int = 4  # post-ingest stages run concurrently on this many threads
+    PIPELINE_STAGE_RETRIES: int = 2  # in-run retries per failed stage
+    PIPELINE_RETRY_BACKOFF: float = 1.0  # seconds before the first in-run retry, doubled each time
+    PIPELINE_RETRY_MINUTES: int = 5  # re-run recorded failed stages without crawling (0 = disabled)
+    PRECOMPUTE_PROCESSES: int = 2  # post-ingest precomputation pool size (0 = run inline)
+    RETENTION_INTERVAL_HOURS: int = 24  # 0 = retention job disabled
+    RETENTION_BET_DAYS: int = 30  # settled bets older than this move to archived_bets
+    RETENTION_LOG_DAYS: int = 7  # crawler_logs older than this roll up into crawler_log_daily
+    RETENTION_VACUUM_PAGES: int = 0  # incremental_vacuum page budget per run (0 = all free pages)
 
     model_config = {"env_file": ".env"}
 
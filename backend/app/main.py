@@ -2,23 +2,37 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.config import settings
 from app.database import engine, SessionLocal, Base
-from app.api import draws, predictions, status, simulation
+from app.profiling import ServerTimingMiddleware
+from app.metrics import CONTENT_TYPE, REGISTRY, MetricsMiddleware, watch_pool
+from app.notify import DrawListener, on_new_draw
+from app.precomputed import shutdown_pool
+from analysis.offload import shutdown_analysis_pool
+from app.api import draws, numbers, predictions, status, simulation
 from app import models  # noqa: F401  # Ensure all ORM models are registered before create_all
 from scheduler.tasks import setup_scheduler
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup: create tables + start scheduler
+    # Startup: create tables, then either run the scheduler here or listen for
+    # new-draw notifications from the ingestion daemon (scheduler.worker)
     Base.metadata.create_all(bind=engine)
-    scheduler = setup_scheduler(SessionLocal)
-    app.state.scheduler = scheduler
+    app.state.scheduler = setup_scheduler(SessionLocal) if settings.SCHEDULER_ENABLED else None
+    app.state.draw_listener = (
+        None if settings.SCHEDULER_ENABLED else DrawListener(on_new_draw(SessionLocal), SessionLocal).start()
+    )
     yield
-    # Shutdown: stop scheduler
-    app.state.scheduler.shutdown()
+    # Shutdown: stop scheduler / listener, then the process pools
+    if app.state.scheduler is not None:
+        app.state.scheduler.shutdown()
+    if app.state.draw_listener is not None:
+        app.state.draw_listener.stop()
+    shutdown_pool()
+    shutdown_analysis_pool()
 
 
 app = FastAPI(
@@ -45,7 +59,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    watch_pool(engine)
+
 app.include_router(draws.router, prefix="/api/draws", tags=["開獎資料"])
+app.include_router(numbers.router, prefix="/api/numbers", tags=["號碼"])
 app.include_router(predictions.router, prefix="/api/predictions", tags=["預測"])
 app.include_router(status.router, prefix="/api/status", tags=["狀態"])
 app.include_router(simulation.router, prefix="/api/simulation", tags=["模擬投注"])
@@ -59,3 +80,8 @@ def root():
 @app.get("/health")
 def health():
     return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -0,0 +1,456 @@
+"""
+Lightweight Prometheus-style metrics (text exposition format 0.0.4).
+
+Metrics live in process memory; updating one is a dict lookup under a lock.
+With several gunicorn workers, set METRICS_MULTIPROC_DIR: every process
+then writes its snapshot to `<dir>/metrics_<pid>_<start>.json` at most once
+per METRICS_FLUSH_SECONDS, and a scrape on any worker merges all snapshots.
+The start time keeps a worker that reuses an exited worker's pid from
+overwriting its snapshot. Snapshots of exited processes are renamed to
+`retired_*.json`: their counters and histograms still count, so totals never
+go backwards, and their gauges are dropped. Gauges are reported per live pid.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+LAG_BUCKETS = (30, 60, 120, 300, 600, 1800, 3600, 6 * 3600, 24 * 3600)
+SIZE_BUCKETS = (0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000, 100000)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LabelKey = Tuple[str, ...]
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, registry: "Registry", name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._registry = registry
+        self._values: Dict[LabelKey, object] = {}
+        registry.register(self)
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def snapshot(self) -> Dict:
+        with self._registry.lock:
+            samples = [[list(k), v] for k, v in self._values.items()]
+        return {"kind": self.kind, "help": self.help, "labelnames": list(self.labelnames),
+                "samples": samples}
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._registry.lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+        self._registry.maybe_flush()
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._registry.lock:
+            self._values[key] = float(value)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, registry, name, help, labelnames=(), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(registry, name, help, labelnames)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._registry.lock:
+            state = self._values.get(key)
+            if state is None:
+                state = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._values[key] = state
+            idx = len(self.buckets)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    idx = i
+                    break
+            state[0][idx] += 1
+            state[1] += value
+            state[2] += 1
+        self._registry.maybe_flush()
+
+    def time(self, **labels) -> "_Timer":
+        return _Timer(self, labels)
+
+    def snapshot(self) -> Dict:
+        snap = super().snapshot()
+        snap["buckets"] = list(self.buckets)
+        snap["samples"] = [[k, [list(v[0]), v[1], v[2]]] for k, v in snap["samples"]]
+        return snap
+
+
+class _Timer:
+    def __init__(self, histogram: Histogram, labels: Dict[str, str]):
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._histogram.observe(time.perf_counter() - self._start, **self._labels)
+
+
+class Registry:
+    def __init__(self, multiproc_dir: str = "", flush_seconds: float = 1.0):
+        self.lock = threading.RLock()
+        self.metrics: Dict[str, _Metric] = {}
+        self.collectors: List[Callable[[], None]] = []
+        self.multiproc_dir = multiproc_dir
+        self.flush_seconds = flush_seconds
+        self._last_flush = 0.0
+        self._instance_pid: Optional[int] = None
+        self._instance = ""
+
+    def register(self, metric: _Metric):
+        self.metrics[metric.name] = metric
+
+    def add_collector(self, fn: Callable[[], None]):
+        """fn runs before every flush / render to refresh gauges."""
+        self.collectors.append(fn)
+
+    def counter(self, name, help, labelnames=()) -> Counter:
+        return Counter(self, name, help, labelnames)
+
+    def gauge(self, name, help, labelnames=()) -> Gauge:
+        return Gauge(self, name, help, labelnames)
+
+    def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return Histogram(self, name, help, labelnames, buckets)
+
+    # ─── Snapshots ────────────────────────────────────────
+
+    def _collect(self):
+        for fn in self.collectors:
+            try:
+                fn()
+            except Exception:
+                logger.exception("metrics collector failed")
+
+    def snapshot(self) -> Dict[str, Dict]:
+        return {name: m.snapshot() for name, m in self.metrics.items()}
+
+    def _snapshot_name(self) -> str:
+        """`metrics_<pid>_<start>.json` for this process (a new name after fork)."""
+        with self.lock:
+            pid = os.getpid()
+            if self._instance_pid != pid:
+                self._instance_pid = pid
+                self._instance = f"metrics_{pid}_{time.time_ns()}.json"
+                # Snapshots left under our pid belong to an exited process
+                for fname in self._snapshot_files():
+                    if fname.startswith("metrics_") and _snapshot_pid(fname) == pid:
+                        self._retire(fname)
+            return self._instance
+
+    def _snapshot_files(self) -> List[str]:
+        try:
+            names = os.listdir(self.multiproc_dir)
+        except OSError:
+            return []
+        return [n for n in names if n.endswith(".json") and n.startswith(("metrics_", "retired_"))]
+
+    def _retire(self, fname: str):
+        # rename is atomic: when several workers retire the same file, one wins
+        try:
+            os.replace(os.path.join(self.multiproc_dir, fname),
+                       os.path.join(self.multiproc_dir, "retired_" + fname[len("metrics_"):]))
+        except OSError:
+            pass
+
+    def maybe_flush(self):
+        if not self.multiproc_dir:
+            return
+        now = time.monotonic()
+        if now - self._last_flush < self.flush_seconds:
+            return
+        self._last_flush = now
+        self.flush()
+
+    def flush(self):
+        if not self.multiproc_dir:
+            return
+        self._collect()
+        try:
+            os.makedirs(self.multiproc_dir, exist_ok=True)
+            path = os.path.join(self.multiproc_dir, self._snapshot_name())
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp, path)
+        except OSError:
+            logger.exception("metrics flush failed")
+
+    def _gather(self) -> List[Tuple[Optional[int], Dict[str, Dict]]]:
+        """(pid, snapshot) for this process and, in multiproc mode, every snapshot file."""
+        self._collect()
+        if not self.multiproc_dir:
+            return [(None, self.snapshot())]
+
+        self.flush()
+        own = self._snapshot_name()
+        gathered = []
+        for fname in self._snapshot_files():
+            pid = _snapshot_pid(fname)
+            live = fname.startswith("metrics_")
+            if live and fname != own and (pid is None or not _pid_alive(pid)):
+                self._retire(fname)
+                live = False
+            snap = self._load(fname) if live else None
+            if snap is None:  # retired, possibly by another worker since listdir()
+                live = False
+                snap = self._load("retired_" + fname.split("_", 1)[1])
+            if snap is None:
+                continue
+            if live:
+                gathered.append((pid, snap))
+            else:
+                gathered.append((None, {k: m for k, m in snap.items() if m["kind"] != "gauge"}))
+        return gathered
+
+    def _load(self, fname: str) -> Optional[Dict[str, Dict]]:
+        try:
+            with open(os.path.join(self.multiproc_dir, fname), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    # ─── Exposition ───────────────────────────────────────
+
+    def render(self) -> str:
+        merged: Dict[str, Dict] = {}
+        for pid, snap in self._gather():
+            for name, m in snap.items():
+                target = merged.setdefault(name, {**m, "values": {}})
+                for labels, value in m["samples"]:
+                    if m["kind"] == "gauge":
+                        labelnames = list(m["labelnames"]) + (["pid"] if pid is not None else [])
+                        target["labelnames"] = labelnames
+                        key = tuple(labels) + ((str(pid),) if pid is not None else ())
+                        target["values"][key] = value
+                    elif m["kind"] == "counter":
+                        key = tuple(labels)
+                        target["values"][key] = target["values"].get(key, 0.0) + value
+                    else:
+                        key = tuple(labels)
+                        cur = target["values"].get(key)
+                        if cur is None:
+                            target["values"][key] = [list(value[0]), value[1], value[2]]
+                        else:
+                            cur[0] = [a + b for a, b in zip(cur[0], value[0])]
+                            cur[1] += value[1]
+                            cur[2] += value[2]
+
+        lines: List[str] = []
+        for name in sorted(merged):
+            m = merged[name]
+            lines.append(f"# HELP {name} {m['help']}")
+            lines.append(f"# TYPE {name} {m['kind']}")
+            for key, value in sorted(m["values"].items()):
+                labels = dict(zip(m["labelnames"], key))
+                if m["kind"] != "histogram":
+                    lines.append(f"{name}{_fmt_labels(labels)} {_fmt_value(value)}")
+                    continue
+                counts, total, count = value
+                cumulative = 0
+                for bound, c in zip(list(m["buckets"]) + ["+Inf"], counts):
+                    cumulative += c
+                    le = bound if bound == "+Inf" else _fmt_value(bound)
+                    lines.append(f"{name}_bucket{_fmt_labels({**labels, 'le': le})} {cumulative}")
+                lines.append(f"{name}_sum{_fmt_labels(labels)} {_fmt_value(total)}")
+                lines.append(f"{name}_count{_fmt_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _snapshot_pid(fname: str) -> Optional[int]:
+    try:
+        return int(fname.split("_")[1].split(".")[0])
+    except (IndexError, ValueError):
+        return None
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _fmt_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    inner = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+    return "{" + inner + "}"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_value(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+REGISTRY = Registry(settings.METRICS_MULTIPROC_DIR, settings.METRICS_FLUSH_SECONDS)
+atexit.register(REGISTRY.flush)
+
+# ─── Application metrics ──────────────────────────────────
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "bingo_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+)
+CRAWL_DURATION = REGISTRY.histogram(
+    "bingo_crawl_duration_seconds", "Duration of a full crawler run", ("status",)
+)
+CRAWL_API_LATENCY = REGISTRY.histogram(
+    "bingo_crawl_api_latency_seconds",
+    "TLC API page request latency by query day (0 = today, 1 = yesterday)",
+    ("day_offset", "outcome"),
+)
+CRAWL_RECORDS = REGISTRY.counter(
+    "bingo_crawl_records_total", "Draw records processed by the crawler", ("result",)
+)
+INGEST_LAG = REGISTRY.histogram(
+    "bingo_draw_ingest_lag_seconds",
+    "Delay between draw_datetime and the row being inserted",
+    buckets=LAG_BUCKETS,
+)
+SETTLEMENT_BATCH_SIZE = REGISTRY.histogram(
+    "bingo_settlement_batch_size", "Pending bets loaded per settlement run", buckets=SIZE_BUCKETS
+)
+SETTLEMENT_DURATION = REGISTRY.histogram(
+    "bingo_settlement_duration_seconds", "Duration of a settlement run"
+)
+BETS_SETTLED = REGISTRY.counter(
+    "bingo_bets_settled_total", "Bets settled", ("status",)
+)
+RETENTION_DURATION = REGISTRY.histogram(
+    "bingo_retention_duration_seconds", "Duration of a retention / compaction run"
+)
+RETENTION_ROWS = REGISTRY.counter(
+    "bingo_retention_rows_total", "Rows archived or rolled up by the retention job", ("table",)
+)
+RETENTION_RECLAIMED_BYTES = REGISTRY.counter(
+    "bingo_retention_reclaimed_bytes_total", "Database file bytes reclaimed by compaction"
+)
+ANALYSIS_POOL_PENDING = REGISTRY.gauge(
+    "bingo_analysis_pool_pending", "Analysis jobs submitted to this worker's process pool and not yet finished"
+)
+ANALYSIS_POOL_JOBS = REGISTRY.counter(
+    "bingo_analysis_pool_jobs_total", "Process-pool analysis jobs by result (ok / error / rejected)", ("result",)
+)
+PRECOMPUTE_DURATION = REGISTRY.histogram(
+    "bingo_precompute_duration_seconds", "Duration of post-ingest response precomputation"
+)
+SINGLEFLIGHT_CALLS = REGISTRY.counter(
+    "bingo_singleflight_calls_total",
+    "Single-flight callers by role (leader = computed, coalesced = waited in-process, shared = other worker)",
+    ("flight", "role"),
+)
+REPLICA_LAST_SYNC = REGISTRY.gauge(
+    "bingo_replica_last_sync_timestamp_seconds", "Unix time this replica last caught up with the primary"
+)
+REPLICA_SYNC_DURATION = REGISTRY.histogram(
+    "bingo_replica_sync_duration_seconds", "Duration of a replica pull from the primary's change feed"
+)
+PIPELINE_STAGE_DURATION = REGISTRY.histogram(
+    "bingo_pipeline_stage_duration_seconds", "Post-ingest stage duration by outcome (ok / failed)",
+    ("stage", "status"),
+)
+PIPELINE_STAGE_RUNS = REGISTRY.counter(
+    "bingo_pipeline_stage_runs_total", "Post-ingest stage runs by outcome (ok / failed / skipped / retried)",
+    ("stage", "status"),
+)
+CACHE_REQUESTS = REGISTRY.counter(
+    "bingo_cache_requests_total",
+    "Cache lookups by cache name and result (hit / miss; in-memory indexes miss when built or caught up)",
+    ("cache", "result"),
+)
+DB_POOL_CHECKED_OUT = REGISTRY.gauge(
+    "bingo_db_pool_checked_out", "DB connections currently checked out of the pool"
+)
+DB_POOL_SIZE = REGISTRY.gauge(
+    "bingo_db_pool_size", "Configured DB pool size"
+)
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def watch_pool(engine):
+    """Report pool usage of `engine` on every flush / scrape."""
+    def collect():
+        pool = engine.pool
+        if hasattr(pool, "checkedout"):
+            DB_POOL_CHECKED_OUT.set(pool.checkedout())
+        if hasattr(pool, "size"):
+            DB_POOL_SIZE.set(pool.size())
+
+    REGISTRY.add_collector(collect)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording request latency per route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_holder = {"status": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_holder["status"] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                method=scope.get("method", ""),
+                route=getattr(route, "path", "unmatched"),
+                status=str(status_holder["status"]),
+            )
@@ -1,6 +1,18 @@
+from app.models.archived_bet import ArchivedBet, BetDailySummary
+from app.models.auto_bet_subscription import AutoBetSubscription
 from app.models.crawler_log import CrawlerLog
+from app.models.crawler_log_daily import CrawlerLogDaily
+from app.models.daily_draw_stats import DailyDrawStats
+from app.models.draw_number import DrawNumber
 from app.models.draw_result import DrawResult
+from app.models.hot_score import HotScoreState
+from app.models.pipeline_failure import PipelineFailure
+from app.models.precomputed_response import PrecomputedResponse
 from app.models.prediction import Prediction
+from app.models.prediction_accuracy import PredictionAccuracy
+from app.models.replica_sync_state import ReplicaSyncState
 from app.models.simulated_bet import SimulatedBet
 
-__all__ = ["DrawResult", "Prediction", "CrawlerLog", "SimulatedBet"]
+__all__ = ["DrawResult", "Prediction", "CrawlerLog", "SimulatedBet", "HotScoreState", "PredictionAccuracy", "AutoBetSubscription",
+           "ArchivedBet", "BetDailySummary", "CrawlerLogDaily", "PrecomputedResponse",
+           "DailyDrawStats", "DrawNumber", "PipelineFailure", "ReplicaSyncState"]
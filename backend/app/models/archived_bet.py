@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Date, Integer, String, DateTime, Text, UniqueConstraint
+from datetime import datetime
+
+from app.database import Base
+
+
+class ArchivedBet(Base):
+    """Settled simulated bets moved out of the hot table by the retention job."""
+
+    __tablename__ = "archived_bets"
+
+    id = Column(Integer, primary_key=True)  # same id as in simulated_bets
+    session_id = Column(String(36), nullable=False, index=True)
+    bet_type = Column(String(20), nullable=False)
+    star_level = Column(Integer, nullable=True)
+    selected_numbers = Column(Text, nullable=True)
+    selected_option = Column(String(10), nullable=True)
+    bet_amount = Column(Integer, default=25)
+    multiplier = Column(Integer, default=1)
+    target_draw_term = Column(String(20), nullable=True)
+    status = Column(String(20), nullable=False)
+    settled_draw_term = Column(String(20), nullable=True)
+    matched_count = Column(Integer, nullable=True)
+    matched_numbers = Column(Text, nullable=True)
+    prize_amount = Column(Integer, default=0)
+    net_profit = Column(Integer, default=0)
+    created_at = Column(DateTime)
+    settled_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+
+class BetDailySummary(Base):
+    """Per-session, per-day totals of archived bets, so stats stay complete."""
+
+    __tablename__ = "bet_daily_summaries"
+    __table_args__ = (UniqueConstraint("session_id", "day", name="uq_bet_daily_summary"),)
+
+    id = Column(Integer, primary_key=True)
+    session_id = Column(String(36), nullable=False, index=True)
+    day = Column(Date, nullable=False)  # settled_at date (UTC)
+    bets = Column(Integer, nullable=False, default=0)
+    wins = Column(Integer, nullable=False, default=0)
+    total_cost = Column(Integer, nullable=False, default=0)
+    total_prize = Column(Integer, nullable=False, default=0)
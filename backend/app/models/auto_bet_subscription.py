@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from datetime import datetime
+
+from app.database import Base
+
+
+class AutoBetSubscription(Base):
+    """Per-session standing order executed by the scheduler after each ingest."""
+
+    __tablename__ = "auto_bet_subscriptions"
+    __table_args__ = (Index("ix_auto_bet_status_last_term", "status", "last_term"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(String(36), nullable=False, index=True)
+    strategy = Column(String(20), nullable=False)  # smart_pick / high_low / odd_even
+    period_range = Column(Integer, nullable=False, default=30)
+    star_level = Column(Integer, nullable=True)  # smart_pick only
+    combo_count = Column(Integer, nullable=False, default=1)  # smart_pick: top N star_combos
+    multiplier = Column(Integer, nullable=False, default=1)
+    draws_total = Column(Integer, nullable=False)
+    draws_done = Column(Integer, nullable=False, default=0)
+    status = Column(String(20), nullable=False, default="active")  # active / finished / cancelled
+    last_term = Column(String(20), nullable=True)  # last target term bets were placed for
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
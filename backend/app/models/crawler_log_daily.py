@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Date, Integer, DateTime
+
+from app.database import Base
+
+
+class CrawlerLogDaily(Base):
+    """Daily roll-up of crawler_logs rows pruned by the retention job."""
+
+    __tablename__ = "crawler_log_daily"
+
+    day = Column(Date, primary_key=True)  # started_at date (local)
+    runs = Column(Integer, nullable=False, default=0)
+    succeeded = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    records_fetched = Column(Integer, nullable=False, default=0)
+    records_inserted = Column(Integer, nullable=False, default=0)
+    records_skipped = Column(Integer, nullable=False, default=0)
+    total_seconds = Column(Integer, nullable=False, default=0)
+    first_started_at = Column(DateTime)
+    last_finished_at = Column(DateTime)
@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Date, DateTime, Integer, String, Text
+from datetime import datetime
+
+from app.database import Base
+
+
+class DailyDrawStats(Base):
+    """Per-day rollup of draw_results, maintained at ingest for long-range windows."""
+
+    __tablename__ = "daily_draw_stats"
+
+    day = Column(Date, primary_key=True)
+    draws = Column(Integer, nullable=False, default=0)
+    first_term = Column(String(20))
+    last_term = Column(String(20), index=True)
+
+    number_counts = Column(Text, nullable=False)  # JSON list of 80 ints, index 0 = number 01
+    super_counts = Column(Text, nullable=False)  # JSON list of 80 ints
+    tail_counts = Column(Text, nullable=False)  # JSON list of 10 ints, index = last digit
+    zone_counts = Column(Text, nullable=False)  # JSON {"A": n, "B": n, "C": n, "D": n}
+    consecutive_pairs = Column(Text, nullable=False)  # JSON list of 79 ints, index i = pair (i+1, i+2)
+
+    high_draws = Column(Integer, nullable=False, default=0)  # 大
+    low_draws = Column(Integer, nullable=False, default=0)  # 小
+    high_low_ties = Column(Integer, nullable=False, default=0)
+    odd_draws = Column(Integer, nullable=False, default=0)  # 單
+    even_draws = Column(Integer, nullable=False, default=0)  # 雙
+    odd_even_ties = Column(Integer, nullable=False, default=0)
+    high_count_sum = Column(Integer, nullable=False, default=0)
+    odd_count_sum = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,21 @@
+from sqlalchemy import Boolean, Column, Index, Integer, SmallInteger
+
+from app.database import Base
+
+
+class DrawNumber(Base):
+    """One row per drawn number (20 per draw), so SQL can count and filter by number."""
+
+    __tablename__ = "draw_numbers"
+    __table_args__ = (
+        # Window scans ("last N terms") are covered without touching the table
+        Index("ix_draw_numbers_term_number", "term_number", "number"),
+        # Per-number lookups: last seen / gaps for one number
+        Index("ix_draw_numbers_number_term", "number", "term_number"),
+        Index("ix_draw_numbers_super", "is_super", "term_number", "number"),
+    )
+
+    term_number = Column(Integer, primary_key=True)  # draw_results.term_number
+    draw_position = Column(SmallInteger, primary_key=True)  # 1-20, order drawn
+    number = Column(SmallInteger, nullable=False)
+    is_super = Column(Boolean, nullable=False, default=False)
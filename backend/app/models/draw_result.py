@@ -4,12 +4,18 @@ from datetime import datetime
 from app.database import Base
 
 
+def _term_number(context) -> int:
+    return int(context.get_current_parameters()["draw_term"])
+
+
 class DrawResult(Base):
     __tablename__ = "draw_results"
 
     id = Column(Integer, primary_key=True, index=True)
     draw_term = Column(String(20), unique=True, nullable=False, index=True)
-    draw_date = Column(Date, nullable=False)
+    # Integer copy of draw_term for range scans / keyset pagination
+    term_number = Column(Integer, index=True, default=_term_number)
+    draw_date = Column(Date, nullable=False, index=True)
     draw_datetime = Column(DateTime, nullable=False, index=True)
 
     numbers_sorted = Column(Text, nullable=False)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, UniqueConstraint
+from datetime import datetime
+
+from app.database import Base
+
+
+class HotScoreState(Base):
+    """Persisted EWMA hot scores (one row per kind + decay rate)."""
+
+    __tablename__ = "hot_score_states"
+    __table_args__ = (UniqueConstraint("kind", "rate", name="uq_hot_score_kind_rate"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(10), nullable=False)  # "number" / "super"
+    rate = Column(Float, nullable=False)
+    last_term = Column(String(20), nullable=False)
+    draws_seen = Column(Integer, nullable=False, default=0)
+    scores = Column(Text, nullable=False)  # JSON list of 80 floats, index 0 = number 01
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from datetime import datetime
+
+from app.database import Base
+
+
+class PipelineFailure(Base):
+    """Post-ingest stage that failed (or was skipped behind a failed stage), awaiting retry."""
+
+    __tablename__ = "pipeline_failures"
+
+    id = Column(Integer, primary_key=True, index=True)
+    stage = Column(String(50), nullable=False, index=True)
+    status = Column(String(20), nullable=False)  # failed / skipped
+    latest_term = Column(String(20))  # latest draw when the stage last failed
+    attempts = Column(Integer, nullable=False, default=1)
+    error_message = Column(Text)
+    first_failed_at = Column(DateTime, default=datetime.utcnow)
+    last_failed_at = Column(DateTime, default=datetime.utcnow)
+    resolved_at = Column(DateTime, index=True)  # NULL = still pending retry
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, DateTime, LargeBinary
+from datetime import datetime
+
+from app.database import Base
+
+
+class PrecomputedResponse(Base):
+    """Serialized JSON body of a standard prediction request, valid for one latest term."""
+
+    __tablename__ = "precomputed_responses"
+
+    request_key = Column(String(200), primary_key=True)  # "smart-pick?period_range=30&..."
+    latest_term = Column(String(20), nullable=False)
+    body = Column(LargeBinary, nullable=False)
+    computed_at = Column(DateTime, default=datetime.utcnow)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text
+from sqlalchemy import Boolean, Column, Integer, String, Float, DateTime, Text, Index
 from datetime import datetime
 
 from app.database import Base
@@ -6,6 +6,9 @@ from app.database import Base
 
 class Prediction(Base):
     __tablename__ = "predictions"
+    __table_args__ = (
+        Index("ix_predictions_lookup", "prediction_type", "period_range", "target_term"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     prediction_type = Column(String(20), nullable=False)
@@ -15,4 +18,12 @@ class Prediction(Base):
     result_probability = Column(Float)
     confidence_scores = Column(Text)  # JSON string
     based_on_latest_term = Column(String(20))
+    target_term = Column(String(20), index=True)  # term this prediction is for
+
+    # Filled in once target_term is drawn
+    hits = Column(Integer)  # matched numbers, or 1/0 for single-outcome predictions
+    is_correct = Column(Boolean)  # single-outcome predictions only
+    actual_result = Column(Text)
+    scored_at = Column(DateTime)
+
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, UniqueConstraint
+from datetime import datetime
+
+from app.database import Base
+
+
+class PredictionAccuracy(Base):
+    """Running accuracy per prediction type and period window."""
+
+    __tablename__ = "prediction_accuracy"
+    __table_args__ = (UniqueConstraint("prediction_type", "period_range", name="uq_accuracy_type_range"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    prediction_type = Column(String(20), nullable=False)
+    period_range = Column(Integer, nullable=False)
+    samples = Column(Integer, nullable=False, default=0)
+    hit_sum = Column(Integer, nullable=False, default=0)  # matched numbers / correct outcomes
+    pick_sum = Column(Integer, nullable=False, default=0)  # numbers picked / outcomes predicted
+    recent = Column(Text, nullable=False, default="[]")  # JSON [[hits, picks], ...], newest last
+    last_term = Column(String(20))
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+
+from app.database import Base
+
+
+class ReplicaSyncState(Base):
+    """Replica's position in a primary's change feed (the primary's last draw_results.id applied)."""
+
+    __tablename__ = "replica_sync_states"
+
+    primary_url = Column(String(255), primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
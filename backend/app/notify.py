@@ -0,0 +1,181 @@
+"""
+New-draw notifications from the ingestion daemon to web workers.
+
+When `python -m scheduler.worker` owns crawling, the web processes no longer
+see ingest happen in-process. After each ingest the daemon calls
+`notify_new_draws`, and every web worker runs `on_new_draw` to refresh its
+per-process state: the last-updated timestamp, plus a catch-up of the
+in-memory number index, trend series and hot scores, so the next request
+does not pay for it.
+
+Two channels, chosen by NOTIFY_DIR:
+
+- NOTIFY_DIR set (POSIX): each web worker binds a Unix datagram socket
+  `web-<pid>.sock` in that directory. The daemon sends one small JSON
+  datagram to every socket there and unlinks sockets whose worker has gone.
+- NOTIFY_DIR empty: each web worker polls `max(draw_term)` every
+  NOTIFY_POLL_SECONDS, which is a single index lookup.
+"""
+import glob
+import json
+import logging
+import os
+import socket
+import threading
+from typing import Callable, Dict, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.models.draw_result import DrawResult
+
+logger = logging.getLogger(__name__)
+
+MAX_DATAGRAM = 4096
+
+
+def _socket_path(directory: str, pid: Optional[int] = None) -> str:
+    return os.path.join(directory, f"web-{pid or os.getpid()}.sock")
+
+
+# ─── Sender (ingestion daemon) ────────────────────────────
+
+
+def notify_new_draws(latest_term: Optional[str], inserted: int, directory: Optional[str] = None) -> int:
+    """Tell every listening web worker about new draws. Returns workers reached."""
+    directory = settings.NOTIFY_DIR if directory is None else directory
+    if not directory or not hasattr(socket, "AF_UNIX"):
+        return 0
+    payload = json.dumps({"latest_term": latest_term, "inserted": inserted}).encode()
+    reached = 0
+    with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+        sock.setblocking(False)
+        for path in glob.glob(os.path.join(directory, "web-*.sock")):
+            try:
+                sock.sendto(payload, path)
+                reached += 1
+            except (ConnectionRefusedError, FileNotFoundError):
+                _unlink(path)  # worker exited without cleaning up
+            except BlockingIOError:
+                logger.warning("notify: %s is not reading, skipped", path)
+    return reached
+
+
+def _unlink(path: str):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+# ─── Listener (web workers) ───────────────────────────────
+
+
+class DrawListener:
+    """Background thread calling `callback(message)` when new draws are ingested."""
+
+    def __init__(
+        self,
+        callback: Callable[[Dict], None],
+        session_factory: Optional[sessionmaker] = None,
+        directory: Optional[str] = None,
+        poll_seconds: Optional[float] = None,
+    ):
+        self.callback = callback
+        self.session_factory = session_factory
+        self.directory = settings.NOTIFY_DIR if directory is None else directory
+        self.poll_seconds = settings.NOTIFY_POLL_SECONDS if poll_seconds is None else poll_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._sock: Optional[socket.socket] = None
+        self._seen: Optional[str] = None
+
+    @property
+    def mode(self) -> str:
+        return "socket" if self.directory and hasattr(socket, "AF_UNIX") else "poll"
+
+    def start(self) -> "DrawListener":
+        if self.mode == "socket":
+            os.makedirs(self.directory, exist_ok=True)
+            path = _socket_path(self.directory)
+            _unlink(path)
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            self._sock.bind(path)
+            self._sock.settimeout(1.0)
+            target = self._listen
+        else:
+            self._seen = self._latest_term()
+            target = self._poll
+        self._thread = threading.Thread(target=target, name="draw-listener", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        if self._sock is not None:
+            self._sock.close()
+            _unlink(_socket_path(self.directory))
+
+    def _dispatch(self, message: Dict):
+        try:
+            self.callback(message)
+        except Exception as e:
+            logger.error(f"新開獎通知處理失敗: {e}")
+
+    def _listen(self):
+        while not self._stop.is_set():
+            try:
+                data = self._sock.recv(MAX_DATAGRAM)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            try:
+                message = json.loads(data)
+            except ValueError:
+                continue
+            self._dispatch(message)
+
+    def _latest_term(self) -> Optional[str]:
+        db = self.session_factory()
+        try:
+            return db.execute(select(func.max(DrawResult.draw_term))).scalar()
+        finally:
+            db.close()
+
+    def _poll(self):
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                latest = self._latest_term()
+            except Exception as e:
+                logger.error(f"新開獎輪詢失敗: {e}")
+                continue
+            if latest != self._seen:
+                self._seen = latest
+                self._dispatch({"latest_term": latest, "inserted": None})
+
+
+def on_new_draw(session_factory: sessionmaker) -> Callable[[Dict], None]:
+    """Web-worker callback: refresh last_updated and catch in-memory indexes up."""
+
+    def handle(message: Dict):
+        from app.api.status import set_last_updated
+        from analysis.hot_scores import get_hot_scores
+        from analysis.number_index import get_number_index
+        from analysis.trend_series import SERIES, get_trend_series
+
+        set_last_updated()
+        db = session_factory()
+        try:
+            get_number_index(db)
+            for name in SERIES:
+                get_trend_series(db, name)
+            get_hot_scores(db)
+        finally:
+            db.close()
+        logger.info("收到新開獎通知: %s", message.get("latest_term"))
+
+    return handle
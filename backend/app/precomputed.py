@@ -0,0 +1,180 @@
+"""
+Post-ingest precomputation of standard prediction responses.
+
+Prediction endpoints are deterministic for a given latest draw term, and the
+frontend only offers a handful of period ranges (PeriodSelector.vue). After
+each ingest the scheduler computes every standard request (endpoint ×
+period_range × the frontend's default parameters, see
+`app.api.predictions.STANDARD_REQUESTS`). It stores the exact JSON bytes
+FastAPI would have sent in `precomputed_responses`, tagged with that term.
+
+The request path is one primary-key lookup. A stored body is served only
+when its term matches the current latest term, so a request arriving between
+ingest and the end of precomputation (or one with non-standard parameters)
+falls back to live computation behind the single-flight layer.
+
+With PRECOMPUTE_PROCESSES > 0 the work is spread over a process pool, one
+task per period range, so it runs off the GIL of the worker serving
+requests. Each pool process opens its own connection to the same database.
+Because results are persisted, every gunicorn worker serves them. When
+several workers run the same post-ingest job, only the first one recomputes.
+"""
+import logging
+import multiprocessing
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine, delete, func, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import settings
+from app.metrics import PRECOMPUTE_DURATION
+from app.models.draw_result import DrawResult
+from app.models.precomputed_response import PrecomputedResponse
+
+logger = logging.getLogger(__name__)
+
+StandardRequest = Tuple[str, Dict[str, Any]]
+
+_table = PrecomputedResponse.__table__
+
+
+def request_key(name: str, params: Dict[str, Any]) -> str:
+    """Normalized request identity: endpoint name + sorted query parameters."""
+    return f"{name}?{urlencode(sorted(params.items()))}"
+
+
+def encode_body(result: Any) -> bytes:
+    """Bytes identical to what FastAPI sends for `result` returned from an endpoint."""
+    return JSONResponse(jsonable_encoder(result)).body
+
+
+def latest_term(db: Session) -> Optional[str]:
+    return db.execute(select(func.max(DrawResult.draw_term))).scalar()
+
+
+def lookup(db: Session, key: str, term: Optional[str]) -> Optional[bytes]:
+    """Stored body for `key` if it was computed against `term`."""
+    if term is None:
+        return None
+    return db.execute(
+        select(_table.c.body).where(_table.c.request_key == key, _table.c.latest_term == term)
+    ).scalar()
+
+
+# ─── Computation ──────────────────────────────────────────
+
+
+def _compute(db: Session, requests: List[StandardRequest]) -> Tuple[Optional[str], List[Dict]]:
+    from app.api.predictions import BUILDERS
+
+    term = latest_term(db)
+    rows = []
+    for name, params in requests:
+        rows.append({
+            "request_key": request_key(name, params),
+            "body": encode_body(BUILDERS[name](db, **params)),
+        })
+    return term, rows
+
+
+_worker_sessions: Optional[sessionmaker] = None
+
+
+def _init_worker(database_url: str):
+    global _worker_sessions
+    engine = create_engine(
+        database_url,
+        connect_args={"check_same_thread": False} if database_url.startswith("sqlite") else {},
+    )
+    _worker_sessions = sessionmaker(bind=engine)
+
+
+def _compute_in_worker(requests: List[StandardRequest]) -> Tuple[Optional[str], List[Dict]]:
+    db = _worker_sessions()
+    try:
+        return _compute(db, requests)
+    finally:
+        db.close()
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_key: Optional[Tuple[str, int]] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(database_url: str, processes: int) -> ProcessPoolExecutor:
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is None or _pool_key != (database_url, processes):
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # spawn: the scheduler thread calls this from a multi-threaded process
+            _pool = ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(database_url,),
+            )
+            _pool_key = (database_url, processes)
+        return _pool
+
+
+def shutdown_pool():
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool, _pool_key = None, None
+
+
+def _shareable_url(db: Session) -> Optional[str]:
+    """Database URL a pool process can open, or None for in-memory SQLite."""
+    url = db.get_bind().url
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return None
+    return url.render_as_string(hide_password=False)
+
+
+def precompute_responses(db: Session, processes: Optional[int] = None) -> Dict:
+    """Compute and store every standard response for the current latest term."""
+    from app.api.predictions import STANDARD_REQUESTS
+
+    started = time.perf_counter()
+    term = latest_term(db)
+    if term is None:
+        return {"latest_term": None, "stored": 0, "skipped": True}
+    done = db.execute(select(func.count()).select_from(_table).where(_table.c.latest_term == term)).scalar()
+    if done >= len(STANDARD_REQUESTS):
+        return {"latest_term": term, "stored": 0, "skipped": True}
+
+    processes = settings.PRECOMPUTE_PROCESSES if processes is None else processes
+    database_url = _shareable_url(db) if processes > 0 else None
+    if database_url:
+        by_period = defaultdict(list)
+        for name, params in STANDARD_REQUESTS:
+            by_period[params.get("period_range")].append((name, params))
+        pool = _get_pool(database_url, processes)
+        results = [f.result() for f in [pool.submit(_compute_in_worker, chunk) for chunk in by_period.values()]]
+    else:
+        results = [_compute(db, STANDARD_REQUESTS)]
+
+    # A draw may land while the pool runs; keep only bodies built against `term`
+    now = datetime.utcnow()
+    rows = [dict(row, latest_term=term, computed_at=now) for t, chunk in results if t == term for row in chunk]
+    if rows:
+        db.execute(delete(_table).where(_table.c.request_key.in_([r["request_key"] for r in rows])))
+        db.execute(insert(_table), rows)
+        db.commit()
+
+    elapsed = time.perf_counter() - started
+    PRECOMPUTE_DURATION.observe(elapsed)
+    logger.info("預先計算: 期號 %s 共 %d 組回應, 耗時 %.2fs", term, len(rows), elapsed)
+    return {"latest_term": term, "stored": len(rows), "skipped": False, "seconds": round(elapsed, 3)}
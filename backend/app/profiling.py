@@ -0,0 +1,250 @@
+"""
+Per-request timing instrumentation.
+
+Phases recorded for every request (emitted as a `Server-Timing` header and a
+structured log line):
+
+- db          time inside DBAPI cursor.execute (SQLAlchemy engine events)
+- orm         ORM execution + row hydration, excluding db time (only with
+              SERVER_TIMING_ORM, which buffers every ORM SELECT result)
+- analyzer.*  time per analyzer (wrapped with `timed` / `timed_call`)
+- handler     endpoint function body
+- serialize   route total minus handler (dependency solving + JSON encoding)
+- total       whole request as seen by the middleware
+
+`?profile=1` with a matching `X-Admin-Token` header returns a cProfile
+report of the endpoint instead of the normal response. Sync endpoints are
+profiled as a whole. Async endpoints are profiled where they hand work to a
+thread through `profiled_call`. An endpoint that does neither answers 400.
+"""
+import asyncio
+import cProfile
+import functools
+import io
+import json
+import logging
+import pstats
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Request
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOP_N = 60
+
+
+class RequestTimings:
+    """Accumulated seconds (and call counts) per phase for one request."""
+
+    def __init__(self, profile: bool = False):
+        self.phases: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.profile = profile
+        self.profiler: Optional[cProfile.Profile] = None
+
+    def add(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def get(self, name: str) -> float:
+        return self.phases.get(name, 0.0)
+
+    def as_ms(self) -> Dict[str, float]:
+        return {k: round(v * 1000, 3) for k, v in self.phases.items()}
+
+    def server_timing_header(self) -> str:
+        parts = []
+        for name, seconds in self.phases.items():
+            count = self.counts.get(name, 1)
+            desc = f';desc="{count} calls"' if count > 1 else ""
+            parts.append(f"{name};dur={seconds * 1000:.2f}{desc}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+@contextmanager
+def timed(name: str):
+    """Record the block's duration under `name` (no-op outside a request)."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start)
+
+
+def timed_call(name: str, fn: Callable, *args, **kwargs) -> Any:
+    with timed(name):
+        return fn(*args, **kwargs)
+
+
+def profiled_call(fn: Callable, *args, **kwargs) -> Any:
+    """Run `fn`, under cProfile when the current request asked for ?profile=1."""
+    timings = _current.get()
+    if timings is None or not timings.profile:
+        return fn(*args, **kwargs)
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(fn, *args, **kwargs)
+    finally:
+        timings.profiler = profiler
+
+
+# ─── SQLAlchemy hooks ─────────────────────────────────────
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("_timing_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = _current.get()
+    stack = conn.info.get("_timing_start")
+    if timings is not None and stack:
+        timings.add("db", time.perf_counter() - stack.pop())
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _do_orm_execute(orm_execute_state):
+    """
+    Time ORM SELECTs including hydration by buffering the result.
+    Streaming queries (yield_per / stream_results) are left untouched.
+    """
+    timings = _current.get()
+    if timings is None or not settings.SERVER_TIMING_ORM or not orm_execute_state.is_select:
+        return None
+    opts = orm_execute_state.execution_options
+    if opts.get("yield_per") or opts.get("stream_results"):
+        return None
+
+    db_before = timings.get("db")
+    start = time.perf_counter()
+    frozen = orm_execute_state.invoke_statement().freeze()
+    result = frozen()
+    elapsed = time.perf_counter() - start
+    timings.add("orm", max(elapsed - (timings.get("db") - db_before), 0.0))
+    return result
+
+
+# ─── FastAPI integration ──────────────────────────────────
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that splits endpoint time from serialization time."""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        super().__init__(path, _wrap_endpoint(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request: Request) -> Response:
+            timings = _current.get()
+            if timings is None:
+                return await handler(request)
+            start = time.perf_counter()
+            response = await handler(request)
+            route_total = time.perf_counter() - start
+            timings.add("serialize", max(route_total - timings.get("handler"), 0.0))
+            return response
+
+        return timed_handler
+
+
+def _wrap_endpoint(endpoint: Callable) -> Callable:
+    if asyncio.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args, **kwargs):
+            timings = _current.get()
+            if timings is None:
+                return await endpoint(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                timings.add("handler", time.perf_counter() - start)
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def sync_wrapper(*args, **kwargs):
+        timings = _current.get()
+        if timings is None:
+            return endpoint(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return profiled_call(endpoint, *args, **kwargs)
+        finally:
+            timings.add("handler", time.perf_counter() - start)
+
+    return sync_wrapper
+
+
+def _profile_requested(request: Request) -> bool:
+    if request.query_params.get("profile") != "1":
+        return False
+    token = settings.ADMIN_TOKEN
+    return bool(token) and request.headers.get("x-admin-token") == token
+
+
+def _render_profile(profiler: cProfile.Profile, timings: RequestTimings) -> str:
+    out = io.StringIO()
+    out.write(f"phases (ms): {json.dumps(timings.as_ms(), ensure_ascii=False)}\n\n")
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+    return out.getvalue()
+
+
+class ServerTimingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        timings = RequestTimings(profile=_profile_requested(request))
+        token = _current.set(timings)
+        start = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            _current.reset(token)
+        timings.add("total", time.perf_counter() - start)
+
+        if timings.profile:
+            if timings.profiler is not None:
+                response = PlainTextResponse(_render_profile(timings.profiler, timings))
+            else:
+                response = JSONResponse({"detail": "此端點不支援 profile=1"}, status_code=400)
+
+        response.headers["Server-Timing"] = timings.server_timing_header()
+        logger.info(
+            json.dumps(
+                {
+                    "event": "request_timing",
+                    "method": request.method,
+                    "path": request.url.path,
+                    "status": response.status_code,
+                    "timings_ms": timings.as_ms(),
+                },
+                ensure_ascii=False,
+            )
+        )
+        return response
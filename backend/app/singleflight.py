@@ -0,0 +1,147 @@
+"""
+Single-flight coalescing for expensive, deterministic computations.
+
+When a new draw lands every open dashboard refreshes at once. Without
+coalescing, N identical `/api/predictions/smart-pick` requests each run the
+whole analyzer pipeline. With it:
+
+- Within a worker, the first caller for a key (the leader) runs the
+  function. Concurrent callers with the same key wait on its result.
+- Across workers (when SINGLEFLIGHT_DIR is set, POSIX only), the leader also
+  takes an exclusive `flock` on a per-key lock file in that directory and
+  publishes its result there as JSON. A leader in another worker that was
+  blocked on the same lock reads that result instead of recomputing, as
+  long as it matches the same `version` and is younger than
+  SINGLEFLIGHT_SHARED_TTL seconds.
+
+Callers pass `version` (for example the latest draw term) so that a result
+computed against older data is never shared. Results crossing workers must
+be JSON-serialisable; anything else is simply not published.
+
+`bingo_singleflight_calls_total{flight, role}` counts leader runs, callers
+coalesced onto an in-process leader, and results taken from another worker.
+The same calls feed `bingo_cache_requests_total{cache="singleflight:<flight>"}`:
+a leader run is a miss, a coalesced or shared result a hit.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from app.config import settings
+from app.metrics import SINGLEFLIGHT_CALLS, record_cache
+
+try:  # POSIX only; elsewhere coalescing stays per-process
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+_MISS = object()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    def __init__(self, name: str, shared_dir: str = "", shared_ttl: float = 5.0):
+        self.name = name
+        self.shared_dir = shared_dir if fcntl is not None else ""
+        self.shared_ttl = shared_ttl
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Any], version: Hashable = None) -> Any:
+        """Run fn() once for all concurrent callers of (key, version) and return its result."""
+        flight_key = (key, version)
+        with self._lock:
+            call = self._calls.get(flight_key)
+            leader = call is None
+            if leader:
+                call = self._calls[flight_key] = _Call()
+
+        if not leader:
+            SINGLEFLIGHT_CALLS.inc(flight=self.name, role="coalesced")
+            record_cache(f"singleflight:{self.name}", True)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result, role = self._run(key, version, fn)
+            SINGLEFLIGHT_CALLS.inc(flight=self.name, role=role)
+            record_cache(f"singleflight:{self.name}", role == "shared")
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[flight_key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    # ─── Cross-worker ─────────────────────────────────────
+
+    def _run(self, key: str, version: Hashable, fn: Callable[[], Any]):
+        if not self.shared_dir:
+            return fn(), "leader"
+
+        os.makedirs(self.shared_dir, exist_ok=True)
+        base = os.path.join(self.shared_dir, f"{self.name}_{hashlib.sha1(key.encode()).hexdigest()}")
+        with open(f"{base}.lock", "a+") as lock:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                shared = self._read_shared(f"{base}.json", key, version)
+                if shared is not _MISS:
+                    return shared, "shared"
+                result = fn()
+                self._write_shared(f"{base}.json", key, version, result)
+                return result, "leader"
+            finally:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def _read_shared(self, path: str, key: str, version: Hashable) -> Any:
+        try:
+            if time.time() - os.path.getmtime(path) > self.shared_ttl:
+                return _MISS
+            with open(path, encoding="utf-8") as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return _MISS
+        if payload.get("key") != key or payload.get("version") != _jsonable_version(version):
+            return _MISS
+        return payload["result"]
+
+    @staticmethod
+    def _write_shared(path: str, key: str, version: Hashable, result: Any):
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"key": key, "version": _jsonable_version(version), "result": result}, f)
+            os.replace(tmp, path)
+        except (OSError, TypeError, ValueError):
+            logger.debug("singleflight result for %s not shared", key, exc_info=True)
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+
+def _jsonable_version(version: Hashable):
+    return json.loads(json.dumps(version, default=str))
+
+
+PREDICTIONS_FLIGHT = SingleFlight("predictions", settings.SINGLEFLIGHT_DIR, settings.SINGLEFLIGHT_SHARED_TTL)
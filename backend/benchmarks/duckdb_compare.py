@@ -0,0 +1,108 @@
+"""
+Python analyzers vs the DuckDB engine on the same synthetic history.
+
+    cd backend
+    python -m benchmarks.duckdb_compare
+    python -m benchmarks.duckdb_compare --sizes 10000 70000 --period-ranges 30 500 5000
+
+For each history size the draws are seeded into a SQLite file and exported to
+Parquet; DuckDB reads the Parquet file. Every case first checks that both
+engines return the same result (streak ties compared as a set), then times
+them. Long-range queries with no Python counterpart are timed over the whole
+history. Needs duckdb and pyarrow (requirements-extras.txt).
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from analysis.co_occurrence_analyzer import CoOccurrenceAnalyzer
+from analysis.cold_hot_cycle_analyzer import ColdHotCycleAnalyzer
+from analysis.duckdb_engine import DuckDBEngine
+from benchmarks.run import _make_session_factory, measure
+from benchmarks.synthetic import seed_draws
+from storage.columnar import export_parquet
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = [10_000]
+DEFAULT_PERIOD_RANGES = [30, 500, 5_000]
+
+CASES = {
+    "co_occurrence": (CoOccurrenceAnalyzer, {"top_n": 15}),
+    "cold_hot_cycle": (ColdHotCycleAnalyzer, {"recent_window": 10, "top_n": 10}),
+}
+
+
+def _comparable(result: Dict) -> Dict:
+    result = dict(result)
+    if "streak_numbers" in result:
+        result["streak_numbers"] = sorted((s["number"], s["streak"]) for s in result["streak_numbers"])
+    return result
+
+
+def compare_size(size: int, workdir: str, repeat: int, period_ranges: List[int]) -> Dict[str, Dict]:
+    results: Dict[str, Dict] = {}
+    Session_ = _make_session_factory(os.path.join(workdir, f"duckdb_{size}.db"))
+    db = Session_()
+    seed_draws(db, size)
+    parquet = os.path.join(workdir, f"draws_{size}.parquet")
+    export_parquet(db, parquet)
+    engine = DuckDBEngine(parquet)
+
+    for period_range in period_ranges:
+        for name, (cls, kwargs) in CASES.items():
+            python_result = cls(db).analyze(period_range, **kwargs)
+            duckdb_result = engine.run(name, period_range=period_range, **kwargs)
+            if _comparable(python_result) != _comparable(duckdb_result):
+                raise AssertionError(f"{name}[{period_range}]@{size}: DuckDB result differs from Python")
+
+            py = measure(lambda: cls(db).analyze(period_range, **kwargs), repeat)
+            dk = measure(lambda: engine.run(name, period_range=period_range, **kwargs), repeat)
+            results[f"python.{name}[{period_range}]@{size}"] = py
+            results[f"duckdb.{name}[{period_range}]@{size}"] = dk
+            logger.info(
+                "%-15s period=%-6d python %.4fs  duckdb %.4fs  (x%.1f)",
+                name, period_range, py["median_s"], dk["median_s"], py["median_s"] / max(dk["median_s"], 1e-9),
+            )
+
+    for name, fn in {
+        "gap_distribution": engine.gap_distribution,
+        "triple_co_occurrence": lambda: engine.triple_co_occurrence(size),
+        "position_stats": engine.position_stats,
+    }.items():
+        results[f"duckdb.{name}@{size}"] = measure(fn, repeat)
+
+    engine.close()
+    db.close()
+    Session_.kw["bind"].dispose()
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare Python analyzers with the DuckDB engine")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--period-ranges", type=int, nargs="+", default=DEFAULT_PERIOD_RANGES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="duckdb_compare.json")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    started = time.perf_counter()
+    results: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory(prefix="bingo-duckdb-") as workdir:
+        for size in args.sizes:
+            results.update(compare_size(size, workdir, args.repeat, args.period_ranges))
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"sizes": args.sizes, "results": results}, f, indent=2)
+    logger.info("results written to %s (%.1fs)", args.output, time.perf_counter() - started)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+"""
+Local stand-in for the TLC `BingoResult` API.
+
+Serves deterministic synthetic days (see benchmarks.synthetic) in the real
+response shape, with knobs for latency, HTTP errors, rtCode errors,
+truncated bodies and rate limiting, so crawler throughput, pagination and
+retry behavior can be exercised without network access.
+
+Run standalone (from backend/):
+    python -m benchmarks.fake_tlc_server --port 8765 --days 3 --latency 0.05 --error-rate 0.1
+
+then point the crawler at it:
+    CRAWLER_API_BASE_URL=http://127.0.0.1:8765/TLCAPIWeB/Lottery/BingoResult
+
+Or embed it in tests / benchmarks:
+    with FakeTLCServer(FakeTLCConfig(days=2)) as server:
+        BingoCrawler(db, base_url=server.base_url).run()
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.synthetic import DRAWS_PER_DAY, generate_day
+
+API_PATH = "/TLCAPIWeB/Lottery/BingoResult"
+
+
+@dataclass
+class FakeTLCConfig:
+    days: int = 2  # number of days served, ending at end_date
+    end_date: Optional[date] = None  # default: today
+    draws_on_end_date: int = DRAWS_PER_DAY  # draws already "published" on the last day
+    seed: int = 42
+    latency: float = 0.0  # seconds added to every response
+    latency_jitter: float = 0.0  # extra uniform random latency, seconds
+    error_rate: float = 0.0  # share of requests answered with HTTP 500
+    rtcode_error_rate: float = 0.0  # share answered 200 with rtCode != 0
+    truncate_rate: float = 0.0  # share whose JSON body is cut in half
+    rate_limit: float = 0.0  # max requests / second (0 = unlimited), excess → 429
+    retry_after: int = 1  # Retry-After header sent with 429
+    random_seed: int = 0  # drives the failure dice, independent of draw data
+
+
+@dataclass
+class _State:
+    stats: Counter = field(default_factory=Counter)
+    day_cache: Dict[date, List[Dict]] = field(default_factory=dict)
+    window_start: float = 0.0
+    window_count: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class FakeTLCServer:
+    """Threaded HTTP server wrapper; usable as a context manager."""
+
+    def __init__(self, config: Optional[FakeTLCConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeTLCConfig()
+        self.state = _State()
+        self._rng = random.Random(self.config.random_seed)
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    # ─── Lifecycle ────────────────────────────────────────
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PATH}"
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        with self.state.lock:
+            return dict(self.state.stats)
+
+    def start(self) -> "FakeTLCServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeTLCServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ─── Data ─────────────────────────────────────────────
+
+    @property
+    def end_date(self) -> date:
+        return self.config.end_date or datetime.now().date()
+
+    def served_dates(self) -> List[date]:
+        return [self.end_date - timedelta(days=i) for i in range(self.config.days)]
+
+    def draws_for(self, day: date) -> List[Dict]:
+        """Draws published for `day`, newest first (the order TLC returns)."""
+        if day not in self.served_dates():
+            return []
+        with self.state.lock:
+            cached = self.state.day_cache.get(day)
+        if cached is None:
+            count = self.config.draws_on_end_date if day == self.end_date else DRAWS_PER_DAY
+            cached = list(reversed(generate_day(day, self.config.seed, count)))
+            with self.state.lock:
+                self.state.day_cache[day] = cached
+        return cached
+
+    def build_page(self, day: date, page_num: int, page_size: int) -> Dict:
+        draws = self.draws_for(day)
+        start = (page_num - 1) * page_size
+        return {
+            "rtCode": 0,
+            "rtMsg": "",
+            "content": {
+                "bingoQueryResult": draws[start:start + page_size],
+                "totalSize": len(draws),
+            },
+        }
+
+    # ─── Failure injection ────────────────────────────────
+
+    def _roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self.state.lock:
+            return self._rng.random() < rate
+
+    def _rate_limited(self) -> bool:
+        if self.config.rate_limit <= 0:
+            return False
+        now = time.monotonic()
+        with self.state.lock:
+            if now - self.state.window_start >= 1.0:
+                self.state.window_start = now
+                self.state.window_count = 0
+            self.state.window_count += 1
+            return self.state.window_count > self.config.rate_limit
+
+    def _count(self, outcome: str):
+        with self.state.lock:
+            self.state.stats[outcome] += 1
+            self.state.stats["requests"] += 1
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):  # keep test output quiet
+                pass
+
+            def _send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                cfg = server.config
+                url = urlparse(self.path)
+                if url.path != API_PATH:
+                    server._count("not_found")
+                    self._send(404, b'{"rtCode":404,"rtMsg":"not found"}')
+                    return
+
+                if server._rate_limited():
+                    server._count("rate_limited")
+                    self._send(429, b'{"rtCode":429,"rtMsg":"too many requests"}',
+                               {"Retry-After": str(cfg.retry_after)})
+                    return
+
+                delay = cfg.latency
+                if cfg.latency_jitter > 0:
+                    with server.state.lock:
+                        delay += server._rng.uniform(0, cfg.latency_jitter)
+                if delay > 0:
+                    time.sleep(delay)
+
+                if server._roll(cfg.error_rate):
+                    server._count("http_error")
+                    self._send(500, b'{"rtCode":500,"rtMsg":"internal error"}')
+                    return
+                if server._roll(cfg.rtcode_error_rate):
+                    server._count("rtcode_error")
+                    self._send(200, json.dumps({"rtCode": 9999, "rtMsg": "查詢失敗"}).encode())
+                    return
+
+                qs = parse_qs(url.query)
+                try:
+                    day = date.fromisoformat(qs["openDate"][0])
+                    page_num = max(int(qs.get("pageNum", ["1"])[0]), 1)
+                    page_size = max(int(qs.get("pageSize", ["50"])[0]), 1)
+                except (KeyError, ValueError):
+                    server._count("bad_request")
+                    self._send(200, json.dumps({"rtCode": 1, "rtMsg": "參數錯誤"}).encode())
+                    return
+
+                body = json.dumps(server.build_page(day, page_num, page_size), ensure_ascii=False).encode()
+                if server._roll(cfg.truncate_rate):
+                    server._count("truncated")
+                    self._send(200, body[: len(body) // 2])
+                    return
+
+                server._count("ok")
+                self._send(200, body)
+
+        return Handler
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Fake TLC BingoResult API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--days", type=int, default=2)
+    parser.add_argument("--end-date", type=date.fromisoformat, default=None)
+    parser.add_argument("--draws-on-end-date", type=int, default=DRAWS_PER_DAY)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rtcode-error-rate", type=float, default=0.0)
+    parser.add_argument("--truncate-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    config = FakeTLCConfig(
+        days=args.days,
+        end_date=args.end_date,
+        draws_on_end_date=args.draws_on_end_date,
+        seed=args.seed,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        rtcode_error_rate=args.rtcode_error_rate,
+        truncate_rate=args.truncate_rate,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+    )
+    server = FakeTLCServer(config, host=args.host, port=args.port)
+    print(f"Fake TLC API listening on {server.base_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
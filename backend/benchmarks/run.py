@@ -0,0 +1,385 @@
+"""
+Benchmark suite: time analyzers, smart pick, API, crawler ingest and settlement
+against deterministic synthetic histories.
+
+Crawler cases run against the local fake TLC server (benchmarks.fake_tlc_server).
+
+Usage (from backend/):
+    python -m benchmarks.run                                # 1k + 10k draws
+    python -m benchmarks.run --sizes 1000 10000 100000 1000000 --bets 10000 1000000
+    python -m benchmarks.run --output bench.json --baseline benchmarks/baseline.json
+    python -m benchmarks.run --update-baseline               # store current run as baseline
+    python -m benchmarks.run --sizes 1000000 --ingest-limit 50000   # cap the per-row ingest case
+
+Results are written as JSON. When a baseline exists, every case whose median
+is slower than baseline by more than --threshold (default 20%) is reported
+as a regression and the exit code is 1.
+
+benchmarks/baseline.json holds absolute timings from the machine that wrote
+it, so it is not committed (see .gitignore). Record one locally with
+--update-baseline before the change under test, on the same machine.
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.database import Base
+from app import models  # noqa: F401  # Ensure all ORM models are registered before create_all
+from app.models.draw_result import DrawResult
+from analysis.basic_analyzer import BasicAnalyzer
+from analysis.super_number_analyzer import SuperNumberAnalyzer
+from analysis.high_low_analyzer import HighLowAnalyzer
+from analysis.odd_even_analyzer import OddEvenAnalyzer
+from analysis.co_occurrence_analyzer import CoOccurrenceAnalyzer
+from analysis.tail_number_analyzer import TailNumberAnalyzer
+from analysis.zone_distribution_analyzer import ZoneDistributionAnalyzer
+from analysis.cold_hot_cycle_analyzer import ColdHotCycleAnalyzer
+from analysis.consecutive_number_analyzer import ConsecutiveNumberAnalyzer
+from analysis.smart_pick_engine import SmartPickEngine
+from analysis.bet_settler import auto_settle_all
+from analysis import draw_numbers
+from benchmarks.synthetic import generate_api_draws, seed_draws, seed_pending_bets
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+DEFAULT_SIZES = [1_000, 10_000]
+DEFAULT_BETS = [10_000]
+DEFAULT_PERIOD_RANGES = [30, 500]
+DEFAULT_THRESHOLD = 0.20
+
+ANALYZERS: Dict[str, type] = {
+    "basic": BasicAnalyzer,
+    "super_number": SuperNumberAnalyzer,
+    "high_low": HighLowAnalyzer,
+    "odd_even": OddEvenAnalyzer,
+    "co_occurrence": CoOccurrenceAnalyzer,
+    "tail_number": TailNumberAnalyzer,
+    "zone_distribution": ZoneDistributionAnalyzer,
+    "cold_hot_cycle": ColdHotCycleAnalyzer,
+    "consecutive": ConsecutiveNumberAnalyzer,
+}
+
+# SQL GROUP BY equivalents over the normalized draw_numbers table
+PUSHDOWN_QUERIES: Dict[str, Callable] = {
+    "number_frequency": draw_numbers.number_frequency,
+    "super_frequency": draw_numbers.super_frequency,
+    "tail_counts": draw_numbers.tail_counts,
+    "zone_counts": draw_numbers.zone_counts,
+    "pair_counts": draw_numbers.pair_counts,
+}
+
+
+# ─── Timing ───────────────────────────────────────────────
+
+
+def measure(fn: Callable[[], object], repeat: int, setup: Optional[Callable[[], None]] = None) -> Dict:
+    """Run fn `repeat` times (setup before each run is not timed)."""
+    samples: List[float] = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        "median_s": round(statistics.median(samples), 6),
+        "min_s": round(min(samples), 6),
+        "max_s": round(max(samples), 6),
+        "runs": repeat,
+    }
+
+
+def _make_session_factory(db_path: str) -> sessionmaker:
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+# ─── Cases ────────────────────────────────────────────────
+
+
+def bench_history(size: int, workdir: str, repeat: int, period_ranges: List[int]) -> Dict[str, Dict]:
+    """Seed `size` draws, then time analyzers, smart pick and /api/predictions/all."""
+    results: Dict[str, Dict] = {}
+    Session_ = _make_session_factory(os.path.join(workdir, f"history_{size}.db"))
+
+    db: Session = Session_()
+    start = time.perf_counter()
+    seed_draws(db, size)
+    results[f"seed.draws@{size}"] = {"median_s": round(time.perf_counter() - start, 6), "runs": 1}
+    start = time.perf_counter()
+    draw_numbers.backfill_draw_numbers(db)
+    results[f"seed.draw_numbers@{size}"] = {"median_s": round(time.perf_counter() - start, 6), "runs": 1}
+
+    for period_range in period_ranges:
+        for name, cls in ANALYZERS.items():
+            results[f"analyzer.{name}[{period_range}]@{size}"] = measure(
+                lambda: cls(db).analyze(period_range), repeat
+            )
+        results[f"smart_pick[{period_range}]@{size}"] = measure(
+            lambda: SmartPickEngine(db).pick(period_range), repeat
+        )
+        for name, query in PUSHDOWN_QUERIES.items():
+            results[f"pushdown.{name}[{period_range}]@{size}"] = measure(
+                lambda: query(db, period_range), repeat
+            )
+    db.close()
+
+    results.update(_bench_api(Session_, size, repeat, period_ranges))
+    Session_.kw["bind"].dispose()
+    return results
+
+
+def _bench_api(Session_: sessionmaker, size: int, repeat: int, period_ranges: List[int]) -> Dict[str, Dict]:
+    from fastapi.testclient import TestClient
+
+    from app.database import get_db
+    from app.main import app
+
+    def override_get_db():
+        db = Session_()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    results: Dict[str, Dict] = {}
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        client = TestClient(app)
+        for period_range in period_ranges:
+            def call():
+                r = client.get(f"/api/predictions/all?period_range={period_range}")
+                r.raise_for_status()
+            results[f"api.predictions_all[{period_range}]@{size}"] = measure(call, repeat)
+    finally:
+        if previous is None:
+            app.dependency_overrides.pop(get_db, None)
+        else:
+            app.dependency_overrides[get_db] = previous
+    return results
+
+
+def bench_ingest(size: int, workdir: str, limit: int = 0) -> Dict[str, Dict]:
+    """Feed synthetic API payloads through BingoCrawler.parse_and_save into an empty DB (limit 0 = all)."""
+    from crawler.bingo_crawler import BingoCrawler
+
+    count = min(size, limit) if limit > 0 else size
+    Session_ = _make_session_factory(os.path.join(workdir, f"ingest_{size}.db"))
+    db = Session_()
+    entries = list(generate_api_draws(count))
+    crawler = BingoCrawler(db)
+
+    start = time.perf_counter()
+    for entry in entries:
+        crawler.parse_and_save(entry["data"], entry["query_date"], entry["first_term"])
+    elapsed = time.perf_counter() - start
+
+    db.close()
+    Session_.kw["bind"].dispose()
+    return {
+        f"crawler.parse_and_save@{count}": {
+            "median_s": round(elapsed, 6),
+            "per_draw_ms": round(elapsed / count * 1000, 4),
+            "runs": 1,
+        }
+    }
+
+
+def bench_crawl_http(workdir: str, latency: float = 0.0, error_rate: float = 0.0) -> Dict[str, Dict]:
+    """
+    End-to-end crawl of two full days from the local fake TLC server, then
+    an offline replay of the archived raw pages into an empty DB.
+    """
+    from benchmarks.fake_tlc_server import FakeTLCConfig, FakeTLCServer
+    from crawler.bingo_crawler import BingoCrawler
+    from crawler.raw_archive import RawArchive, replay
+
+    Session_ = _make_session_factory(os.path.join(workdir, "crawl_http.db"))
+    db = Session_()
+    archive = RawArchive(os.path.join(workdir, "raw_archive"))
+    config = FakeTLCConfig(days=2, latency=latency, error_rate=error_rate)
+    with FakeTLCServer(config) as server:
+        crawler = BingoCrawler(db, base_url=server.base_url, archive=archive)
+        start = time.perf_counter()
+        entries = crawler.fetch_latest_draws(max_pages=10)
+        fetched_at = time.perf_counter()
+        for entry in entries:
+            crawler.parse_and_save(entry["data"], entry["query_date"], entry["first_term"])
+        done = time.perf_counter()
+        server_stats = server.stats
+
+    db.close()
+    Session_.kw["bind"].dispose()
+
+    Replay_ = _make_session_factory(os.path.join(workdir, "crawl_replay.db"))
+    replay_db = Replay_()
+    replay_started = time.perf_counter()
+    replayed = replay(replay_db, archive)
+    replay_s = time.perf_counter() - replay_started
+    replay_db.close()
+    Replay_.kw["bind"].dispose()
+
+    count = max(len(entries), 1)
+    return {
+        f"crawler.http_fetch@{len(entries)}": {
+            "median_s": round(fetched_at - start, 6),
+            "requests": server_stats.get("requests", 0),
+            "runs": 1,
+        },
+        f"crawler.http_ingest@{len(entries)}": {
+            "median_s": round(done - fetched_at, 6),
+            "per_draw_ms": round((done - fetched_at) / count * 1000, 4),
+            "runs": 1,
+        },
+        f"crawler.archive_replay@{replayed['inserted']}": {
+            "median_s": round(replay_s, 6),
+            "per_draw_ms": round(replay_s / max(replayed["inserted"], 1) * 1000, 4),
+            "pages": replayed["pages"],
+            "runs": 1,
+        },
+    }
+
+
+def bench_settlement(bet_count: int, workdir: str) -> Dict[str, Dict]:
+    """Time auto_settle_all against `bet_count` pending bets on a single draw."""
+    Session_ = _make_session_factory(os.path.join(workdir, f"settle_{bet_count}.db"))
+    db = Session_()
+    seed_draws(db, 1)
+    draw = db.query(DrawResult).first()
+    seed_pending_bets(db, bet_count, draw.draw_term)
+
+    start = time.perf_counter()
+    settled = auto_settle_all(db, draw)
+    elapsed = time.perf_counter() - start
+
+    db.close()
+    Session_.kw["bind"].dispose()
+    return {
+        f"settlement.auto_settle_all@{bet_count}": {
+            "median_s": round(elapsed, 6),
+            "settled": settled,
+            "runs": 1,
+        }
+    }
+
+
+# ─── Baseline comparison ──────────────────────────────────
+
+
+def compare(current: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[Dict]:
+    """Return cases whose median got slower than baseline by more than `threshold`."""
+    regressions = []
+    for key, result in current.items():
+        base = baseline.get(key)
+        if not base or not base.get("median_s"):
+            continue
+        ratio = result["median_s"] / base["median_s"]
+        if ratio > 1 + threshold:
+            regressions.append({
+                "case": key,
+                "baseline_s": base["median_s"],
+                "current_s": result["median_s"],
+                "ratio": round(ratio, 3),
+            })
+    return sorted(regressions, key=lambda r: r["ratio"], reverse=True)
+
+
+def run(
+    sizes: List[int],
+    bet_counts: List[int],
+    repeat: int,
+    period_ranges: List[int],
+    crawl_latency: float = 0.0,
+    crawl_error_rate: float = 0.0,
+    ingest_limit: int = 0,
+) -> Dict[str, Dict]:
+    results: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory(prefix="bingo-bench-") as workdir:
+        results.update(bench_crawl_http(workdir, crawl_latency, crawl_error_rate))
+        for size in sizes:
+            logger.info("history size=%d", size)
+            results.update(bench_history(size, workdir, repeat, period_ranges))
+            results.update(bench_ingest(size, workdir, ingest_limit))
+        for bet_count in bet_counts:
+            logger.info("settlement bets=%d", bet_count)
+            results.update(bench_settlement(bet_count, workdir))
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="BINGO backend benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--bets", type=int, nargs="+", default=DEFAULT_BETS)
+    parser.add_argument("--period-ranges", type=int, nargs="+", default=DEFAULT_PERIOD_RANGES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--crawl-latency", type=float, default=0.0, help="fake TLC server latency (s)")
+    parser.add_argument("--crawl-error-rate", type=float, default=0.0, help="fake TLC server HTTP 500 rate")
+    parser.add_argument(
+        "--ingest-limit", type=int, default=0,
+        help="max draws fed through parse_and_save per size (0 = the full size)",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    results = run(
+        args.sizes, args.bets, args.repeat, args.period_ranges,
+        args.crawl_latency, args.crawl_error_rate, args.ingest_limit,
+    )
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": args.sizes,
+            "bets": args.bets,
+            "repeat": args.repeat,
+            "ingest_limit": args.ingest_limit,
+        },
+        "results": results,
+    }
+
+    baseline_path = Path(args.baseline)
+    regressions: List[Dict] = []
+    if baseline_path.exists() and not args.update_baseline:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline.get("results", {}), args.threshold)
+        report["regressions"] = regressions
+
+    Path(args.output).write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+    logger.info("results written to %s", args.output)
+
+    if args.update_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        logger.info("baseline updated: %s", baseline_path)
+
+    for r in regressions:
+        logger.warning(
+            "REGRESSION %s: %.4fs → %.4fs (x%.2f)",
+            r["case"], r["baseline_s"], r["current_s"], r["ratio"],
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+Deterministic synthetic BINGO BINGO draw histories for benchmarks and tests.
+
+The same (count, seed) pair always yields the same draws, so timings from
+different runs and different machines are measured against identical data.
+"""
+import random
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterator, List
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.draw_result import DrawResult
+from app.models.simulated_bet import SimulatedBet
+
+DRAWS_PER_DAY = 203  # 07:05 → 23:55, every 5 minutes
+FIRST_TERM = 113000001
+FIRST_DATE = date(2024, 1, 1)
+FIRST_DRAW_TIME = time(7, 5)
+INSERT_BATCH_SIZE = 5000
+
+
+def _classify(pos: int, neg: int, pos_label: str, neg_label: str) -> str:
+    """13+ numbers on one side decides 大/小 or 單/雙, otherwise it is a tie."""
+    if pos >= 13:
+        return pos_label
+    if neg >= 13:
+        return neg_label
+    return "－"
+
+
+def _draw_payload(rng: random.Random, term: int) -> Dict:
+    seq = rng.sample(range(1, 81), 20)
+    high = sum(1 for n in seq if n >= 41)
+    odd = sum(1 for n in seq if n % 2 == 1)
+    seq_str = [f"{n:02d}" for n in seq]
+    return {
+        "drawTerm": term,
+        "bigShowOrder": [f"{n:02d}" for n in sorted(seq)],
+        "openShowOrder": seq_str,
+        "bullEyeTop": seq_str[-1],
+        "highLowTop": _classify(high, 20 - high, "大", "小"),
+        "oddEvenTop": _classify(odd, 20 - odd, "單", "雙"),
+    }
+
+
+def first_term_of(day: date) -> int:
+    return FIRST_TERM + (day - FIRST_DATE).days * DRAWS_PER_DAY
+
+
+def generate_day(day: date, seed: int = 42, count: int = DRAWS_PER_DAY) -> List[Dict]:
+    """The first `count` draws of `day` in TLC item shape, oldest → newest."""
+    rng = random.Random(f"{seed}:{day.isoformat()}")
+    first = first_term_of(day)
+    return [_draw_payload(rng, first + i) for i in range(count)]
+
+
+def generate_api_draws(count: int, seed: int = 42) -> Iterator[Dict]:
+    """
+    Yield draws oldest → newest in the TLC `bingoQueryResult` item shape,
+    plus the query date and first term of that day (what the crawler needs).
+    """
+    day = FIRST_DATE
+    remaining = count
+    while remaining > 0:
+        todays = generate_day(day, seed, min(remaining, DRAWS_PER_DAY))
+        first = first_term_of(day)
+        for data in todays:
+            yield {"data": data, "query_date": day, "first_term": first}
+        remaining -= len(todays)
+        day += timedelta(days=1)
+
+
+def generate_draw_rows(count: int, seed: int = 42) -> Iterator[Dict]:
+    """Yield `draw_results` column dicts, oldest → newest."""
+    for entry in generate_api_draws(count, seed):
+        data = entry["data"]
+        term = data["drawTerm"]
+        seq = [int(n) for n in data["openShowOrder"]]
+        draw_dt = datetime.combine(entry["query_date"], FIRST_DRAW_TIME) + timedelta(
+            minutes=5 * (term - entry["first_term"])
+        )
+        yield {
+            "draw_term": str(term),
+            "draw_date": entry["query_date"],
+            "draw_datetime": draw_dt,
+            "numbers_sorted": ",".join(data["bigShowOrder"]),
+            "numbers_sequence": ",".join(data["openShowOrder"]),
+            "super_number": data["bullEyeTop"],
+            "high_low_result": data["highLowTop"],
+            "high_count": sum(1 for n in seq if n >= 41),
+            "low_count": sum(1 for n in seq if n <= 40),
+            "odd_even_result": data["oddEvenTop"],
+            "odd_count": sum(1 for n in seq if n % 2 == 1),
+            "even_count": sum(1 for n in seq if n % 2 == 0),
+        }
+
+
+def _bulk_insert(db: Session, table, rows: Iterator[Dict]) -> int:
+    batch: List[Dict] = []
+    total = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= INSERT_BATCH_SIZE:
+            db.execute(insert(table), batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        db.execute(insert(table), batch)
+        total += len(batch)
+    db.commit()
+    return total
+
+
+def seed_draws(db: Session, count: int, seed: int = 42) -> int:
+    """Bulk-insert `count` synthetic draws. Returns the number of rows inserted."""
+    return _bulk_insert(db, DrawResult, generate_draw_rows(count, seed))
+
+
+def generate_pending_bets(count: int, target_term: str, seed: int = 7) -> Iterator[Dict]:
+    """Yield pending `simulated_bets` rows spread across all four bet types."""
+    rng = random.Random(seed)
+    for i in range(count):
+        kind = i % 4
+        row = {
+            "session_id": f"bench-{i % 1000:04d}",
+            "bet_amount": 25,
+            "multiplier": rng.randint(1, 5),
+            "target_draw_term": target_term,
+            "status": "pending",
+            "prize_amount": 0,
+            "net_profit": 0,
+            "created_at": datetime(2024, 1, 1),
+            "star_level": None,
+            "selected_numbers": None,
+            "selected_option": None,
+        }
+        if kind == 0:
+            star = rng.randint(1, 10)
+            row.update(
+                bet_type="basic",
+                star_level=star,
+                selected_numbers=",".join(
+                    f"{n:02d}" for n in sorted(rng.sample(range(1, 81), star))
+                ),
+            )
+        elif kind == 1:
+            row.update(bet_type="super", selected_numbers=f"{rng.randint(1, 80):02d}")
+        elif kind == 2:
+            row.update(bet_type="high_low", selected_option=rng.choice(["大", "小"]))
+        else:
+            row.update(bet_type="odd_even", selected_option=rng.choice(["單", "雙"]))
+        yield row
+
+
+def seed_pending_bets(db: Session, count: int, target_term: str, seed: int = 7) -> int:
+    return _bulk_insert(db, SimulatedBet, generate_pending_bets(count, target_term, seed))
@@ -1,16 +1,21 @@
 import requests
 import ssl
 from datetime import datetime, date, time, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 import logging
+import time as time_module
+import uuid
 
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from app.config import settings
+from app.metrics import CRAWL_API_LATENCY, CRAWL_DURATION, CRAWL_RECORDS, INGEST_LAG
 from app.models.draw_result import DrawResult
 from app.models.crawler_log import CrawlerLog
+from analysis.draw_numbers import insert_number_rows
 
 logger = logging.getLogger(__name__)
 
@@ -38,19 +43,40 @@ class RelaxedStrictTLSAdapter(HTTPAdapter):
         return super().proxy_manager_for(proxy, **proxy_kwargs)
 
 
+def _build_retry() -> Retry:
+    """Retry transient HTTP failures (429 / 5xx), honouring Retry-After."""
+    return Retry(
+        total=settings.CRAWLER_MAX_RETRIES,
+        backoff_factor=settings.CRAWLER_RETRY_BACKOFF,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET",),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
 class BingoCrawler:
     """台灣彩券 BINGO BINGO 爬蟲"""
 
-    API_BASE_URL = "https://api.taiwanlottery.com/TLCAPIWeB/Lottery/BingoResult"
-
-    def __init__(self, db_session: Session):
+    def __init__(self, db_session: Session, base_url: Optional[str] = None, archive=None):
         self.db = db_session
+        self.api_base_url = base_url or settings.CRAWLER_API_BASE_URL
+        # Raw page archive: None = CRAWLER_ARCHIVE_DIR, False = disabled
+        if archive is None and settings.CRAWLER_ARCHIVE_DIR:
+            from crawler.raw_archive import RawArchive
+
+            archive = RawArchive(settings.CRAWLER_ARCHIVE_DIR)
+        self.archive = archive or None
         self.session = requests.Session()
+        retry = _build_retry()
+        self.session.mount("http://", HTTPAdapter(max_retries=retry))
         if settings.CRAWLER_RELAX_TLS_STRICT:
-            self.session.mount("https://", RelaxedStrictTLSAdapter())
+            self.session.mount("https://", RelaxedStrictTLSAdapter(max_retries=retry))
             logger.warning(
                 "CRAWLER_RELAX_TLS_STRICT=true: TLS strict validation is relaxed for crawler requests."
             )
+        else:
+            self.session.mount("https://", HTTPAdapter(max_retries=retry))
         self.session.headers.update(
             {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
         )
@@ -63,11 +89,14 @@ class BingoCrawler:
         log_entry = CrawlerLog(started_at=datetime.now(), status="running")
         self.db.add(log_entry)
         self.db.commit()
+        started = time_module.perf_counter()
 
         try:
             draw_list = self.fetch_latest_draws()
             stats["fetched"] = len(draw_list)
 
+            # Oldest first, so commit order matches term order (replica change feed)
+            draw_list.sort(key=lambda e: str(e["data"].get("drawTerm", "")).zfill(12))
             for draw_entry in draw_list:
                 result = self.parse_and_save(
                     draw_entry["data"],
@@ -81,6 +110,9 @@ class BingoCrawler:
                 else:
                     stats["failed"] += 1
 
+            if stats["inserted"] and settings.DRAW_STORE_PATH:
+                self._sync_draw_store()
+
             log_entry.status = "success"
             log_entry.finished_at = datetime.now()
             log_entry.records_fetched = stats["fetched"]
@@ -88,6 +120,7 @@ class BingoCrawler:
             log_entry.records_skipped = stats["skipped"]
             self.db.commit()
             logger.info(f"爬蟲完成: {stats}")
+            CRAWL_DURATION.observe(time_module.perf_counter() - started, status="success")
 
         except Exception as e:
             log_entry.status = "failed"
@@ -95,22 +128,42 @@ class BingoCrawler:
             log_entry.finished_at = datetime.now()
             self.db.commit()
             logger.error(f"爬蟲失敗: {e}")
+            CRAWL_DURATION.observe(time_module.perf_counter() - started, status="failed")
 
+        for result in ("inserted", "skipped", "failed"):
+            if stats[result]:
+                CRAWL_RECORDS.inc(stats[result], result=result)
         return stats
 
+    def _sync_draw_store(self):
+        """Append newly inserted draws to the binary history file; never fails the crawl."""
+        from storage.binary_store import DrawStore, sync_from_db
+
+        try:
+            appended = sync_from_db(self.db, DrawStore(settings.DRAW_STORE_PATH))
+            logger.info(f"二進位歷史檔新增 {appended} 筆")
+        except Exception as e:
+            logger.error(f"二進位歷史檔寫入失敗: {e}")
+
     # ─── Fetch ────────────────────────────────────────────
 
     def fetch_latest_draws(
         self,
         target_date: Optional[datetime] = None,
-        page_size: int = 50,
+        page_size: Optional[int] = None,
+        max_pages: Optional[int] = None,
     ) -> List[Dict]:
         """
         回傳 list of {data, query_date, first_term}，
         每筆 draw 附帶查詢日期及該日第一期期號，用於計算開獎時間。
+
+        每日最多抓 max_pages 頁（預設 CRAWLER_MAX_PAGES），排程只需第一頁；
+        補抓整日資料時可調大。
         """
         if target_date is None:
             target_date = datetime.now()
+        page_size = page_size or settings.CRAWLER_PAGE_SIZE
+        max_pages = max_pages or settings.CRAWLER_MAX_PAGES
 
         results: List[Dict] = []
         dates_to_check = [
@@ -119,41 +172,101 @@ class BingoCrawler:
         ]
 
         for check_date in dates_to_check:
-            try:
-                params = {
-                    "openDate": check_date.strftime("%Y-%m-%d"),
-                    "pageNum": 1,
-                    "pageSize": page_size,
-                }
-                logger.info(f"查詢 {check_date} ...")
-                resp = self.session.get(
-                    self.API_BASE_URL, params=params, timeout=10
-                )
-                resp.raise_for_status()
-                data = resp.json()
+            results.extend(self._fetch_day(
+                check_date, page_size, max_pages,
+                day_offset=(target_date.date() - check_date).days,
+            ))
+
+        return results
+
+    def _fetch_day(
+        self, check_date: date, page_size: int, max_pages: int, day_offset: int = 0
+    ) -> List[Dict]:
+        """逐頁抓取單日資料；某頁失敗時保留已取得的頁面。"""
+        fetch_id = uuid.uuid4().hex
+        pages = (
+            (page_num, self._fetch_page(check_date, page_num, page_size, day_offset, fetch_id))
+            for page_num in range(1, max_pages + 1)
+        )
+        results, total_size = self._collect_day(check_date, pages, page_size)
+        logger.info(f"取得 {len(results)} 筆 (該日共 {total_size} 期)")
+        return results
+
+    def _collect_day(
+        self, check_date: date, pages: Iterable[Tuple[int, Optional[Dict]]], page_size: int
+    ) -> Tuple[List[Dict], int]:
+        """依頁序處理單日回應（即時抓取與封存重播共用），回傳 (draws, 該日總期數)。"""
+        results: List[Dict] = []
+        first_term: Optional[int] = None
+        total_size = 0
+
+        for page_num, data in pages:
+            if data is None:
+                break
+
+            if data.get("rtCode") != 0:
+                logger.error(f"API 錯誤: {data.get('rtMsg')}")
+                break
 
-                if data.get("rtCode") == 0:
-                    draws = data["content"]["bingoQueryResult"]
+            try:
+                draws = data["content"]["bingoQueryResult"]
+                if first_term is None:
                     total_size = data["content"].get("totalSize", len(draws))
                     latest_term = int(draws[0]["drawTerm"]) if draws else 0
                     first_term = latest_term - total_size + 1
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error(f"回應格式錯誤: {e}")
+                break
+
+            for draw in draws:
+                results.append({
+                    "data": draw,
+                    "query_date": check_date,
+                    "first_term": first_term,
+                })
+
+            if len(draws) < page_size or page_num * page_size >= total_size:
+                break
+
+        return results, total_size
+
+    def _fetch_page(
+        self, check_date: date, page_num: int, page_size: int, day_offset: int = 0,
+        fetch_id: Optional[str] = None,
+    ) -> Optional[Dict]:
+        params = {
+            "openDate": check_date.strftime("%Y-%m-%d"),
+            "pageNum": page_num,
+            "pageSize": page_size,
+        }
+        logger.info(f"查詢 {check_date} 第 {page_num} 頁 ...")
+        outcome = "error"
+        started = time_module.perf_counter()
+        try:
+            resp = self.session.get(self.api_base_url, params=params, timeout=10)
+            resp.raise_for_status()
+            data = resp.json()
+            outcome = "ok"
+            if self.archive is not None:
+                self._archive_page(resp.content, check_date, page_num, page_size, fetch_id)
+            return data
+        except requests.RequestException as e:
+            logger.error(f"網路錯誤: {e}")
+        except Exception as e:
+            logger.error(f"未知錯誤: {e}")
+        finally:
+            CRAWL_API_LATENCY.observe(
+                time_module.perf_counter() - started,
+                day_offset=str(day_offset), outcome=outcome,
+            )
+        return None
 
-                    for draw in draws:
-                        results.append({
-                            "data": draw,
-                            "query_date": check_date,
-                            "first_term": first_term,
-                        })
-                    logger.info(f"取得 {len(draws)} 筆 (該日共 {total_size} 期)")
-                else:
-                    logger.error(f"API 錯誤: {data.get('rtMsg')}")
-
-            except requests.RequestException as e:
-                logger.error(f"網路錯誤: {e}")
-            except Exception as e:
-                logger.error(f"未知錯誤: {e}")
-
-        return results
+    def _archive_page(self, body: bytes, check_date: date, page_num: int, page_size: int, fetch_id: Optional[str]):
+        """Keep the raw page for offline replay; never fails the crawl."""
+        try:
+            self.archive.record_page(body, check_date, page_num, page_size, fetch_id or uuid.uuid4().hex)
+        except Exception as e:
+            logger.error(f"原始回應封存失敗: {e}")
 
     # ─── Validate ─────────────────────────────────────────
 
@@ -249,7 +362,11 @@ class BingoCrawler:
 
             obj = DrawResult(**parsed)
             self.db.add(obj)
+            insert_number_rows(self.db, [parsed])
             self.db.commit()
+            INGEST_LAG.observe(
+                max((datetime.now() - parsed["draw_datetime"]).total_seconds(), 0.0)
+            )
             return "inserted"
 
         except IntegrityError:
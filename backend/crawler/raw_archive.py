@@ -0,0 +1,177 @@
+"""
+Content-addressed archive of raw TLC API pages, and offline replay from it.
+
+With CRAWLER_ARCHIVE_DIR set, `BingoCrawler` stores the body of every API
+page it fetches before parsing it:
+
+    <dir>/objects/ab/cdef....json.gz   gzip of the body, named by its sha256
+    <dir>/manifest.jsonl               one line per fetched page
+
+Identical bodies (a crawl that found no new draw) are stored once; the
+manifest still records each fetch. A manifest line carries what parsing needs
+besides the body: the query date, page number and size, and a `fetch_id`
+shared by the pages of one day's fetch (only page 1 carries the day's
+`totalSize`, from which the first term and so `draw_datetime` are derived).
+
+`replay` re-runs the crawler's page handling, validation and parsing over the
+archive and bulk-inserts the result, one transaction per day, without
+network access. With `replace=True` draws already in the DB are rewritten,
+which is how derived columns are rebuilt after a parsing rule changes
+(e.g. BINGO_FIRST_DRAW_HOUR). Rebuild the per-day aggregates and binary
+history file afterwards (scripts.rebuild_daily_stats, scripts.build_draw_store).
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.draw_number import DrawNumber
+from app.models.draw_result import DrawResult
+from analysis.draw_numbers import insert_number_rows
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.jsonl"
+
+_table = DrawResult.__table__
+_numbers = DrawNumber.__table__
+
+
+class RawArchive:
+    """Local content-addressed store of gzip-compressed API responses."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.manifest_path = os.path.join(root, MANIFEST)
+        self._lock = threading.Lock()
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], f"{digest[2:]}.json.gz")
+
+    def put(self, body: bytes) -> str:
+        """Store `body` (no-op when already present). Returns its sha256."""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if os.path.exists(path):
+            return digest
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(gzip.compress(body, mtime=0))
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        with open(self._object_path(digest), "rb") as f:
+            return gzip.decompress(f.read())
+
+    def record_page(self, body: bytes, query_date: date, page_num: int, page_size: int, fetch_id: str) -> str:
+        """Store one fetched page and append its manifest line."""
+        digest = self.put(body)
+        line = json.dumps({
+            "digest": digest,
+            "query_date": query_date.isoformat(),
+            "page_num": page_num,
+            "page_size": page_size,
+            "fetch_id": fetch_id,
+            "fetched_at": datetime.now().isoformat(timespec="seconds"),
+        })
+        with self._lock, open(self.manifest_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+        return digest
+
+    def entries(self) -> Iterator[Dict]:
+        if not os.path.exists(self.manifest_path):
+            return
+        with open(self.manifest_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    def fetches_by_day(
+        self, from_date: Optional[date] = None, to_date: Optional[date] = None
+    ) -> Iterator[Tuple[date, List[List[Dict]]]]:
+        """(query_date, fetches) in date order; each fetch is its pages in page order."""
+        days: Dict[date, Dict[str, List[Dict]]] = defaultdict(lambda: defaultdict(list))
+        for entry in self.entries():
+            day = date.fromisoformat(entry["query_date"])
+            if (from_date and day < from_date) or (to_date and day > to_date):
+                continue
+            days[day][entry["fetch_id"]].append(entry)
+        for day in sorted(days):
+            yield day, [sorted(pages, key=lambda e: e["page_num"]) for pages in days[day].values()]
+
+
+# ─── Replay ───────────────────────────────────────────────
+
+
+def _archived_pages(archive: RawArchive, pages: List[Dict], stats: Dict[str, int]):
+    for entry in pages:
+        stats["pages"] += 1
+        yield entry["page_num"], json.loads(archive.get(entry["digest"]))
+
+
+def _ingest_day(db: Session, rows: List[Dict], replace: bool, stats: Dict[str, int]):
+    terms = [r["draw_term"] for r in rows]
+    existing = set(db.execute(select(_table.c.draw_term).where(_table.c.draw_term.in_(terms))).scalars())
+    if existing and replace:
+        db.execute(delete(_numbers).where(_numbers.c.term_number.in_([int(t) for t in existing])))
+        db.execute(delete(_table).where(_table.c.draw_term.in_(existing)))
+        stats["replaced"] += len(existing)
+    else:
+        rows = [r for r in rows if r["draw_term"] not in existing]
+        stats["skipped"] += len(existing)
+    if rows:
+        now = datetime.utcnow()
+        rows = [dict(r, term_number=int(r["draw_term"]), created_at=now) for r in rows]
+        db.execute(insert(_table), rows)
+        insert_number_rows(db, rows)
+    db.commit()
+    stats["inserted"] += len(rows) - (len(existing) if replace else 0)
+
+
+def replay(
+    db: Session,
+    archive: RawArchive,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    replace: bool = False,
+) -> Dict[str, int]:
+    """Validate, parse and bulk-ingest every archived page (no network access)."""
+    from crawler.bingo_crawler import BingoCrawler
+
+    crawler = BingoCrawler(db, archive=False)
+    stats = {"pages": 0, "draws": 0, "inserted": 0, "replaced": 0, "skipped": 0, "failed": 0}
+    for day, fetches in archive.fetches_by_day(from_date, to_date):
+        parsed: Dict[str, Dict] = {}
+        invalid = set()
+        for pages in fetches:
+            entries, _ = crawler._collect_day(day, _archived_pages(archive, pages, stats), pages[0]["page_size"])
+            for entry in entries:
+                term = str(entry["data"].get("drawTerm", ""))
+                if term in parsed:
+                    continue  # the same draw appears in every later crawl of the day
+                if not crawler._validate(entry["data"]):
+                    invalid.add(term)
+                    continue
+                parsed[term] = crawler._parse_draw_data(entry["data"], entry["query_date"], entry["first_term"])
+        stats["failed"] += len(invalid - set(parsed))
+        if parsed:
+            stats["draws"] += len(parsed)
+            _ingest_day(db, [parsed[t] for t in sorted(parsed, key=lambda t: t.zfill(12))], replace, stats)
+    logger.info(f"封存重播完成: {stats}")
+    return stats
@@ -0,0 +1,222 @@
+"""
+Dependency-ordered stage runner for post-ingest work.
+
+Each `Stage` names the stages it must run `after`. `Pipeline.run` starts
+every stage whose dependencies have succeeded on a small thread pool, so
+independent stages run concurrently. Each stage attempt gets its own DB
+session (sessions are not shared across threads). A failing stage is retried
+`retries` times with exponential backoff; if it still fails, the stages that
+depend on it are skipped, unless they are marked `always` (they then run once
+their dependencies have finished, whatever the outcome).
+
+`run` never raises for a stage failure. It returns one entry per stage:
+
+    {"status": "ok" | "failed" | "skipped", "duration_s": 0.0123,
+     "attempts": 1, "error": None, "result": <stage return value>}
+
+Stage durations are recorded in `bingo_pipeline_stage_duration_seconds`.
+`record_results` keeps failed / skipped stages in `pipeline_failures` so
+they can be re-run later with `run(only=...)`, without re-crawling.
+"""
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import settings
+from app.metrics import PIPELINE_STAGE_DURATION, PIPELINE_STAGE_RUNS
+from app.models.pipeline_failure import PipelineFailure
+
+logger = logging.getLogger(__name__)
+
+StageFn = Callable[[Session, Dict[str, Any]], Any]
+
+
+class Stage:
+    """One unit of post-ingest work: `fn(db, context)`."""
+
+    def __init__(
+        self,
+        name: str,
+        fn: StageFn,
+        after: Sequence[str] = (),
+        retries: Optional[int] = None,
+        always: bool = False,
+    ):
+        self.name = name
+        self.fn = fn
+        self.after = tuple(after)
+        self.retries = retries
+        self.always = always
+
+
+class Pipeline:
+    def __init__(
+        self,
+        stages: Iterable[Stage],
+        workers: Optional[int] = None,
+        retries: Optional[int] = None,
+        backoff: Optional[float] = None,
+    ):
+        self.stages = _topological(list(stages))
+        self.by_name = {s.name: s for s in self.stages}
+        self.workers = workers if workers is not None else settings.PIPELINE_WORKERS
+        self.retries = retries if retries is not None else settings.PIPELINE_STAGE_RETRIES
+        self.backoff = backoff if backoff is not None else settings.PIPELINE_RETRY_BACKOFF
+
+    def dependents(self, names: Iterable[str]) -> Set[str]:
+        """`names` plus every stage that (transitively) runs after them."""
+        selected = {n for n in names if n in self.by_name}
+        for stage in self.stages:  # topological order: dependencies come first
+            if any(d in selected for d in stage.after):
+                selected.add(stage.name)
+        return selected
+
+    def run(
+        self,
+        session_factory: sessionmaker,
+        context: Optional[Dict[str, Any]] = None,
+        only: Optional[Iterable[str]] = None,
+    ) -> Dict[str, Dict]:
+        """Run the pipeline (or `only` those stages and their dependents)."""
+        context = {} if context is None else context
+        selected = self.dependents(only) if only is not None else set(self.by_name)
+        pending = [s for s in self.stages if s.name in selected]
+        results: Dict[str, Dict] = {}
+
+        with ThreadPoolExecutor(max_workers=max(self.workers, 1), thread_name_prefix="pipeline") as pool:
+            running = {}
+            while pending or running:
+                for stage in list(pending):
+                    deps = [d for d in stage.after if d in selected]
+                    if any(d not in results for d in deps):
+                        continue
+                    blocker = next((d for d in deps if results[d]["status"] != "ok"), None)
+                    pending.remove(stage)
+                    if blocker is not None and not stage.always:
+                        results[stage.name] = _skipped(stage.name, blocker)
+                    else:
+                        running[pool.submit(self._run_stage, stage, session_factory, context)] = stage.name
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    results[running.pop(future)] = future.result()
+        return results
+
+    def _run_stage(self, stage: Stage, session_factory: sessionmaker, context: Dict[str, Any]) -> Dict:
+        retries = stage.retries if stage.retries is not None else self.retries
+        started = time.perf_counter()
+        attempts, value, error = 0, None, None
+        while True:
+            attempts += 1
+            db = session_factory()
+            try:
+                value, error = stage.fn(db, context), None
+            except Exception as e:
+                db.rollback()
+                error = str(e) or type(e).__name__
+            finally:
+                db.close()
+            if error is None or attempts > retries:
+                break
+            PIPELINE_STAGE_RUNS.inc(stage=stage.name, status="retried")
+            logger.warning("入庫後階段 %s 失敗 (第 %d 次)，稍後重試: %s", stage.name, attempts, error)
+            time.sleep(self.backoff * 2 ** (attempts - 1))
+
+        status = "ok" if error is None else "failed"
+        duration = time.perf_counter() - started
+        PIPELINE_STAGE_DURATION.observe(duration, stage=stage.name, status=status)
+        PIPELINE_STAGE_RUNS.inc(stage=stage.name, status=status)
+        if error is not None:
+            logger.error("入庫後階段 %s 失敗 (%d 次): %s", stage.name, attempts, error)
+        return {"status": status, "duration_s": round(duration, 4), "attempts": attempts,
+                "error": error, "result": value}
+
+
+def _skipped(name: str, blocker: str) -> Dict:
+    PIPELINE_STAGE_RUNS.inc(stage=name, status="skipped")
+    return {"status": "skipped", "duration_s": 0.0, "attempts": 0,
+            "error": f"上游階段 {blocker} 未完成", "result": None}
+
+
+def _topological(stages: List[Stage]) -> List[Stage]:
+    by_name: Dict[str, Stage] = {}
+    for stage in stages:
+        if stage.name in by_name:
+            raise ValueError(f"duplicate stage {stage.name!r}")
+        by_name[stage.name] = stage
+    for stage in stages:
+        for dep in stage.after:
+            if dep not in by_name:
+                raise ValueError(f"stage {stage.name!r} depends on unknown stage {dep!r}")
+
+    ordered: List[Stage] = []
+    state: Dict[str, int] = {}  # 1 = visiting, 2 = done
+
+    def visit(stage: Stage):
+        if state.get(stage.name) == 2:
+            return
+        if state.get(stage.name) == 1:
+            raise ValueError(f"dependency cycle through stage {stage.name!r}")
+        state[stage.name] = 1
+        for dep in stage.after:
+            visit(by_name[dep])
+        state[stage.name] = 2
+        ordered.append(stage)
+
+    for stage in stages:
+        visit(stage)
+    return ordered
+
+
+# ─── Failure records ──────────────────────────────────────
+
+
+def record_results(db: Session, results: Dict[str, Dict], latest_term: Optional[str] = None):
+    """Resolve records for stages that succeeded; open or bump them for the rest."""
+    now = datetime.utcnow()
+    open_rows = {
+        row.stage: row
+        for row in db.execute(
+            select(PipelineFailure).where(PipelineFailure.resolved_at.is_(None))
+        ).scalars()
+    }
+    for name, result in results.items():
+        row = open_rows.get(name)
+        if result["status"] == "ok":
+            if row is not None:
+                row.resolved_at = now
+        elif row is None:
+            db.add(PipelineFailure(
+                stage=name, status=result["status"], latest_term=latest_term,
+                attempts=1, error_message=result["error"], first_failed_at=now, last_failed_at=now,
+            ))
+        else:
+            row.status = result["status"]
+            row.latest_term = latest_term
+            row.attempts += 1
+            row.error_message = result["error"]
+            row.last_failed_at = now
+    db.commit()
+
+
+def pending_stages(db: Session) -> List[str]:
+    """Stages with an unresolved failure record."""
+    return list(db.execute(
+        select(PipelineFailure.stage).where(PipelineFailure.resolved_at.is_(None)).distinct()
+    ).scalars())
+
+
+def resolve_stages(db: Session, names: Iterable[str]):
+    """Close failure records for stages that no longer exist."""
+    db.execute(
+        update(PipelineFailure)
+        .where(PipelineFailure.stage.in_(list(names)), PipelineFailure.resolved_at.is_(None))
+        .values(resolved_at=datetime.utcnow())
+    )
+    db.commit()
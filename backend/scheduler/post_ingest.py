@@ -0,0 +1,159 @@
+"""
+Post-ingest stages run after the crawler (or replica sync) inserts draws.
+
+    last_updated ─────────────────────────────────────┐
+    indexes ──────► precompute ───────────────────────┤
+    daily_stats ──────────────────────────────────────┼──► notify (always)
+    predictions                                       │
+    settle ───────► auto_bets                         │
+
+Every stage catches up with the current DB state (latest draw, rows past a
+cursor, responses not yet stored for the latest term), so re-running one is
+safe. That is what lets `retry_failed_stages` re-run stages recorded in
+`pipeline_failures` every PIPELINE_RETRY_MINUTES without crawling again.
+"""
+import logging
+import threading
+from typing import Dict, Optional
+
+from sqlalchemy.orm import sessionmaker
+
+from scheduler.pipeline import Pipeline, Stage, pending_stages, record_results, resolve_stages
+
+logger = logging.getLogger(__name__)
+
+# A retry must not run a stage while a fresh ingest is running it
+_run_lock = threading.Lock()
+
+
+def _last_updated(db, context):
+    from app.api.status import set_last_updated
+
+    set_last_updated()
+
+
+def _settle(db, context):
+    # Settle pending simulated bets against the latest draw
+    from app.models.draw_result import DrawResult
+    from analysis.bet_settler import auto_settle_all
+
+    latest = db.query(DrawResult).order_by(DrawResult.draw_term.desc()).first()
+    return auto_settle_all(db, latest) if latest else 0
+
+
+def _indexes(db, context):
+    # Catch in-memory indexes and EWMA hot scores up right away
+    from analysis.hot_scores import get_hot_scores
+    from analysis.number_index import get_number_index
+    from analysis.trend_series import SERIES, get_trend_series
+
+    index = get_number_index(db)
+    for name in SERIES:
+        get_trend_series(db, name)
+    get_hot_scores(db, persist=True)
+    return len(index)
+
+
+def _daily_stats(db, context):
+    from analysis.daily_stats import refresh_daily_stats
+
+    return refresh_daily_stats(db)
+
+
+def _predictions(db, context):
+    # Score predictions for the new draws, then snapshot the next term
+    from analysis.prediction_tracker import run_prediction_cycle
+
+    return run_prediction_cycle(db)
+
+
+def _precompute(db, context):
+    # Materialize standard prediction responses for the new latest term
+    from app.precomputed import precompute_responses
+
+    return precompute_responses(db)
+
+
+def _auto_bets(db, context):
+    # Place next-term bets for active auto-bet subscriptions
+    from analysis.auto_bet import run_auto_bets
+
+    return run_auto_bets(db)
+
+
+def _notify(db, context):
+    # Let web workers refresh their per-process state
+    from app.notify import notify_new_draws
+    from app.precomputed import latest_term
+
+    return notify_new_draws(latest_term(db), context.get("inserted"))
+
+
+POST_INGEST_STAGES = [
+    Stage("last_updated", _last_updated),
+    Stage("settle", _settle),
+    Stage("indexes", _indexes),
+    Stage("daily_stats", _daily_stats),
+    Stage("predictions", _predictions),
+    Stage("precompute", _precompute, after=("indexes",)),
+    Stage("auto_bets", _auto_bets, after=("settle",)),
+    Stage("notify", _notify, after=("last_updated", "indexes", "daily_stats", "precompute"), always=True),
+]
+
+
+def build_pipeline(**kwargs) -> Pipeline:
+    return Pipeline(POST_INGEST_STAGES, **kwargs)
+
+
+def _record(session_factory: sessionmaker, results: Dict[str, Dict]):
+    from app.precomputed import latest_term
+
+    db = session_factory()
+    try:
+        record_results(db, results, latest_term(db))
+    except Exception as e:
+        db.rollback()
+        logger.error("入庫後階段結果寫入失敗: %s", e)
+    finally:
+        db.close()
+
+
+def _summary(results: Dict[str, Dict]) -> str:
+    return ", ".join(f"{name}={r['status']} {r['duration_s']:.3f}s" for name, r in results.items())
+
+
+def run_post_ingest(
+    session_factory: sessionmaker, inserted: int, pipeline: Optional[Pipeline] = None
+) -> Dict[str, Dict]:
+    """Run every post-ingest stage for a crawl that inserted `inserted` draws."""
+    pipeline = pipeline or build_pipeline()
+    with _run_lock:
+        results = pipeline.run(session_factory, {"inserted": inserted})
+        _record(session_factory, results)
+    logger.info("入庫後流程完成: %s", _summary(results))
+    return results
+
+
+def retry_failed_stages(session_factory: sessionmaker, pipeline: Optional[Pipeline] = None) -> Dict[str, Dict]:
+    """Re-run stages with an unresolved failure record (and their dependents)."""
+    pipeline = pipeline or build_pipeline()
+    if not _run_lock.acquire(blocking=False):
+        return {}  # an ingest is running the pipeline right now
+    try:
+        db = session_factory()
+        try:
+            names = pending_stages(db)
+            unknown = [n for n in names if n not in pipeline.by_name]
+            if unknown:
+                resolve_stages(db, unknown)
+        finally:
+            db.close()
+        names = [n for n in names if n in pipeline.by_name]
+        if not names:
+            return {}
+        results = pipeline.run(session_factory, {"inserted": None}, only=names)
+        _record(session_factory, results)
+    finally:
+        _run_lock.release()
+    logger.info("入庫後階段重試: %s", _summary(results))
+    return results
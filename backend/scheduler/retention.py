@@ -0,0 +1,233 @@
+"""
+Retention and compaction for the tables that grow without bound.
+
+- Settled `simulated_bets` older than RETENTION_BET_DAYS are copied into
+  `archived_bets`, folded into per-session daily totals
+  (`bet_daily_summaries`, read by `/api/simulation/stats`), and then deleted
+  from the hot table.
+- Finished `crawler_logs` older than RETENTION_LOG_DAYS are folded into
+  `crawler_log_daily` and deleted.
+- On SQLite, freed pages go back to the filesystem with
+  `PRAGMA incremental_vacuum`, followed by `ANALYZE`. A database created
+  without `auto_vacuum=INCREMENTAL` needs one full `VACUUM` to switch modes.
+  That rebuild locks the whole file, so only `enable_incremental_vacuum`
+  (run by scripts.run_retention) does it. The scheduled job just logs and
+  skips the vacuum until then.
+
+Work is done in batches, each in its own transaction, so the crawler is
+never blocked for long. `run_retention` returns (and logs) the row counts,
+the reclaimed bytes and the duration.
+"""
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.metrics import RETENTION_DURATION, RETENTION_RECLAIMED_BYTES, RETENTION_ROWS
+from app.models.archived_bet import ArchivedBet, BetDailySummary
+from app.models.crawler_log import CrawlerLog
+from app.models.crawler_log_daily import CrawlerLogDaily
+from app.models.simulated_bet import SimulatedBet
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+SQLITE_INCREMENTAL = 2
+
+_bets = SimulatedBet.__table__
+_archive = ArchivedBet.__table__
+_logs = CrawlerLog.__table__
+
+
+# ─── Simulated bets ───────────────────────────────────────
+
+
+def _merge_bet_summaries(db: Session, rows) -> None:
+    totals: Dict = defaultdict(lambda: [0, 0, 0, 0])
+    for r in rows:
+        t = totals[(r.session_id, r.settled_at.date())]
+        t[0] += 1
+        t[1] += r.status == "won"
+        t[2] += r.bet_amount * r.multiplier
+        t[3] += r.prize_amount or 0
+
+    sessions = {s for s, _ in totals}
+    days = {d for _, d in totals}
+    existing = {
+        (s.session_id, s.day): s
+        for s in db.query(BetDailySummary).filter(
+            BetDailySummary.session_id.in_(sessions), BetDailySummary.day.in_(days)
+        )
+    }
+    for (session_id, day), (bets, wins, cost, prize) in totals.items():
+        summary = existing.get((session_id, day))
+        if summary is None:
+            summary = BetDailySummary(session_id=session_id, day=day, bets=0, wins=0, total_cost=0, total_prize=0)
+            db.add(summary)
+        summary.bets += bets
+        summary.wins += wins
+        summary.total_cost += cost
+        summary.total_prize += prize
+
+
+def archive_settled_bets(db: Session, older_than_days: int, batch_size: int = BATCH_SIZE) -> int:
+    """Move settled bets with settled_at older than the cutoff to archived_bets. Returns rows moved."""
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    columns = [c.name for c in _bets.c]
+    moved = 0
+    while True:
+        rows = db.execute(
+            select(_bets)
+            .where(_bets.c.status != "pending", _bets.c.settled_at < cutoff)
+            .order_by(_bets.c.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return moved
+        ids = [r.id for r in rows]
+        db.execute(insert(_archive).from_select(columns, select(_bets).where(_bets.c.id.in_(ids))))
+        _merge_bet_summaries(db, rows)
+        db.execute(delete(_bets).where(_bets.c.id.in_(ids)))
+        db.commit()
+        moved += len(rows)
+        RETENTION_ROWS.inc(len(rows), table="simulated_bets")
+
+
+# ─── Crawler logs ─────────────────────────────────────────
+
+
+def rollup_crawler_logs(db: Session, older_than_days: int, batch_size: int = BATCH_SIZE) -> int:
+    """Fold finished crawler_logs older than the cutoff into crawler_log_daily. Returns rows pruned."""
+    cutoff = datetime.now() - timedelta(days=older_than_days)  # crawler logs use local time
+    pruned = 0
+    while True:
+        rows = db.execute(
+            select(_logs)
+            .where(_logs.c.started_at < cutoff, _logs.c.status != "running")
+            .order_by(_logs.c.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return pruned
+
+        by_day = defaultdict(list)
+        for r in rows:
+            by_day[r.started_at.date()].append(r)
+        existing = {d.day: d for d in db.query(CrawlerLogDaily).filter(CrawlerLogDaily.day.in_(by_day))}
+        for day, day_rows in by_day.items():
+            agg = existing.get(day)
+            if agg is None:
+                agg = CrawlerLogDaily(
+                    day=day, runs=0, succeeded=0, failed=0,
+                    records_fetched=0, records_inserted=0, records_skipped=0, total_seconds=0,
+                )
+                db.add(agg)
+            for r in day_rows:
+                agg.runs += 1
+                agg.succeeded += r.status == "success"
+                agg.failed += r.status != "success"
+                agg.records_fetched += r.records_fetched or 0
+                agg.records_inserted += r.records_inserted or 0
+                agg.records_skipped += r.records_skipped or 0
+                if r.finished_at:
+                    agg.total_seconds += int((r.finished_at - r.started_at).total_seconds())
+                    agg.last_finished_at = max(filter(None, (agg.last_finished_at, r.finished_at)))
+                agg.first_started_at = min(filter(None, (agg.first_started_at, r.started_at)))
+
+        db.execute(delete(_logs).where(_logs.c.id.in_([r.id for r in rows])))
+        db.commit()
+        pruned += len(rows)
+        RETENTION_ROWS.inc(len(rows), table="crawler_logs")
+
+
+# ─── Compaction ───────────────────────────────────────────
+
+
+def _file_bytes(conn) -> int:
+    page_size = conn.exec_driver_sql("PRAGMA page_size").scalar()
+    return conn.exec_driver_sql("PRAGMA page_count").scalar() * page_size
+
+
+def _reclaimed(before: int, after: int, mode: str) -> Dict:
+    reclaimed = max(before - after, 0)
+    RETENTION_RECLAIMED_BYTES.inc(reclaimed)
+    return {"mode": mode, "bytes_before": before, "bytes_after": after, "reclaimed_bytes": reclaimed}
+
+
+def enable_incremental_vacuum(engine: Engine) -> Optional[Dict]:
+    """
+    One-off switch to auto_vacuum=INCREMENTAL (full VACUUM, locks the file).
+    Returns None when not SQLite or already incremental.
+    """
+    if engine.dialect.name != "sqlite":
+        return None
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() == SQLITE_INCREMENTAL:
+            return None
+        before = _file_bytes(conn)
+        conn.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.exec_driver_sql("VACUUM")  # the mode only takes effect after a rebuild
+        after = _file_bytes(conn)
+    logger.info("SQLite 已切換為 incremental auto_vacuum")
+    return _reclaimed(before, after, "vacuum")
+
+
+def compact_database(engine: Engine, max_pages: Optional[int] = None) -> Dict:
+    """Return free pages to the filesystem and refresh planner statistics (never a full VACUUM)."""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if engine.dialect.name != "sqlite":
+            conn.exec_driver_sql("ANALYZE")
+            return {"mode": "analyze", "bytes_before": None, "bytes_after": None, "reclaimed_bytes": 0}
+
+        before = _file_bytes(conn)
+        if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() != SQLITE_INCREMENTAL:
+            logger.warning("SQLite 未啟用 incremental auto_vacuum，略過空間回收；請執行一次 python -m scripts.run_retention")
+            mode = "analyze"
+        else:
+            pragma = f"PRAGMA incremental_vacuum({int(max_pages)})" if max_pages else "PRAGMA incremental_vacuum"
+            # A plain execute() steps the pragma once, freeing a single page;
+            # executescript() runs it to completion.
+            conn.connection.driver_connection.executescript(pragma)
+            mode = "incremental"
+        conn.exec_driver_sql("ANALYZE")
+        after = _file_bytes(conn)
+    return _reclaimed(before, after, mode)
+
+
+# ─── Entry point ──────────────────────────────────────────
+
+
+def run_retention(
+    db: Session,
+    bet_days: Optional[int] = None,
+    log_days: Optional[int] = None,
+    vacuum_pages: Optional[int] = None,
+) -> Dict:
+    """Archive, roll up, then compact. Settings supply any argument left as None."""
+    started = time.perf_counter()
+    bet_days = settings.RETENTION_BET_DAYS if bet_days is None else bet_days
+    log_days = settings.RETENTION_LOG_DAYS if log_days is None else log_days
+    vacuum_pages = settings.RETENTION_VACUUM_PAGES if vacuum_pages is None else vacuum_pages
+
+    report = {
+        "archived_bets": archive_settled_bets(db, bet_days),
+        "rolled_up_logs": rollup_crawler_logs(db, log_days),
+    }
+    db.commit()
+    report.update(compact_database(db.get_bind(), vacuum_pages or None))
+    report["duration_seconds"] = round(time.perf_counter() - started, 3)
+    RETENTION_DURATION.observe(report["duration_seconds"])
+
+    logger.info(
+        "資料保留: 封存投注 %d 筆, 彙總爬蟲日誌 %d 筆, 釋放 %d bytes (%s), 耗時 %.2fs",
+        report["archived_bets"], report["rolled_up_logs"], report["reclaimed_bytes"],
+        report["mode"], report["duration_seconds"],
+    )
+    return report
+
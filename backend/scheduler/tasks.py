@@ -11,9 +11,14 @@ def setup_scheduler(db_session_factory) -> BackgroundScheduler:
     """
     Create and start the background scheduler.
 
-    - Crawl every CRAWLER_INTERVAL_MINUTES (default 6 min)
-    - After crawl, run analysis and update last_updated timestamp
+    - Crawl every CRAWLER_INTERVAL_MINUTES (default 6 min), or on a replica
+      (SYNC_PRIMARY_URL set) pull from the primary every SYNC_INTERVAL_SECONDS
+    - After crawl, run the post-ingest pipeline (scheduler.post_ingest):
+      settlement, index / aggregate updates, predictions, precomputation,
+      auto-bets and notifications, independent stages concurrently
+    - Every PIPELINE_RETRY_MINUTES, re-run post-ingest stages that failed
     - max_instances=1 prevents concurrent crawl jobs
+    - Every RETENTION_INTERVAL_HOURS, archive old bets / logs and compact the DB
     """
     scheduler = BackgroundScheduler(timezone="Asia/Taipei")
 
@@ -22,49 +27,80 @@ def setup_scheduler(db_session_factory) -> BackgroundScheduler:
         db = db_session_factory()
         try:
             from crawler.bingo_crawler import BingoCrawler
-            from app.api.status import set_last_updated
+            from crawler.replica_sync import ReplicaSync
+            from scheduler.post_ingest import run_post_ingest
 
-            crawler = BingoCrawler(db)
+            # Replicas pull from the primary's change feed instead of crawling
+            crawler = ReplicaSync(db) if settings.SYNC_PRIMARY_URL else BingoCrawler(db)
             stats = crawler.run()
             logger.info(f"排程爬蟲完成: {stats}")
 
             if stats["inserted"] > 0:
-                set_last_updated()
-                logger.info("已更新 last_updated 時間戳")
-
-                # Auto-settle pending simulated bets against the latest draw
-                try:
-                    from app.models.draw_result import DrawResult
-                    from analysis.bet_settler import auto_settle_all
-
-                    latest = (
-                        db.query(DrawResult)
-                        .order_by(DrawResult.draw_term.desc())
-                        .first()
-                    )
-                    if latest:
-                        settled = auto_settle_all(db, latest)
-                        if settled:
-                            logger.info("自動兌獎: %d 筆投注已結算", settled)
-                except Exception as settle_err:
-                    logger.error("自動兌獎失敗: %s", settle_err)
+                run_post_ingest(db_session_factory, stats["inserted"])
 
         except Exception as e:
             logger.error(f"排程爬蟲例外: {e}")
         finally:
             db.close()
 
+    if settings.SYNC_PRIMARY_URL:
+        trigger = IntervalTrigger(seconds=settings.SYNC_INTERVAL_SECONDS)
+    else:
+        trigger = IntervalTrigger(minutes=settings.CRAWLER_INTERVAL_MINUTES)
     scheduler.add_job(
         crawl_and_analyze_job,
-        trigger=IntervalTrigger(minutes=settings.CRAWLER_INTERVAL_MINUTES),
+        trigger=trigger,
         id="bingo_crawler",
         name="BINGO 開獎資料爬蟲",
         replace_existing=True,
         max_instances=1,
     )
 
+    def retry_pipeline_job():
+        try:
+            from scheduler.post_ingest import retry_failed_stages
+
+            retry_failed_stages(db_session_factory)
+        except Exception as e:
+            logger.error(f"入庫後階段重試例外: {e}")
+
+    if settings.PIPELINE_RETRY_MINUTES > 0:
+        scheduler.add_job(
+            retry_pipeline_job,
+            trigger=IntervalTrigger(minutes=settings.PIPELINE_RETRY_MINUTES),
+            id="bingo_pipeline_retry",
+            name="入庫後階段重試",
+            replace_existing=True,
+            max_instances=1,
+        )
+
+    def retention_job():
+        db = db_session_factory()
+        try:
+            from scheduler.retention import run_retention
+
+            run_retention(db)
+        except Exception as e:
+            db.rollback()
+            logger.error(f"資料保留排程例外: {e}")
+        finally:
+            db.close()
+
+    if settings.RETENTION_INTERVAL_HOURS > 0:
+        scheduler.add_job(
+            retention_job,
+            trigger=IntervalTrigger(hours=settings.RETENTION_INTERVAL_HOURS),
+            id="bingo_retention",
+            name="投注封存與資料庫壓縮",
+            replace_existing=True,
+            max_instances=1,
+        )
+
     scheduler.start()
-    logger.info(
-        f"排程器已啟動 (每 {settings.CRAWLER_INTERVAL_MINUTES} 分鐘)"
-    )
+    if settings.SYNC_PRIMARY_URL:
+        logger.info(f"排程器已啟動 (複本模式: 每 {settings.SYNC_INTERVAL_SECONDS} 秒自 {settings.SYNC_PRIMARY_URL} 同步)")
+    else:
+        logger.info(
+            f"排程器已啟動 (每 {settings.CRAWLER_INTERVAL_MINUTES} 分鐘)"
+        )
     return scheduler
@@ -0,0 +1,58 @@
+"""
+Standalone ingestion daemon: crawling and all post-ingest work, outside the web workers.
+
+    cd /path/to/backend
+    python -m scheduler.worker
+
+Runs the same jobs `setup_scheduler` would start inside each web worker
+(crawl or replica sync, settlement, index / hot-score / daily-aggregate
+updates, precomputation, auto-bets, retention). Web workers then start with
+SCHEDULER_ENABLED=false, serve requests only, and learn about new draws from
+`app.notify`. In production it runs as `deploy/bingo-worker.service`.
+
+Stops cleanly on SIGTERM / SIGINT: the scheduler waits for a running job,
+then the process pools are shut down.
+"""
+import argparse
+import logging
+import signal
+import sys
+import threading
+
+from app import models  # noqa: F401  # Ensure all ORM models are registered before create_all
+from app.database import Base, SessionLocal, engine
+from app.precomputed import shutdown_pool
+from analysis.offload import shutdown_analysis_pool
+from scheduler.tasks import setup_scheduler
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="BINGO ingestion daemon (crawler + post-ingest jobs)")
+    parser.add_argument("--run-now", action="store_true", help="run one crawl right after startup")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    Base.metadata.create_all(bind=engine)
+
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda signum, frame: stop.set())
+
+    scheduler = setup_scheduler(SessionLocal)
+    if args.run_now:
+        scheduler.add_job(scheduler.get_job("bingo_crawler").func, id="bingo_crawler_startup")
+    logger.info("擷取服務已啟動")
+    try:
+        stop.wait()
+    finally:
+        logger.info("擷取服務停止中...")
+        scheduler.shutdown(wait=True)
+        shutdown_pool()
+        shutdown_analysis_pool()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""
+Backfill the normalized draw_numbers table from existing draw_results.
+
+    cd /path/to/backend
+    python -m scripts.backfill_draw_numbers
+    python -m scripts.backfill_draw_numbers --batch-size 500 --pause 0.2
+
+Safe to run while the server and crawler are live: draws are processed in
+term order, each batch in its own short transaction, and only draws with no
+number rows yet are touched. New draws are written by the crawler on ingest.
+"""
+import argparse
+import sys
+import time
+
+from app.database import Base, SessionLocal, engine
+from analysis.draw_numbers import BACKFILL_BATCH_SIZE, backfill_draw_numbers
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Backfill draw_numbers from draw_results")
+    parser.add_argument("--batch-size", type=int, default=BACKFILL_BATCH_SIZE, help="draws per transaction")
+    parser.add_argument("--pause", type=float, default=0.0, help="seconds to sleep between batches")
+    args = parser.parse_args(argv)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        filled = backfill_draw_numbers(db, args.batch_size, args.pause)
+    finally:
+        db.close()
+    print(f"backfilled {filled} draw(s) in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
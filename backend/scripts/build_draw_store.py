@@ -0,0 +1,54 @@
+"""
+Build or catch up the append-only binary draw history file.
+
+    cd /path/to/backend
+    python -m scripts.build_draw_store                    # uses DRAW_STORE_PATH
+    python -m scripts.build_draw_store --path history.bin --rebuild
+
+The crawler keeps the file current after each run, but only appends terms
+newer than the last stored one. Use --rebuild after backfilling older history.
+"""
+import argparse
+import os
+import sys
+import time
+
+from app.config import settings
+from app.database import SessionLocal
+from storage.binary_store import DrawStore, sync_from_db
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Build the binary draw history file")
+    parser.add_argument("--path", default=settings.DRAW_STORE_PATH)
+    parser.add_argument("--rebuild", action="store_true", help="delete and rewrite from scratch")
+    args = parser.parse_args(argv)
+
+    if not args.path:
+        print("No path given and DRAW_STORE_PATH is not set.")
+        return 1
+
+    if args.rebuild and os.path.exists(args.path):
+        tmp = f"{args.path}.rebuild"
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        target = DrawStore(tmp)
+    else:
+        tmp = None
+        target = DrawStore(args.path)
+
+    start = time.perf_counter()
+    db = SessionLocal()
+    try:
+        appended = sync_from_db(db, target)
+    finally:
+        db.close()
+    if tmp:
+        os.replace(tmp, args.path)  # readers keep their old mapping until they reopen
+
+    print(f"Appended {appended} draws to {args.path} in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
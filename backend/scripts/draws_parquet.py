@@ -0,0 +1,53 @@
+"""
+Export / import draw history as Parquet.
+
+    cd /path/to/backend
+    python -m scripts.draws_parquet export draws.parquet
+    python -m scripts.draws_parquet import draws.parquet    # seed a fresh DB without re-crawling
+
+Requires pyarrow (pip install -r requirements-extras.txt). After an import
+that added draws, the per-day aggregates are refreshed and, with
+DRAW_STORE_PATH set, the new draws are appended to the binary history file.
+"""
+import argparse
+import sys
+import time
+
+from app.config import settings
+from app.database import Base, SessionLocal, engine
+from app import models  # noqa: F401  # Ensure all ORM models are registered before create_all
+from analysis.daily_stats import refresh_daily_stats
+from storage.binary_store import DrawStore, sync_from_db
+from storage.columnar import BATCH_SIZE, export_parquet, import_parquet
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Parquet export / import of draw_results")
+    parser.add_argument("action", choices=["export", "import"])
+    parser.add_argument("path")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    start = time.perf_counter()
+    try:
+        if args.action == "export":
+            count = export_parquet(db, args.path, args.batch_size)
+            print(f"Exported {count} draws to {args.path}")
+        else:
+            stats = import_parquet(db, args.path, args.batch_size)
+            print(f"Imported from {args.path}: {stats}")
+            if stats["inserted"]:
+                print(f"Refreshed daily stats for {refresh_daily_stats(db)} day(s)")
+                if settings.DRAW_STORE_PATH:
+                    appended = sync_from_db(db, DrawStore(settings.DRAW_STORE_PATH))
+                    print(f"Appended {appended} draws to {settings.DRAW_STORE_PATH}")
+    finally:
+        db.close()
+    print(f"Done in {time.perf_counter() - start:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+"""
+One-time migration: index draw_results.draw_date.
+
+Run once on the deployed server:
+    cd /path/to/backend
+    python -m scripts.migrate_add_draw_date_index
+
+The daily aggregates (analysis.daily_stats) rebuild one draw_date at a time.
+"""
+import sqlite3
+from pathlib import Path
+
+# Resolve DB path relative to project root
+DB_PATH = Path(__file__).resolve().parent.parent / "bingo.db"
+
+
+def migrate():
+    if not DB_PATH.exists():
+        print(f"DB not found at {DB_PATH}, skipping migration.")
+        return
+
+    conn = sqlite3.connect(str(DB_PATH))
+    cursor = conn.cursor()
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_draw_results_draw_date ON draw_results(draw_date)")
+    conn.commit()
+    conn.close()
+    print("Done.")
+
+
+if __name__ == "__main__":
+    migrate()
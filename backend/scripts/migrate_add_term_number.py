@@ -0,0 +1,43 @@
+"""
+One-time migration: add integer term_number column to draw_results.
+
+Run once on the deployed server:
+    cd /path/to/backend
+    python -m scripts.migrate_add_term_number
+
+Existing rows are backfilled from draw_term; new rows get it on insert.
+"""
+import sqlite3
+from pathlib import Path
+
+# Resolve DB path relative to project root
+DB_PATH = Path(__file__).resolve().parent.parent / "bingo.db"
+
+
+def migrate():
+    if not DB_PATH.exists():
+        print(f"DB not found at {DB_PATH}, skipping migration.")
+        return
+
+    conn = sqlite3.connect(str(DB_PATH))
+    cursor = conn.cursor()
+
+    cursor.execute("PRAGMA table_info(draw_results)")
+    columns = [row[1] for row in cursor.fetchall()]
+
+    if "term_number" not in columns:
+        print("Adding term_number column to draw_results...")
+        cursor.execute("ALTER TABLE draw_results ADD COLUMN term_number INTEGER")
+
+    cursor.execute(
+        "UPDATE draw_results SET term_number = CAST(draw_term AS INTEGER) WHERE term_number IS NULL"
+    )
+    print(f"Backfilled {cursor.rowcount} rows.")
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_draw_results_term_number ON draw_results(term_number)")
+    conn.commit()
+    conn.close()
+    print("Done.")
+
+
+if __name__ == "__main__":
+    migrate()
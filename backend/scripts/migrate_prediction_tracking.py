@@ -0,0 +1,55 @@
+"""
+One-time migration: add target term and scoring columns to predictions.
+
+Run once on the deployed server:
+    cd /path/to/backend
+    python -m scripts.migrate_prediction_tracking
+
+The prediction_accuracy table is created by the app on startup.
+"""
+import sqlite3
+from pathlib import Path
+
+# Resolve DB path relative to project root
+DB_PATH = Path(__file__).resolve().parent.parent / "bingo.db"
+
+NEW_COLUMNS = {
+    "target_term": "VARCHAR(20)",
+    "hits": "INTEGER",
+    "is_correct": "BOOLEAN",
+    "actual_result": "TEXT",
+    "scored_at": "DATETIME",
+}
+
+
+def migrate():
+    if not DB_PATH.exists():
+        print(f"DB not found at {DB_PATH}, skipping migration.")
+        return
+
+    conn = sqlite3.connect(str(DB_PATH))
+    cursor = conn.cursor()
+
+    cursor.execute("PRAGMA table_info(predictions)")
+    columns = [row[1] for row in cursor.fetchall()]
+    if not columns:
+        print("predictions table not found, skipping (created on app startup).")
+        conn.close()
+        return
+
+    for name, ddl in NEW_COLUMNS.items():
+        if name not in columns:
+            print(f"Adding {name} column to predictions...")
+            cursor.execute(f"ALTER TABLE predictions ADD COLUMN {name} {ddl}")
+
+    cursor.execute("CREATE INDEX IF NOT EXISTS ix_predictions_target_term ON predictions(target_term)")
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS ix_predictions_lookup ON predictions(prediction_type, period_range, target_term)"
+    )
+    conn.commit()
+    conn.close()
+    print("Done.")
+
+
+if __name__ == "__main__":
+    migrate()
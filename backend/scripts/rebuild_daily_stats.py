@@ -0,0 +1,29 @@
+"""
+Build (or repair) the per-day draw aggregates behind /api/predictions/long-range.
+
+    cd /path/to/backend
+    python -m scripts.rebuild_daily_stats
+
+Compares each day's draw count with its stored rollup and recomputes the days
+that differ, so it is safe to re-run after backfilling old dates. The
+scheduler keeps the table current after each ingest.
+"""
+import sys
+
+from app.database import Base, SessionLocal, engine
+from analysis.daily_stats import refresh_daily_stats
+
+
+def main() -> int:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        rebuilt = refresh_daily_stats(db, full=True)
+    finally:
+        db.close()
+    print(f"rebuilt {rebuilt} day(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
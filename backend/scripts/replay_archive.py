@@ -0,0 +1,50 @@
+"""
+Re-ingest draws from the raw crawler archive, without network access.
+
+    cd /path/to/backend
+    python -m scripts.replay_archive                            # CRAWLER_ARCHIVE_DIR
+    python -m scripts.replay_archive --archive /data/raw --from 2026-01-01 --to 2026-01-31
+    python -m scripts.replay_archive --replace                  # re-derive existing draws
+
+Pages are validated and parsed exactly as the crawler does, then bulk-inserted
+one day per transaction. Without --replace, draws already present are left
+alone, so re-running is safe. With --replace they are rewritten from the
+archive. In that case run scripts.rebuild_daily_stats and
+scripts.build_draw_store afterwards, and restart the web workers so their
+in-memory indexes rebuild.
+"""
+import argparse
+import sys
+import time
+from datetime import date
+
+from app import models  # noqa: F401  # Ensure all ORM models are registered before create_all
+from app.config import settings
+from app.database import Base, SessionLocal, engine
+from crawler.raw_archive import RawArchive, replay
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay archived TLC API pages into the database")
+    parser.add_argument("--archive", default=settings.CRAWLER_ARCHIVE_DIR, help="archive dir (default CRAWLER_ARCHIVE_DIR)")
+    parser.add_argument("--from", dest="from_date", type=date.fromisoformat, help="first query date (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="to_date", type=date.fromisoformat, help="last query date (YYYY-MM-DD)")
+    parser.add_argument("--replace", action="store_true", help="rewrite draws that already exist")
+    args = parser.parse_args(argv)
+
+    if not args.archive:
+        parser.error("no archive: pass --archive or set CRAWLER_ARCHIVE_DIR")
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        stats = replay(db, RawArchive(args.archive), args.from_date, args.to_date, args.replace)
+    finally:
+        db.close()
+    print(f"{stats} in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""
+Run the retention job once (archive old bets, roll up crawler logs, compact).
+
+    cd /path/to/backend
+    python -m scripts.run_retention
+    python -m scripts.run_retention --bet-days 7 --log-days 3
+
+The scheduler runs the same job every RETENTION_INTERVAL_HOURS, but never a
+full VACUUM. On a SQLite database without auto_vacuum=INCREMENTAL this script
+first switches the mode, which rebuilds (and locks) the whole file once; run
+it in a quiet period. Until then the scheduled job skips the vacuum step.
+"""
+import argparse
+import json
+import sys
+
+from app.database import SessionLocal
+from scheduler.retention import enable_incremental_vacuum, run_retention
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Archive old bets / logs and compact the database")
+    parser.add_argument("--bet-days", type=int, default=None, help="default RETENTION_BET_DAYS")
+    parser.add_argument("--log-days", type=int, default=None, help="default RETENTION_LOG_DAYS")
+    parser.add_argument("--vacuum-pages", type=int, default=None, help="default RETENTION_VACUUM_PAGES")
+    args = parser.parse_args(argv)
+
+    db = SessionLocal()
+    try:
+        switched = enable_incremental_vacuum(db.get_bind())
+        if switched:
+            print(f"Enabled incremental auto_vacuum: {json.dumps(switched)}")
+        report = run_retention(db, args.bet_days, args.log_days, args.vacuum_pages)
+    finally:
+        db.close()
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,362 @@
+"""
+Append-only, fixed-width binary draw history for zero-copy reads.
+
+File layout (little-endian):
+
+    header  16 bytes   magic b"BINGODRW", uint16 version, uint16 record size, 4 reserved
+    record  32 bytes   uint32 term
+                       uint8[20] numbers in draw (sequence) order
+                       uint8 super number
+                       uint8 flags    bits 0-1 high/low (0 －, 1 大, 2 小)
+                                      bits 2-3 odd/even (0 －, 1 單, 2 雙)
+                       uint8 high_count
+                       uint8 odd_count
+                       uint32 draw time, minutes since 2000-01-01 00:00 (local)
+
+Records are in strictly increasing term order. Writers append whole records
+under an exclusive file lock, and readers only map complete records, so a
+reader never sees a torn write. Every process that maps the file shares
+the same page-cache pages.
+
+Readers use `mmap` from the standard library. `DrawStoreView.as_numpy()`
+returns a structured NumPy array over the same mapping without copying, if
+NumPy is installed.
+
+With DRAW_STORE_PATH set, the in-memory indexes (NumberIndex, TrendSeries)
+and the EWMA hot scores bootstrap from this file (`open_matching_view`) and
+read only the newer tail from SQL.
+"""
+import logging
+import mmap
+import os
+import struct
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.draw_result import DrawResult
+
+try:  # POSIX only; on Windows appends are not cross-process locked
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"BINGODRW"
+VERSION = 1
+HEADER = struct.Struct("<8sHH4x")
+RECORD = struct.Struct("<I20sBBBBI")
+HEADER_SIZE = HEADER.size
+RECORD_SIZE = RECORD.size
+EPOCH = datetime(2000, 1, 1)
+
+HIGH_LOW_CODES = {"－": 0, "大": 1, "小": 2}
+ODD_EVEN_CODES = {"－": 0, "單": 1, "雙": 2}
+HIGH_LOW_LABELS = {v: k for k, v in HIGH_LOW_CODES.items()}
+ODD_EVEN_LABELS = {v: k for k, v in ODD_EVEN_CODES.items()}
+
+NUMPY_DTYPE_SPEC = [
+    ("term", "<u4"),
+    ("numbers", "u1", (20,)),
+    ("super_number", "u1"),
+    ("flags", "u1"),
+    ("high_count", "u1"),
+    ("odd_count", "u1"),
+    ("minutes", "<u4"),
+]
+
+
+def encode_draw(draw) -> bytes:
+    """Pack a DrawResult (or a dict with the same keys) into one record."""
+    get = draw.get if isinstance(draw, dict) else lambda k: getattr(draw, k)
+    seq = bytes(int(n) for n in get("numbers_sequence").split(","))
+    flags = HIGH_LOW_CODES.get(get("high_low_result") or "－", 0) | (
+        ODD_EVEN_CODES.get(get("odd_even_result") or "－", 0) << 2
+    )
+    minutes = int((get("draw_datetime") - EPOCH).total_seconds() // 60)
+    return RECORD.pack(
+        int(get("draw_term")),
+        seq,
+        int(get("super_number")),
+        flags,
+        int(get("high_count") or 0),
+        int(get("odd_count") or 0),
+        minutes,
+    )
+
+
+class StoredDraw:
+    """Decoded record exposing the DrawResult attributes analyzers read."""
+
+    __slots__ = ("term", "sequence", "super_int", "flags", "high_count", "odd_count", "minutes")
+
+    def __init__(self, raw: Tuple):
+        self.term, self.sequence, self.super_int, self.flags, self.high_count, self.odd_count, self.minutes = raw
+
+    @property
+    def draw_term(self) -> str:
+        return str(self.term)
+
+    @property
+    def draw_datetime(self) -> datetime:
+        return EPOCH + timedelta(minutes=self.minutes)
+
+    @property
+    def numbers_sequence(self) -> str:
+        return ",".join(f"{n:02d}" for n in self.sequence)
+
+    @property
+    def numbers_sorted(self) -> str:
+        return ",".join(f"{n:02d}" for n in sorted(self.sequence))
+
+    @property
+    def super_number(self) -> str:
+        return f"{self.super_int:02d}"
+
+    @property
+    def high_low_result(self) -> str:
+        return HIGH_LOW_LABELS[self.flags & 0b11]
+
+    @property
+    def odd_even_result(self) -> str:
+        return ODD_EVEN_LABELS[(self.flags >> 2) & 0b11]
+
+    @property
+    def low_count(self) -> int:
+        return 20 - self.high_count
+
+    @property
+    def even_count(self) -> int:
+        return 20 - self.odd_count
+
+    def get_numbers_list(self) -> List[str]:
+        return self.numbers_sorted.split(",")
+
+    def get_sequence_list(self) -> List[str]:
+        return self.numbers_sequence.split(",")
+
+
+class DrawStore:
+    """Writer / opener for one history file."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _ensure_header(self, f):
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            f.write(HEADER.pack(MAGIC, VERSION, RECORD_SIZE))
+            return
+        f.seek(0)
+        magic, version, record_size = HEADER.unpack(f.read(HEADER_SIZE))
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            raise ValueError(f"{self.path} is not a v{VERSION} draw store")
+
+    @staticmethod
+    def _last_term(f) -> int:
+        f.seek(0, os.SEEK_END)
+        count = (f.tell() - HEADER_SIZE) // RECORD_SIZE
+        if count <= 0:
+            return 0
+        f.seek(HEADER_SIZE + (count - 1) * RECORD_SIZE)
+        return RECORD.unpack(f.read(RECORD_SIZE))[0]
+
+    def last_term(self) -> int:
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, "rb") as f:
+            return self._last_term(f)
+
+    def append(self, draws: Iterable) -> int:
+        """
+        Append draws (oldest first). Terms not newer than the last stored
+        record are skipped, so replays and concurrent writers are harmless.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                self._ensure_header(f)
+                # Drop a torn tail left by a crashed writer before appending
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+                aligned = HEADER_SIZE + (size - HEADER_SIZE) // RECORD_SIZE * RECORD_SIZE
+                if aligned != size:
+                    f.truncate(aligned)
+                last = self._last_term(f)
+                buf = bytearray()
+                for draw in draws:
+                    record = encode_draw(draw)
+                    term = RECORD.unpack_from(record)[0]
+                    if term <= last:
+                        continue
+                    buf += record
+                    last = term
+                if buf:
+                    f.seek(0, os.SEEK_END)
+                    f.write(buf)
+                    f.flush()
+                    os.fsync(f.fileno())
+                return len(buf) // RECORD_SIZE
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def open(self) -> "DrawStoreView":
+        return DrawStoreView(self.path)
+
+
+class DrawStoreView:
+    """Read-only mmap view; call refresh() to pick up records appended since."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap: Optional[mmap.mmap] = None
+        self._count = 0
+        try:
+            self.refresh()
+        except BaseException:
+            self.close()
+            raise
+
+    def refresh(self) -> int:
+        size = os.fstat(self._file.fileno()).st_size
+        if 0 < size < HEADER_SIZE:
+            raise ValueError(f"{self.path} is truncated ({size} bytes, header is {HEADER_SIZE})")
+        count = max((size - HEADER_SIZE) // RECORD_SIZE, 0)
+        if self._mmap is None or count != self._count:
+            self._release()
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+            if self._mmap is not None:
+                magic, version, record_size = HEADER.unpack_from(self._mmap, 0)
+                if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+                    raise ValueError(f"{self.path} is not a v{VERSION} draw store")
+            self._count = count
+        return self._count
+
+    def _release(self):
+        if self._mmap is None:
+            return
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass  # NumPy arrays / memoryviews still reference it; GC unmaps later
+        self._mmap = None
+
+    def close(self):
+        self._release()
+        self._file.close()
+
+    def __enter__(self) -> "DrawStoreView":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def raw(self, index: int) -> Tuple:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return RECORD.unpack_from(self._mmap, HEADER_SIZE + index * RECORD_SIZE)
+
+    def __getitem__(self, index: int) -> StoredDraw:
+        return StoredDraw(self.raw(index))
+
+    def term(self, index: int) -> int:
+        return self.raw(index)[0]
+
+    def numbers(self, index: int) -> memoryview:
+        """20 draw-order numbers of record `index`, as a zero-copy memoryview."""
+        if index < 0:
+            index += self._count
+        offset = HEADER_SIZE + index * RECORD_SIZE + 4
+        return memoryview(self._mmap)[offset:offset + 20]
+
+    def find(self, term: int) -> int:
+        """Index of `term` (binary search), or -1."""
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            t = self.term(mid)
+            if t < term:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self._count and self.term(lo) == term else -1
+
+    def latest(self, limit: int) -> List[StoredDraw]:
+        """Newest `limit` draws, newest first — same order as analyzer queries."""
+        start = max(self._count - limit, 0)
+        return [self[i] for i in range(self._count - 1, start - 1, -1)]
+
+    def iter_draws(self, start: int = 0) -> Iterator[StoredDraw]:
+        for i in range(start, self._count):
+            yield self[i]
+
+    def as_numpy(self):
+        """Structured array over the mapping (no copy). Requires NumPy."""
+        import numpy as np
+
+        if self._mmap is None or not self._count:
+            return np.zeros(0, dtype=np.dtype(NUMPY_DTYPE_SPEC))
+        return np.frombuffer(
+            self._mmap, dtype=np.dtype(NUMPY_DTYPE_SPEC), count=self._count, offset=HEADER_SIZE
+        )
+
+
+def open_matching_view(db: Session, path: Optional[str] = None) -> Optional[DrawStoreView]:
+    """
+    View of the history file (default DRAW_STORE_PATH) if it holds exactly the
+    DB's draws up to its last term, else None. Callers close the view.
+    """
+    path = settings.DRAW_STORE_PATH if path is None else path
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        view = DrawStoreView(path)
+    except (OSError, ValueError) as e:
+        logger.warning(f"二進位歷史檔無法開啟: {e}")
+        return None
+    if not len(view):
+        view.close()
+        return None
+    table = DrawResult.__table__
+    in_db = db.execute(
+        select(func.count()).select_from(table).where(table.c.draw_term <= str(view.term(-1)))
+    ).scalar()
+    if in_db != len(view):
+        logger.warning(f"二進位歷史檔與資料庫不一致 ({len(view)} / {in_db} 期)，改由資料庫載入")
+        view.close()
+        return None
+    return view
+
+
+def sync_from_db(db: Session, store: DrawStore, batch_size: int = 10_000) -> int:
+    """Append every draw newer than the store's last term. Returns records appended."""
+    table = DrawResult.__table__
+    cols = [
+        table.c.draw_term, table.c.draw_datetime, table.c.numbers_sequence,
+        table.c.super_number, table.c.high_low_result, table.c.odd_even_result,
+        table.c.high_count, table.c.odd_count,
+    ]
+    appended = 0
+    last = str(store.last_term() or "")
+    while True:
+        stmt = select(*cols).order_by(table.c.draw_term).limit(batch_size)
+        if last:
+            stmt = stmt.where(table.c.draw_term > last)
+        rows = [dict(r._mapping) for r in db.execute(stmt).all()]
+        if not rows:
+            return appended
+        appended += store.append(rows)
+        last = rows[-1]["draw_term"]
@@ -0,0 +1,246 @@
+"""
+Columnar (Arrow / Parquet) export and import of `draw_results`.
+
+Numbers are stored as fixed-width `uint8[20]` lists (sorted and draw order)
+plus an 80-bit membership bitmask (`fixed_size_binary(10)`, bit n-1 set when
+number n was drawn, little-endian), so analysts can load years of history
+straight into pandas / polars / DuckDB.
+
+pyarrow is optional (see requirements-extras.txt); it is imported on first use.
+"""
+import io
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.draw_result import DrawResult
+from analysis.draw_numbers import insert_number_rows
+
+BATCH_SIZE = 10_000
+BITMASK_BYTES = 10
+
+_table = DrawResult.__table__
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:  # pragma: no cover - depends on environment
+        raise RuntimeError(
+            "pyarrow is required for columnar export/import: pip install -r requirements-extras.txt"
+        ) from e
+    return pa, pq
+
+
+def draw_schema():
+    pa, _ = _require_pyarrow()
+    numbers = pa.list_(pa.uint8(), 20)
+    return pa.schema([
+        ("draw_term", pa.int64()),
+        ("draw_date", pa.date32()),
+        ("draw_datetime", pa.timestamp("s")),
+        ("numbers_sorted", numbers),
+        ("numbers_sequence", numbers),
+        ("numbers_bitmask", pa.binary(BITMASK_BYTES)),
+        ("super_number", pa.uint8()),
+        ("high_low_result", pa.string()),
+        ("high_count", pa.uint8()),
+        ("low_count", pa.uint8()),
+        ("odd_even_result", pa.string()),
+        ("odd_count", pa.uint8()),
+        ("even_count", pa.uint8()),
+    ])
+
+
+def numbers_bitmask(numbers: List[int]) -> bytes:
+    mask = 0
+    for n in numbers:
+        mask |= 1 << (n - 1)
+    return mask.to_bytes(BITMASK_BYTES, "little")
+
+
+# ─── Export ───────────────────────────────────────────────
+
+
+def _iter_row_batches(db: Session, batch_size: int) -> Iterator[List]:
+    """Keyset-paginate draw_results in term order (constant memory)."""
+    cols = [
+        _table.c.draw_term, _table.c.draw_date, _table.c.draw_datetime,
+        _table.c.numbers_sorted, _table.c.numbers_sequence, _table.c.super_number,
+        _table.c.high_low_result, _table.c.high_count, _table.c.low_count,
+        _table.c.odd_even_result, _table.c.odd_count, _table.c.even_count,
+    ]
+    last_term: Optional[str] = None
+    while True:
+        stmt = select(*cols).order_by(_table.c.draw_term).limit(batch_size)
+        if last_term is not None:
+            stmt = stmt.where(_table.c.draw_term > last_term)
+        rows = db.execute(stmt).all()
+        if not rows:
+            return
+        yield rows
+        last_term = rows[-1].draw_term
+
+
+def _to_record_batch(rows: List, schema):
+    pa, _ = _require_pyarrow()
+    sorted_flat: List[int] = []
+    seq_flat: List[int] = []
+    masks: List[bytes] = []
+    for r in rows:
+        nums = [int(n) for n in r.numbers_sorted.split(",")]
+        sorted_flat.extend(nums)
+        seq_flat.extend(int(n) for n in r.numbers_sequence.split(","))
+        masks.append(numbers_bitmask(nums))
+
+    def fixed(flat):
+        return pa.FixedSizeListArray.from_arrays(pa.array(flat, pa.uint8()), 20)
+
+    return pa.RecordBatch.from_arrays(
+        [
+            pa.array([int(r.draw_term) for r in rows], pa.int64()),
+            pa.array([r.draw_date for r in rows], pa.date32()),
+            pa.array([r.draw_datetime for r in rows], pa.timestamp("s")),
+            fixed(sorted_flat),
+            fixed(seq_flat),
+            pa.array(masks, pa.binary(BITMASK_BYTES)),
+            pa.array([int(r.super_number) for r in rows], pa.uint8()),
+            pa.array([r.high_low_result for r in rows], pa.string()),
+            pa.array([r.high_count for r in rows], pa.uint8()),
+            pa.array([r.low_count for r in rows], pa.uint8()),
+            pa.array([r.odd_even_result for r in rows], pa.string()),
+            pa.array([r.odd_count for r in rows], pa.uint8()),
+            pa.array([r.even_count for r in rows], pa.uint8()),
+        ],
+        schema=schema,
+    )
+
+
+def iter_record_batches(db: Session, batch_size: int = BATCH_SIZE):
+    schema = draw_schema()
+    for rows in _iter_row_batches(db, batch_size):
+        yield _to_record_batch(rows, schema)
+
+
+def export_parquet(db: Session, where, batch_size: int = BATCH_SIZE, compression: str = "zstd") -> int:
+    """Write all draws to `where` (path or writable file). Returns rows written."""
+    _, pq = _require_pyarrow()
+    total = 0
+    with pq.ParquetWriter(where, draw_schema(), compression=compression) as writer:
+        for batch in iter_record_batches(db, batch_size):
+            writer.write_batch(batch)
+            total += batch.num_rows
+    return total
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands back whatever was written since the last drain."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        data = bytes(b)
+        self._chunks.append(data)
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_parquet(db: Session, batch_size: int = BATCH_SIZE, compression: str = "zstd") -> Iterator[bytes]:
+    """Yield a Parquet file chunk by chunk (one row group per batch)."""
+    _, pq = _require_pyarrow()
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, draw_schema(), compression=compression)
+    try:
+        for batch in iter_record_batches(db, batch_size):
+            writer.write_batch(batch)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def stream_arrow(db: Session, batch_size: int = BATCH_SIZE) -> Iterator[bytes]:
+    """Yield an Arrow IPC stream, one record batch at a time."""
+    pa, _ = _require_pyarrow()
+    sink = _ChunkSink()
+    writer = pa.ipc.new_stream(sink, draw_schema())
+    try:
+        for batch in iter_record_batches(db, batch_size):
+            writer.write_batch(batch)
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+# ─── Import ───────────────────────────────────────────────
+
+
+def _rows_from_batch(batch) -> List[Dict]:
+    cols = batch.to_pydict()
+    rows = []
+    now = datetime.utcnow()
+    for i in range(batch.num_rows):
+        rows.append({
+            "draw_term": str(cols["draw_term"][i]),
+            "draw_date": cols["draw_date"][i],
+            "draw_datetime": cols["draw_datetime"][i],
+            "numbers_sorted": ",".join(f"{n:02d}" for n in cols["numbers_sorted"][i]),
+            "numbers_sequence": ",".join(f"{n:02d}" for n in cols["numbers_sequence"][i]),
+            "super_number": f"{cols['super_number'][i]:02d}",
+            "high_low_result": cols["high_low_result"][i],
+            "high_count": cols["high_count"][i],
+            "low_count": cols["low_count"][i],
+            "odd_even_result": cols["odd_even_result"][i],
+            "odd_count": cols["odd_count"][i],
+            "even_count": cols["even_count"][i],
+            "created_at": now,
+        })
+    return rows
+
+
+def import_parquet(db: Session, source, batch_size: int = BATCH_SIZE) -> Dict[str, int]:
+    """
+    Bulk-load draws from a Parquet file produced by `export_parquet`.
+
+    History is append-only, so rows at or below the current latest term are
+    skipped instead of checked one by one. Each inserted draw gets its
+    `draw_numbers` rows in the same transaction. The per-day aggregates and
+    the binary history file are left to the caller (scripts.draws_parquet
+    refreshes both).
+    """
+    _, pq = _require_pyarrow()
+    latest = db.execute(select(func.max(_table.c.draw_term))).scalar()
+    latest_term = int(latest) if latest else 0
+
+    stats = {"read": 0, "inserted": 0, "skipped": 0}
+    parquet = pq.ParquetFile(source)
+    for batch in parquet.iter_batches(batch_size=batch_size):
+        rows = _rows_from_batch(batch)
+        stats["read"] += len(rows)
+        fresh = [r for r in rows if int(r["draw_term"]) > latest_term]
+        stats["skipped"] += len(rows) - len(fresh)
+        if fresh:
+            db.execute(insert(_table), fresh)
+            insert_number_rows(db, fresh)
+            stats["inserted"] += len(fresh)
+    db.commit()
+    return stats
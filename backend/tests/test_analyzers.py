@@ -101,6 +101,20 @@ class TestBasicAnalyzer:
         assert 20 in result
         assert len(result[10]["predictions"]) == 5
 
+    @pytest.mark.parametrize("use_weighted", [True, False])
+    def test_batch_matches_analyze(self, db_session, use_weighted):
+        from benchmarks.synthetic import seed_draws
+        seed_draws(db_session, 260)
+        analyzer = BasicAnalyzer(db_session)
+        ranges = [1, 2, 5, 30, 100, 500]
+        batch = analyzer.batch_analyze(ranges, top_n=20, use_weighted=use_weighted)
+        for p in ranges:
+            assert batch[p] == analyzer.analyze(p, 20, use_weighted)
+
+    def test_batch_empty(self, db_session):
+        result = BasicAnalyzer(db_session).batch_analyze([10])
+        assert result[10] == BasicAnalyzer(db_session).analyze(10)
+
 
 # ─── SuperNumberAnalyzer ──────────────────────────────────────
 
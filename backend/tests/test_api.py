@@ -1,3 +1,4 @@
+import json
 import os
 import pytest
 from datetime import date, datetime
@@ -39,6 +40,7 @@ def setup_and_teardown():
     Base.metadata.create_all(bind=engine)
     yield
     Base.metadata.drop_all(bind=engine)
+    engine.dispose()
     if os.path.exists(TEST_DB_PATH):
         try:
             os.remove(TEST_DB_PATH)
@@ -108,6 +110,93 @@ class TestDrawsAPI:
         r = client.get("/api/draws/999999999")
         assert r.status_code == 404
 
+    def test_changes_feed(self):
+        _seed(3)
+        data = client.get("/api/draws/changes?since_id=0&limit=1").json()
+        assert data["columns"][0] == "draw_term"
+        assert [r[0] for r in data["rows"]] == ["115000000"]
+        assert data["has_more"]
+        data = client.get(f"/api/draws/changes?since_id={data['next_since_id']}&limit=1").json()
+        assert [r[0] for r in data["rows"]] == ["115000001"]
+
+    def test_export_parquet(self):
+        pq = pytest.importorskip("pyarrow.parquet")
+        import io
+        _seed(3)
+        r = client.get("/api/draws/export?format=parquet")
+        assert r.status_code == 200
+        table = pq.read_table(io.BytesIO(r.content))
+        assert table.num_rows == 3
+        assert table.column("draw_term").to_pylist() == [115000000, 115000001, 115000002]
+
+
+class TestDrawQueryAPI:
+    @staticmethod
+    def _seed_days(count=450):
+        from benchmarks.synthetic import seed_draws
+        db = TestSession()
+        seed_draws(db, count)  # 203 draws/day from 2024-01-01
+        db.close()
+
+    def test_keyset_pages_cover_all_rows(self):
+        self._seed_days(250)
+        seen, params = [], {"limit": 100}
+        while True:
+            body = client.get("/api/draws", params=params).json()
+            seen += [d["draw_term"] for d in body["items"]]
+            if not body["next_cursor"]:
+                break
+            params = {"limit": 100, **body["next_cursor"]}
+        assert len(seen) == 250
+        assert seen == sorted(seen, reverse=True)
+
+    def test_ascending_uses_after_term(self):
+        self._seed_days(5)
+        body = client.get("/api/draws?order=asc&limit=2").json()
+        assert [d["draw_term"] for d in body["items"]] == ["113000001", "113000002"]
+        assert body["next_cursor"] == {"after_term": 113000002}
+
+    def test_date_range(self):
+        self._seed_days(450)
+        body = client.get("/api/draws?from_date=2024-01-02&to_date=2024-01-02&limit=1000").json()
+        assert len(body["items"]) == 203
+        assert all(d["draw_datetime"].startswith("2024-01-02") for d in body["items"])
+        assert body["next_cursor"] is None
+
+    def test_ndjson_stream(self):
+        self._seed_days(450)
+        r = client.get("/api/draws?format=ndjson&from_date=2024-01-03")
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in r.text.splitlines()]
+        assert len(lines) == 450 - 2 * 203
+        assert len(lines[0]["numbers_sorted"]) == 20
+
+    def test_csv_stream(self):
+        import csv
+        self._seed_days(10)
+        r = client.get("/api/draws?format=csv&after_term=113000005&order=asc")
+        rows = list(csv.reader(r.text.splitlines()))
+        assert rows[0][0] == "draw_term"
+        assert [row[0] for row in rows[1:]] == [f"1130000{i:02d}" for i in range(6, 11)]
+        assert len(rows[1][2].split(",")) == 20
+
+    def test_number_timeline(self):
+        self._seed_days(30)
+        r = client.get("/api/numbers/7/timeline?window=20&with_number=33")
+        assert r.status_code == 200
+        body = r.json()
+        assert body["number"] == "07"
+        assert body["window"] == 20
+        assert body["pair"]["number"] == "33"
+        assert client.get("/api/numbers/81/timeline").status_code == 422
+
+    def test_term_number_filled_on_insert(self):
+        _seed(1)
+        db = TestSession()
+        assert db.query(DrawResult).one().term_number == 115000000
+        db.close()
+
 
 # ─── Predictions ──────────────────────────────────────────────
 
@@ -137,6 +226,38 @@ class TestPredictionsAPI:
         assert data["prediction_type"] == "basic"
         assert len(data["predictions"]) == 5
 
+    def test_hot_scores(self):
+        _seed(5)
+        data = client.get("/api/predictions/hot-scores").json()
+        assert data["last_term"] == "115000004"
+        assert data["rates"]["0.05"]["number"]["01"] == pytest.approx(
+            sum(0.95122942450071400 ** k for k in range(5)), rel=1e-9
+        )
+
+    def test_current_prediction_and_accuracy(self):
+        from analysis.prediction_tracker import run_prediction_cycle
+        _seed(20)
+        assert client.get("/api/predictions/current?prediction_type=basic&period_range=30").status_code == 404
+        db = TestSession()
+        run_prediction_cycle(db)
+        db.close()
+        r = client.get("/api/predictions/current?prediction_type=basic&period_range=30")
+        assert r.status_code == 200
+        assert r.json()["target_term"] == "115000020"
+        assert client.get("/api/predictions/accuracy").json() == []
+
+    def test_long_range_from_daily_aggregates(self):
+        from analysis.daily_stats import refresh_daily_stats
+        _seed(10)
+        db = TestSession()
+        refresh_daily_stats(db)
+        db.close()
+        data = client.get("/api/predictions/long-range?days=7").json()
+        assert (data["days"], data["draws"], data["to_date"]) == (1, 10, "2026-01-09")
+        assert data["high_low"]["大"] == 10
+        r = client.get("/api/predictions/long-range?from_date=2026-01-10&to_date=2026-01-01")
+        assert r.status_code == 400
+
     def test_super_number(self):
         _seed(10)
         r = client.get("/api/predictions/super-number?period_range=10")
@@ -173,3 +294,178 @@ class TestStatusAPI:
         r = client.get("/api/status/last-updated")
         assert r.status_code == 200
         assert r.json()["last_updated"] is not None
+
+
+# ─── Simulation ───────────────────────────────────────────────
+
+
+SESSION = {"X-Session-Id": "test-session"}
+
+
+class TestSimulationAPI:
+    def test_place_bet_multi_period(self):
+        _seed(1)
+        r = client.post("/api/simulation/bet", headers=SESSION, json={
+            "bet_type": "basic", "star_level": 3, "selected_numbers": ["01", "02", "03"], "bet_periods": 3,
+        })
+        assert r.status_code == 200
+        bets = r.json()
+        assert [b["target_draw_term"] for b in bets] == ["115000001", "115000002", "115000003"]
+        assert all(b["id"] and b["status"] == "pending" and b["created_at"] for b in bets)
+
+    def test_bulk_insert(self):
+        _seed(1)
+        specs = [
+            {"bet_type": "basic", "star_level": 2, "selected_numbers": [f"{i % 80 + 1:02d}", "80"]}
+            for i in range(1500)
+        ] + [{"bet_type": "high_low", "selected_option": "大", "multiplier": 2, "bet_periods": 2}]
+        r = client.post("/api/simulation/bets/bulk", headers=SESSION, json={"bets": specs})
+        assert r.status_code == 200
+        body = r.json()
+        assert body["count"] == 1502
+        assert len(set(body["ids"])) == 1502
+        assert body["ids"] == sorted(body["ids"])
+        assert body["total_cost"] == 1500 * 25 + 2 * 50
+        assert client.get("/api/simulation/bets?limit=1", headers=SESSION).json()["total"] == 1502
+
+    def test_bulk_validation_is_all_or_nothing(self):
+        _seed(1)
+        specs = [
+            {"bet_type": "super", "selected_numbers": ["07"]},
+            {"bet_type": "basic", "star_level": 2, "selected_numbers": ["01"]},
+            {"bet_type": "super", "selected_numbers": ["99"]},
+        ]
+        r = client.post("/api/simulation/bets/bulk", headers=SESSION, json={"bets": specs})
+        assert r.status_code == 400
+        assert [e["index"] for e in r.json()["detail"]["errors"]] == [1, 2]
+        assert client.get("/api/simulation/bets", headers=SESSION).json()["total"] == 0
+
+    def test_bulk_requires_bets(self):
+        r = client.post("/api/simulation/bets/bulk", headers=SESSION, json={"bets": []})
+        assert r.status_code == 422
+
+    def test_auto_bet_subscription_lifecycle(self):
+        _seed(20)
+        r = client.post("/api/simulation/auto-bets", headers=SESSION, json={
+            "strategy": "smart_pick", "star_level": 3, "combo_count": 2, "multiplier": 2, "draws": 50,
+        })
+        assert r.status_code == 200
+        sub = r.json()
+        assert sub["status"] == "active" and sub["draws_done"] == 0
+
+        from analysis.auto_bet import run_auto_bets
+        db = TestSession()
+        try:
+            assert run_auto_bets(db)["bets"] == 2
+        finally:
+            db.close()
+        listed = client.get("/api/simulation/auto-bets", headers=SESSION).json()
+        assert listed[0]["draws_done"] == 1 and listed[0]["last_term"] == "115000020"
+        assert client.get("/api/simulation/bets", headers=SESSION).json()["total"] == 2
+
+        assert client.delete(f"/api/simulation/auto-bets/{sub['id']}", headers=SESSION).json()["status"] == "cancelled"
+        assert client.delete(f"/api/simulation/auto-bets/{sub['id']}", headers=SESSION).status_code == 400
+
+    def test_auto_bet_requires_star_level(self):
+        r = client.post("/api/simulation/auto-bets", headers=SESSION, json={"strategy": "smart_pick", "draws": 5})
+        assert r.status_code == 400
+
+    def test_stats_include_archived_bets(self):
+        from app.models.archived_bet import BetDailySummary
+        db = TestSession()
+        db.add(BetDailySummary(session_id="test-session", day=date(2025, 1, 1), bets=4, wins=1,
+                               total_cost=100, total_prize=200))
+        db.commit()
+        db.close()
+        stats = client.get("/api/simulation/stats", headers=SESSION).json()
+        assert (stats["total_bets"], stats["wins"], stats["net_profit"]) == (4, 1, 100)
+
+
+class TestPredictionCoalescing:
+    def test_concurrent_smart_pick_requests_share_one_computation(self, monkeypatch):
+        import threading
+        import time
+        from analysis.smart_pick_engine import SmartPickEngine
+
+        _seed(10)
+        calls = []
+        original = SmartPickEngine.pick
+
+        def slow_pick(self, *args, **kwargs):
+            calls.append(1)
+            time.sleep(0.5)
+            return original(self, *args, **kwargs)
+
+        monkeypatch.setattr(SmartPickEngine, "pick", slow_pick)
+        responses = []
+        threads = [
+            threading.Thread(target=lambda: responses.append(client.get("/api/predictions/smart-pick?period_range=10")))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert [r.status_code for r in responses] == [200] * 5
+        assert len({r.text for r in responses}) == 1
+        assert len(calls) == 1
+
+
+class TestPrecomputedResponses:
+    def _store(self, key, term, body):
+        from app.models.precomputed_response import PrecomputedResponse
+        db = TestSession()
+        db.add(PrecomputedResponse(request_key=key, latest_term=term, body=body))
+        db.commit()
+        db.close()
+
+    def test_standard_request_served_from_store(self):
+        _seed(10)
+        self._store("high-low?period_range=10", "115000009", b'{"prebuilt":true}')
+        r = client.get("/api/predictions/high-low?period_range=10")
+        assert r.status_code == 200
+        assert r.content == b'{"prebuilt":true}'
+        assert r.headers["content-type"] == "application/json"
+
+    def test_non_standard_request_computed_live(self):
+        _seed(10)
+        self._store("high-low?period_range=10", "115000009", b'{"prebuilt":true}')
+        r = client.get("/api/predictions/high-low?period_range=7")
+        assert "prebuilt" not in r.json()
+        assert r.json()["prediction"] in ("大", "小", None)
+
+    def test_stale_term_ignored(self):
+        _seed(10)
+        self._store("high-low?period_range=10", "115000008", b'{"prebuilt":true}')
+        assert "prebuilt" not in client.get("/api/predictions/high-low?period_range=10").json()
+
+    def test_precomputed_body_matches_live_response(self):
+        from app.precomputed import precompute_responses
+        _seed(20)
+        live = client.get("/api/predictions/super-number?period_range=10&top_n=10").content
+        db = TestSession()
+        try:
+            precompute_responses(db, processes=0)
+        finally:
+            db.close()
+        assert client.get("/api/predictions/super-number?period_range=10&top_n=10").content == live
+
+
+class TestAnalysisOffload:
+    def test_saturated_analysis_pool_returns_503(self, monkeypatch):
+        from analysis import offload
+        _seed(10)
+        pool = offload.AnalysisPool(processes=1, max_pending=0)
+        monkeypatch.setattr(offload, "get_analysis_pool", lambda: pool)
+        r = client.get("/api/predictions/co-occurrence?period_range=7")
+        assert r.status_code == 503
+        assert r.headers["retry-after"] == "1"
+
+    def test_smart_pick_and_all_use_the_pool(self, monkeypatch):
+        from analysis import offload
+        _seed(10)
+        pool = offload.AnalysisPool(processes=1, max_pending=0)
+        monkeypatch.setattr(offload, "get_analysis_pool", lambda: pool)
+        for path in ("smart-pick?period_range=8", "all?period_range=8"):
+            r = client.get(f"/api/predictions/{path}")
+            assert r.status_code == 503, path
@@ -0,0 +1,75 @@
+from sqlalchemy import insert
+
+from app.models.auto_bet_subscription import AutoBetSubscription
+from app.models.draw_result import DrawResult
+from app.models.simulated_bet import SimulatedBet
+from analysis import auto_bet
+from analysis.auto_bet import run_auto_bets
+from benchmarks.synthetic import generate_draw_rows
+
+
+def _insert(db, rows):
+    db.execute(insert(DrawResult.__table__), rows)
+    db.commit()
+
+
+def _subscribe(db, session_id, strategy="smart_pick", **kw):
+    params = {"period_range": 30, "star_level": 3 if strategy == "smart_pick" else None, "combo_count": 1,
+              "multiplier": 1, "draws_total": 2}
+    params.update(kw)
+    sub = AutoBetSubscription(session_id=session_id, strategy=strategy, draws_done=0, status="active", **params)
+    db.add(sub)
+    db.commit()
+    return sub
+
+
+class TestRunAutoBets:
+    def test_places_bets_for_next_term(self, db_session):
+        rows = list(generate_draw_rows(60))
+        _insert(db_session, rows)
+        sub = _subscribe(db_session, "a", combo_count=3, multiplier=2)
+        _subscribe(db_session, "b", strategy="high_low")
+
+        stats = run_auto_bets(db_session)
+        assert stats == {"subscriptions": 2, "groups": 2, "bets": 4}
+        target = str(int(rows[-1]["draw_term"]) + 1)
+        bets = db_session.query(SimulatedBet).order_by(SimulatedBet.id).all()
+        assert {b.target_draw_term for b in bets} == {target}
+        basic = [b for b in bets if b.session_id == "a"]
+        assert len(basic) == 3
+        assert all(b.bet_type == "basic" and b.star_level == 3 and b.multiplier == 2 for b in basic)
+        assert len({b.selected_numbers for b in basic}) == 3
+        assert [b.selected_option for b in bets if b.session_id == "b"][0] in ("大", "小")
+        assert sub.draws_done == 1 and sub.last_term == target
+
+    def test_same_term_not_repeated(self, db_session):
+        _insert(db_session, list(generate_draw_rows(40)))
+        _subscribe(db_session, "a")
+        run_auto_bets(db_session)
+        assert run_auto_bets(db_session)["bets"] == 0
+        assert db_session.query(SimulatedBet).count() == 1
+
+    def test_picks_computed_once_per_parameter_set(self, db_session, monkeypatch):
+        _insert(db_session, list(generate_draw_rows(40)))
+        for i in range(10):
+            _subscribe(db_session, f"s{i}")
+        _subscribe(db_session, "other", star_level=2)
+        calls = []
+        original = auto_bet._compute_picks
+        monkeypatch.setattr(auto_bet, "_compute_picks", lambda db, key: calls.append(key) or original(db, key))
+
+        stats = run_auto_bets(db_session)
+        assert sorted(calls) == [("smart_pick", 30, 2), ("smart_pick", 30, 3)]
+        assert stats["subscriptions"] == 11 and stats["bets"] == 11
+
+    def test_finishes_after_draws_total(self, db_session):
+        rows = list(generate_draw_rows(42))
+        _insert(db_session, rows[:40])
+        sub = _subscribe(db_session, "a", strategy="odd_even", draws_total=2)
+        run_auto_bets(db_session)
+        _insert(db_session, rows[40:41])
+        run_auto_bets(db_session)
+        assert sub.status == "finished" and sub.draws_done == 2
+        _insert(db_session, rows[41:])
+        assert run_auto_bets(db_session)["bets"] == 0
+        assert db_session.query(SimulatedBet).count() == 2
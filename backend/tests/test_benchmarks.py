@@ -0,0 +1,53 @@
+from unittest.mock import MagicMock
+
+from app.models.draw_result import DrawResult
+from app.models.simulated_bet import SimulatedBet
+from analysis.bet_settler import auto_settle_all
+from benchmarks.run import compare
+from benchmarks.synthetic import (
+    DRAWS_PER_DAY,
+    generate_api_draws,
+    generate_draw_rows,
+    seed_draws,
+    seed_pending_bets,
+)
+from crawler.bingo_crawler import BingoCrawler
+
+
+class TestSyntheticHistory:
+    def test_deterministic(self):
+        assert list(generate_draw_rows(50, seed=1)) == list(generate_draw_rows(50, seed=1))
+        assert list(generate_draw_rows(50, seed=1)) != list(generate_draw_rows(50, seed=2))
+
+    def test_api_payload_passes_crawler_validation(self):
+        crawler = BingoCrawler(db_session=MagicMock())
+        for entry in generate_api_draws(20):
+            assert crawler._validate(entry["data"]) is True
+
+    def test_rows_match_crawler_parsing(self):
+        crawler = BingoCrawler(db_session=MagicMock())
+        entries = list(generate_api_draws(DRAWS_PER_DAY + 3))
+        rows = list(generate_draw_rows(DRAWS_PER_DAY + 3))
+        for entry, row in zip(entries[-5:], rows[-5:]):
+            parsed = crawler._parse_draw_data(
+                entry["data"], entry["query_date"], entry["first_term"]
+            )
+            assert parsed == row
+
+    def test_seed_draws_and_bets(self, db_session):
+        assert seed_draws(db_session, 120) == 120
+        assert db_session.query(DrawResult).count() == 120
+        latest = db_session.query(DrawResult).order_by(DrawResult.draw_term.desc()).first()
+        seed_pending_bets(db_session, 40, latest.draw_term)
+        assert auto_settle_all(db_session, latest) == 40
+        assert db_session.query(SimulatedBet).filter_by(status="pending").count() == 0
+
+
+class TestBaselineCompare:
+    def test_flags_only_slower_beyond_threshold(self):
+        baseline = {"a": {"median_s": 1.0}, "b": {"median_s": 1.0}, "c": {"median_s": 1.0}}
+        current = {"a": {"median_s": 1.1}, "b": {"median_s": 1.5}, "c": {"median_s": 0.5},
+                   "new": {"median_s": 9.9}}
+        regressions = compare(current, baseline, threshold=0.2)
+        assert [r["case"] for r in regressions] == ["b"]
+        assert regressions[0]["ratio"] == 1.5
@@ -0,0 +1,193 @@
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import delete, insert, select
+
+from app.config import settings
+from app.models.draw_result import DrawResult
+from benchmarks.fake_tlc_server import FakeTLCConfig, FakeTLCServer
+from analysis.hot_scores import KINDS, HotScores
+from analysis.number_index import NumberIndex
+from analysis.trend_series import TrendSeries
+from benchmarks.synthetic import generate_draw_rows, seed_draws
+from crawler.bingo_crawler import BingoCrawler
+from storage.binary_store import RECORD_SIZE, HEADER_SIZE, DrawStore, open_matching_view, sync_from_db
+
+ATTRS = [
+    "draw_term", "draw_datetime", "numbers_sorted", "numbers_sequence", "super_number",
+    "high_low_result", "odd_even_result", "high_count", "low_count", "odd_count", "even_count",
+]
+
+
+def _db_draws(db):
+    return db.execute(select(DrawResult).order_by(DrawResult.draw_term)).scalars().all()
+
+
+class TestDrawStore:
+    def test_sync_round_trip(self, db_session, tmp_path):
+        seed_draws(db_session, 250)
+        store = DrawStore(str(tmp_path / "draws.bin"))
+        assert sync_from_db(db_session, store, batch_size=64) == 250
+        assert (tmp_path / "draws.bin").stat().st_size == HEADER_SIZE + 250 * RECORD_SIZE
+
+        with store.open() as view:
+            assert len(view) == 250
+            for draw, stored in zip(_db_draws(db_session), view.iter_draws()):
+                for attr in ATTRS:
+                    assert getattr(stored, attr) == getattr(draw, attr), attr
+                assert stored.get_numbers_list() == draw.get_numbers_list()
+
+    def test_append_skips_existing_terms(self, db_session, tmp_path):
+        seed_draws(db_session, 20)
+        store = DrawStore(str(tmp_path / "draws.bin"))
+        draws = _db_draws(db_session)
+        assert store.append(draws[:10]) == 10
+        assert store.append(draws) == 10
+        assert store.append(draws) == 0
+        assert store.last_term() == int(draws[-1].draw_term)
+
+    def test_view_refresh_sees_appends(self, db_session, tmp_path):
+        seed_draws(db_session, 30)
+        store = DrawStore(str(tmp_path / "draws.bin"))
+        draws = _db_draws(db_session)
+        store.append(draws[:10])
+        with store.open() as view:
+            assert len(view) == 10
+            store.append(draws[10:])
+            assert len(view) == 10
+            assert view.refresh() == 30
+            assert view[-1].draw_term == draws[-1].draw_term
+
+    def test_torn_tail_is_dropped(self, db_session, tmp_path):
+        seed_draws(db_session, 5)
+        path = tmp_path / "draws.bin"
+        store = DrawStore(str(path))
+        draws = _db_draws(db_session)
+        store.append(draws[:3])
+        with open(path, "ab") as f:
+            f.write(b"\x01" * (RECORD_SIZE // 2))
+        with store.open() as view:
+            assert len(view) == 3
+        assert store.append(draws) == 2
+        assert path.stat().st_size == HEADER_SIZE + 5 * RECORD_SIZE
+
+    def test_find_and_latest(self, db_session, tmp_path):
+        seed_draws(db_session, 40)
+        store = DrawStore(str(tmp_path / "draws.bin"))
+        sync_from_db(db_session, store)
+        draws = _db_draws(db_session)
+        with store.open() as view:
+            assert view.find(int(draws[17].draw_term)) == 17
+            assert view.find(1) == -1
+            latest = view.latest(5)
+            assert [d.draw_term for d in latest] == [d.draw_term for d in reversed(draws[-5:])]
+            assert bytes(view.numbers(0)) == bytes(int(n) for n in draws[0].get_sequence_list())
+
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"NOTADRAWSTORE###" + b"\0" * RECORD_SIZE)
+        with pytest.raises(ValueError):
+            DrawStore(str(path)).open()
+
+    def test_rejects_truncated_header(self, db_session, tmp_path):
+        path = tmp_path / "draws.bin"
+        path.write_bytes(b"BNGO")
+        with pytest.raises(ValueError):
+            DrawStore(str(path)).open()
+        assert open_matching_view(db_session, str(path)) is None
+
+    def test_as_numpy_zero_copy(self, db_session, tmp_path):
+        np = pytest.importorskip("numpy")
+        seed_draws(db_session, 12)
+        store = DrawStore(str(tmp_path / "draws.bin"))
+        sync_from_db(db_session, store)
+        draws = _db_draws(db_session)
+        with store.open() as view:
+            arr = view.as_numpy()
+            assert arr.shape == (12,)
+            assert not arr.flags.owndata
+            assert arr["term"][-1] == int(draws[-1].draw_term)
+            assert list(np.sort(arr["numbers"][0])) == [int(n) for n in draws[0].get_numbers_list()]
+            del arr
+
+
+class TestCrawlerHook:
+    def test_crawler_appends_new_draws(self, db_session, tmp_path):
+        path = tmp_path / "draws.bin"
+        config = FakeTLCConfig(days=1, draws_on_end_date=30)
+        with FakeTLCServer(config) as server, patch.object(settings, "DRAW_STORE_PATH", str(path)):
+            stats = BingoCrawler(db_session, base_url=server.base_url).run()
+            assert stats["inserted"] == 30
+            BingoCrawler(db_session, base_url=server.base_url).run()
+
+        with DrawStore(str(path)).open() as view:
+            assert len(view) == 30
+            assert [view.term(i) for i in range(30)] == sorted(view.term(i) for i in range(30))
+
+
+class TestIndexBootstrap:
+    @pytest.fixture
+    def store_then_tail(self, db_session, tmp_path):
+        """80 draws in the history file, 40 newer ones only in the DB."""
+        rows = list(generate_draw_rows(120))
+        db_session.execute(insert(DrawResult.__table__), rows[:80])
+        db_session.commit()
+        path = str(tmp_path / "draws.bin")
+        sync_from_db(db_session, DrawStore(path))
+        db_session.execute(insert(DrawResult.__table__), rows[80:])
+        db_session.commit()
+        return path
+
+    def test_number_index_reads_only_the_tail_from_sql(self, db_session, store_then_tail):
+        calls = {"stored": 0, "sql": 0}
+
+        class Counting(NumberIndex):
+            def _append_stored(self, draw):
+                calls["stored"] += 1
+                super()._append_stored(draw)
+
+            def _append_row(self, row):
+                calls["sql"] += 1
+                super()._append_row(row)
+
+        with patch.object(settings, "DRAW_STORE_PATH", store_then_tail):
+            booted = Counting()
+            assert booted.sync(db_session) == 120
+        assert calls == {"stored": 80, "sql": 40}
+
+        reference = NumberIndex()
+        reference.sync(db_session)
+        assert booted.terms == reference.terms
+        assert booted.positions == reference.positions
+        assert booted.prefix == reference.prefix
+        assert booted.sync(db_session) == 0
+
+    def test_trend_series_matches_sql_build(self, db_session, store_then_tail):
+        with patch.object(settings, "DRAW_STORE_PATH", store_then_tail):
+            booted = TrendSeries("high_low")
+            booted.sync(db_session)
+        reference = TrendSeries("high_low")
+        reference.sync(db_session)
+        assert booted.run_codes == reference.run_codes
+        assert booted.run_starts == reference.run_starts
+        assert booted.label_prefix == reference.label_prefix
+        assert booted.count_prefix == reference.count_prefix
+
+    def test_hot_scores_match_sql_build(self, db_session, store_then_tail):
+        with patch.object(settings, "DRAW_STORE_PATH", store_then_tail):
+            booted = HotScores()
+            assert booted.sync(db_session) == 120
+        reference = HotScores()
+        reference.sync(db_session)
+        assert booted.last_term == reference.last_term
+        assert booted.draws_seen == 120
+        for kind in KINDS:
+            assert booted.scores(0.05, kind) == pytest.approx(reference.scores(0.05, kind), rel=1e-12)
+
+    def test_mismatched_file_falls_back_to_sql(self, db_session, store_then_tail):
+        db_session.execute(delete(DrawResult.__table__).where(DrawResult.__table__.c.id == 5))
+        db_session.commit()
+        with patch.object(settings, "DRAW_STORE_PATH", store_then_tail):
+            assert open_matching_view(db_session) is None
+            index = NumberIndex()
+            assert index.sync(db_session) == 119
@@ -0,0 +1,77 @@
+import io
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.draw_number import DrawNumber
+from app.models.draw_result import DrawResult
+from benchmarks.synthetic import seed_draws
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from storage.columnar import (  # noqa: E402
+    export_parquet,
+    import_parquet,
+    numbers_bitmask,
+    stream_arrow,
+    stream_parquet,
+)
+
+COLUMNS = [c for c in DrawResult.__table__.columns.keys() if c not in ("id", "created_at")]
+
+
+def _rows(db):
+    table = DrawResult.__table__
+    stmt = select(*[table.c[c] for c in COLUMNS]).order_by(table.c.draw_term)
+    return [tuple(r) for r in db.execute(stmt).all()]
+
+
+@pytest.fixture
+def fresh_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+class TestParquetRoundTrip:
+    def test_export_then_import(self, db_session, fresh_session, tmp_path):
+        seed_draws(db_session, 450)
+        path = tmp_path / "draws.parquet"
+        assert export_parquet(db_session, str(path), batch_size=100) == 450
+
+        stats = import_parquet(fresh_session, str(path), batch_size=128)
+        assert stats == {"read": 450, "inserted": 450, "skipped": 0}
+        assert _rows(fresh_session) == _rows(db_session)
+        assert fresh_session.query(DrawNumber).count() == 450 * 20
+
+    def test_reimport_skips_existing(self, db_session, tmp_path):
+        seed_draws(db_session, 50)
+        path = tmp_path / "draws.parquet"
+        export_parquet(db_session, str(path))
+        stats = import_parquet(db_session, str(path))
+        assert stats["inserted"] == 0
+        assert stats["skipped"] == 50
+
+    def test_fixed_width_columns_and_bitmask(self, db_session, tmp_path):
+        seed_draws(db_session, 3)
+        path = tmp_path / "draws.parquet"
+        export_parquet(db_session, str(path))
+        table = pq.read_table(str(path))
+        assert table.schema.field("numbers_sorted").type == pa.list_(pa.uint8(), 20)
+        first = table.slice(0, 1).to_pylist()[0]
+        assert first["numbers_bitmask"] == numbers_bitmask(first["numbers_sorted"])
+        mask = int.from_bytes(first["numbers_bitmask"], "little")
+        assert bin(mask).count("1") == 20
+
+    def test_streams_are_readable(self, db_session):
+        seed_draws(db_session, 250)
+        parquet_bytes = b"".join(stream_parquet(db_session, batch_size=100))
+        assert pq.read_table(io.BytesIO(parquet_bytes)).num_rows == 250
+        arrow_bytes = b"".join(stream_arrow(db_session, batch_size=100))
+        assert pa.ipc.open_stream(arrow_bytes).read_all().num_rows == 250
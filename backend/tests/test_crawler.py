@@ -133,6 +133,16 @@ class TestParseAndSave:
         assert result == "inserted"
         assert db_session.query(DrawResult).count() == 1
 
+    def test_insert_writes_number_rows(self, db_session):
+        from app.models.draw_number import DrawNumber
+        crawler = BingoCrawler(db_session=db_session)
+        crawler.parse_and_save(VALID_DRAW, self.QUERY_DATE, self.FIRST_TERM)
+        crawler.parse_and_save(VALID_DRAW, self.QUERY_DATE, self.FIRST_TERM)
+        rows = db_session.query(DrawNumber).order_by(DrawNumber.draw_position).all()
+        assert [f"{r.number:02d}" for r in rows] == VALID_DRAW["openShowOrder"]
+        assert [r.number for r in rows if r.is_super] == [44]
+        assert {r.term_number for r in rows} == {115009534}
+
     def test_skip_duplicate(self, db_session):
         crawler = BingoCrawler(db_session=db_session)
         crawler.parse_and_save(VALID_DRAW, self.QUERY_DATE, self.FIRST_TERM)
@@ -0,0 +1,85 @@
+from collections import Counter
+from datetime import date, timedelta
+
+from sqlalchemy import insert
+
+from analysis.daily_stats import refresh_daily_stats, window_stats
+from app.models.daily_draw_stats import DailyDrawStats
+from app.models.draw_result import DrawResult
+from benchmarks.synthetic import generate_draw_rows, seed_draws
+
+
+def _raw_counts(db, days):
+    draws = db.query(DrawResult).filter(DrawResult.draw_date.in_(days)).all()
+    numbers = Counter(int(n) for d in draws for n in d.get_numbers_list())
+    return draws, numbers
+
+
+class TestRefreshDailyStats:
+    def test_first_refresh_builds_one_row_per_day(self, db_session):
+        seed_draws(db_session, 450)  # 203 + 203 + 44
+        assert refresh_daily_stats(db_session) == 3
+        rows = db_session.query(DailyDrawStats).order_by(DailyDrawStats.day).all()
+        assert [r.draws for r in rows] == [203, 203, 44]
+        assert rows[0].first_term == "113000001" and rows[-1].last_term == "113000450"
+        assert refresh_daily_stats(db_session) == 0
+
+    def test_incremental_refresh_only_touches_new_days(self, db_session):
+        rows = list(generate_draw_rows(450))
+        db_session.execute(insert(DrawResult.__table__), rows[:300])
+        db_session.commit()
+        refresh_daily_stats(db_session)
+        db_session.execute(insert(DrawResult.__table__), rows[300:])
+        db_session.commit()
+
+        assert refresh_daily_stats(db_session) == 2  # the partial day 2 and the new day 3
+        assert [r.draws for r in db_session.query(DailyDrawStats).order_by(DailyDrawStats.day)] == [203, 203, 44]
+
+    def test_full_refresh_repairs_backfilled_days(self, db_session):
+        seed_draws(db_session, 450)
+        refresh_daily_stats(db_session)
+        db_session.query(DailyDrawStats).filter(DailyDrawStats.day == date(2024, 1, 1)).update({"draws": 1})
+        db_session.commit()
+        assert refresh_daily_stats(db_session, full=True) == 1
+        assert db_session.get(DailyDrawStats, date(2024, 1, 1)).draws == 203
+
+    def test_days_follow_draw_date_not_draw_datetime(self, db_session):
+        # draw_datetime is derived and may not fall on draw_date; dirty days are keyed on draw_date
+        rows = [dict(r, draw_datetime=r["draw_datetime"] - timedelta(hours=12)) for r in generate_draw_rows(450)]
+        db_session.execute(insert(DrawResult.__table__), rows)
+        db_session.commit()
+        assert refresh_daily_stats(db_session) == 3
+        assert [r.draws for r in db_session.query(DailyDrawStats).order_by(DailyDrawStats.day)] == [203, 203, 44]
+        assert refresh_daily_stats(db_session, full=True) == 0
+
+
+class TestWindowStats:
+    def test_matches_raw_draws(self, db_session):
+        seed_draws(db_session, 609)  # three full days
+        refresh_daily_stats(db_session)
+        result = window_stats(db_session, days=2)
+
+        draws, numbers = _raw_counts(db_session, [date(2024, 1, 2), date(2024, 1, 3)])
+        assert (result["from_date"], result["to_date"]) == ("2024-01-02", "2024-01-03")
+        assert result["draws"] == len(draws) == 406
+        assert {int(n["number"]): n["count"] for n in result["numbers"]} == {n: numbers[n] for n in range(1, 81)}
+        assert result["high_low"]["大"] == sum(d.high_low_result == "大" for d in draws)
+        assert result["odd_even"]["雙"] == sum(d.odd_even_result == "雙" for d in draws)
+        assert sum(z["total_count"] for z in result["zones"].values()) == 406 * 20
+        assert sum(result["tails"].values()) == 406 * 20
+        assert sum(s["count"] for s in window_stats(db_session, days=2, top_n=80)["super_numbers"]) == 406
+
+        top_pair = result["consecutive_pairs"][0]
+        a, b = (int(n) for n in top_pair["pair"])
+        assert top_pair["count"] == sum(
+            1 for d in draws if {a, b} <= {int(n) for n in d.get_numbers_list()}
+        )
+
+    def test_custom_date_range_and_empty_window(self, db_session):
+        seed_draws(db_session, 609)
+        refresh_daily_stats(db_session)
+        result = window_stats(db_session, from_date=date(2024, 1, 1), to_date=date(2024, 1, 1))
+        assert (result["days"], result["draws"]) == (1, 203)
+
+        empty = window_stats(db_session, from_date=date(2025, 1, 1), to_date=date(2025, 1, 31))
+        assert empty["draws"] == 0 and "numbers" not in empty
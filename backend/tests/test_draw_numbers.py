@@ -0,0 +1,121 @@
+from collections import Counter
+from itertools import combinations
+
+from sqlalchemy import insert
+
+from analysis.draw_numbers import (
+    backfill_draw_numbers,
+    number_frequency,
+    pair_counts,
+    super_frequency,
+    tail_counts,
+    window_start,
+    zone_counts,
+)
+from app.models.draw_number import DrawNumber
+from app.models.draw_result import DrawResult
+from benchmarks.synthetic import generate_draw_rows, seed_draws
+
+
+def _recent(db, n):
+    return db.query(DrawResult).order_by(DrawResult.draw_term.desc()).limit(n).all()
+
+
+class TestBackfill:
+    def test_fills_missing_draws_in_batches(self, db_session):
+        seed_draws(db_session, 250)
+        assert backfill_draw_numbers(db_session, batch_size=100) == 250
+        assert db_session.query(DrawNumber).count() == 250 * 20
+        assert db_session.query(DrawNumber).filter(DrawNumber.is_super.is_(True)).count() == 250
+        assert backfill_draw_numbers(db_session) == 0
+
+    def test_skips_draws_already_written_on_ingest(self, db_session):
+        from analysis.draw_numbers import insert_number_rows
+        rows = list(generate_draw_rows(30))
+        db_session.execute(insert(DrawResult.__table__), rows)
+        insert_number_rows(db_session, rows[-5:])  # newest draws arrived through the crawler
+        db_session.commit()
+        assert backfill_draw_numbers(db_session, batch_size=10) == 25
+        assert db_session.query(DrawNumber).count() == 30 * 20
+
+
+class TestPushdownQueries:
+    def _seed(self, db, n=300):
+        seed_draws(db, n)
+        backfill_draw_numbers(db)
+
+    def test_window_start(self, db_session):
+        assert window_start(db_session, 30) is None
+        self._seed(db_session, 50)
+        assert window_start(db_session, 30) == 113000021
+        assert window_start(db_session, 500) == 113000001
+
+    def test_counts_match_raw_draws(self, db_session):
+        self._seed(db_session)
+        draws = _recent(db_session, 100)
+        numbers = Counter(int(n) for d in draws for n in d.get_numbers_list())
+
+        assert number_frequency(db_session, 100) == {f"{n:02d}": numbers[n] for n in range(1, 81)}
+        supers = Counter(int(d.super_number) for d in draws)
+        assert super_frequency(db_session, 100) == {f"{n:02d}": supers[n] for n in range(1, 81)}
+        assert tail_counts(db_session, 100) == {str(t): sum(c for n, c in numbers.items() if n % 10 == t) for t in range(10)}
+        zones = zone_counts(db_session, 100)
+        assert zones["A"] == sum(c for n, c in numbers.items() if n <= 20)
+        assert sum(zones.values()) == 100 * 20
+
+    def test_pair_counts_match_raw_draws(self, db_session):
+        self._seed(db_session)
+        draws = _recent(db_session, 50)
+        pairs = Counter(p for d in draws for p in combinations(sorted(int(n) for n in d.get_numbers_list()), 2))
+
+        top = pair_counts(db_session, 50, top_n=5)
+        assert [p["count"] for p in top] == [c for _, c in pairs.most_common(5)]
+        for p in top:
+            assert pairs[tuple(int(n) for n in p["pair"])] == p["count"]
+
+        consecutive = pair_counts(db_session, 50, top_n=3, consecutive=True)
+        for p in consecutive:
+            a, b = (int(n) for n in p["pair"])
+            assert b == a + 1 and pairs[(a, b)] == p["count"]
+
+
+class TestAnalyzerPushdown:
+    """ANALYTICS_SQL_PUSHDOWN returns exactly what the per-draw analyzers return."""
+
+    def _both(self, db, monkeypatch, fn):
+        from app.config import settings
+
+        monkeypatch.setattr(settings, "ANALYTICS_SQL_PUSHDOWN", False)
+        expected = fn(db)
+        monkeypatch.setattr(settings, "ANALYTICS_SQL_PUSHDOWN", True)
+        return expected, fn(db)
+
+    def test_analyzers_match(self, db_session, monkeypatch):
+        from analysis.basic_analyzer import BasicAnalyzer
+        from analysis.co_occurrence_analyzer import CoOccurrenceAnalyzer
+        from analysis.super_number_analyzer import SuperNumberAnalyzer
+        from analysis.tail_number_analyzer import TailNumberAnalyzer
+        from analysis.zone_distribution_analyzer import ZoneDistributionAnalyzer
+
+        seed_draws(db_session, 300)
+        backfill_draw_numbers(db_session)
+        cases = {
+            "basic": lambda db, p: BasicAnalyzer(db).analyze(p, top_n=20),
+            "basic_simple": lambda db, p: BasicAnalyzer(db).analyze(p, top_n=20, use_weighted=False),
+            "super": lambda db, p: SuperNumberAnalyzer(db).analyze(p, top_n=10),
+            "tail": lambda db, p: TailNumberAnalyzer(db).analyze(p),
+            "zone": lambda db, p: ZoneDistributionAnalyzer(db).analyze(p),
+            "co": lambda db, p: CoOccurrenceAnalyzer(db).analyze(p, top_n=20, target_number="7"),
+        }
+        for name, fn in cases.items():
+            for period in (1, 30, 500):
+                expected, pushed = self._both(db_session, monkeypatch, lambda db: fn(db, period))
+                assert pushed == expected, (name, period)
+
+    def test_empty_history(self, db_session, monkeypatch):
+        from analysis.co_occurrence_analyzer import CoOccurrenceAnalyzer
+        from analysis.zone_distribution_analyzer import ZoneDistributionAnalyzer
+
+        for fn in (lambda db: CoOccurrenceAnalyzer(db).analyze(30), lambda db: ZoneDistributionAnalyzer(db).analyze(30)):
+            expected, pushed = self._both(db_session, monkeypatch, fn)
+            assert pushed == expected
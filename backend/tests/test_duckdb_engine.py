@@ -0,0 +1,72 @@
+import pytest
+
+pytest.importorskip("duckdb")
+pytest.importorskip("pyarrow")
+
+from analysis.co_occurrence_analyzer import CoOccurrenceAnalyzer  # noqa: E402
+from analysis.cold_hot_cycle_analyzer import ColdHotCycleAnalyzer  # noqa: E402
+from analysis.duckdb_engine import DuckDBEngine  # noqa: E402
+from benchmarks.synthetic import generate_draw_rows, seed_draws  # noqa: E402
+from storage.columnar import export_parquet  # noqa: E402
+
+
+@pytest.fixture
+def engine(db_session):
+    seed_draws(db_session, 600)
+    eng = DuckDBEngine.from_session(db_session)
+    yield eng
+    eng.close()
+
+
+class TestParity:
+    @pytest.mark.parametrize("period_range", [5, 30, 500])
+    def test_co_occurrence(self, db_session, engine, period_range):
+        for target in (None, "07"):
+            assert engine.co_occurrence(period_range, 15, target) == \
+                CoOccurrenceAnalyzer(db_session).analyze(period_range, 15, target)
+
+    @pytest.mark.parametrize("period_range", [10, 100, 500])
+    def test_cold_hot_cycle(self, db_session, engine, period_range):
+        assert engine.cold_hot_cycle(period_range, 10, 10) == \
+            ColdHotCycleAnalyzer(db_session).analyze(period_range, 10, 10)
+
+    def test_empty_history(self, db_session):
+        eng = DuckDBEngine.from_session(db_session)
+        assert eng.co_occurrence(30) == CoOccurrenceAnalyzer(db_session).analyze(30)
+        assert eng.cold_hot_cycle(100) == ColdHotCycleAnalyzer(db_session).analyze(100)
+
+    def test_parquet_source(self, db_session, tmp_path):
+        seed_draws(db_session, 300)
+        path = str(tmp_path / "draws.parquet")
+        export_parquet(db_session, path)
+        eng = DuckDBEngine(path)
+        assert eng.co_occurrence(100) == CoOccurrenceAnalyzer(db_session).analyze(100)
+
+
+class TestLongRange:
+    def test_gap_distribution_counts_every_repeat(self, engine):
+        rows = list(generate_draw_rows(600))
+        appearances = sum(1 for r in rows for n in r["numbers_sorted"].split(",") if n == "07")
+        assert sum(engine.gap_distribution(number=7).values()) == appearances - 1
+        assert sum(engine.gap_distribution().values()) == 600 * 20 - 80
+
+    def test_triples_and_positions(self, engine):
+        rows = list(generate_draw_rows(600))
+        top = engine.triple_co_occurrence(600, top_n=1)[0]
+        assert top["count"] == sum(
+            1 for r in rows if set(top["triple"]) <= set(r["numbers_sorted"].split(","))
+        )
+        positions = engine.position_stats()
+        assert sum(map(sum, positions.values())) == 600 * 20
+        assert positions["07"][0] == sum(1 for r in rows if r["numbers_sequence"].startswith("07,"))
+
+
+class TestSetting:
+    def test_offloaded_analyzers_route_to_duckdb(self, db_session, engine, monkeypatch):
+        from analysis import duckdb_engine, offload
+
+        monkeypatch.setattr(duckdb_engine, "_engine", engine)
+        monkeypatch.setattr(duckdb_engine.settings, "ANALYTICS_ENGINE", "duckdb")
+        monkeypatch.setattr(offload, "pack_window", lambda *a: pytest.fail("python path used"))
+        assert offload.run_offloaded(db_session, "co_occurrence", period_range=30) == \
+            CoOccurrenceAnalyzer(db_session).analyze(30)
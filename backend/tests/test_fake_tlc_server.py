@@ -0,0 +1,77 @@
+from datetime import datetime
+
+import pytest
+
+from app.config import settings
+from app.models.draw_result import DrawResult
+from benchmarks.fake_tlc_server import FakeTLCConfig, FakeTLCServer
+from benchmarks.synthetic import DRAWS_PER_DAY, first_term_of
+from crawler.bingo_crawler import BingoCrawler
+
+END_DATE = datetime.now().date()
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "CRAWLER_RETRY_BACKOFF", 0.0)
+
+
+def _crawler(server, db=None):
+    from unittest.mock import MagicMock
+    return BingoCrawler(db or MagicMock(), base_url=server.base_url)
+
+
+class TestFakeServerCrawl:
+    def test_paginates_full_days(self):
+        with FakeTLCServer(FakeTLCConfig(days=2)) as server:
+            results = _crawler(server).fetch_latest_draws(page_size=50, max_pages=10)
+        assert len(results) == 2 * DRAWS_PER_DAY
+        assert len({r["data"]["drawTerm"] for r in results}) == 2 * DRAWS_PER_DAY
+        assert all(r["first_term"] == first_term_of(r["query_date"]) for r in results)
+
+    def test_partial_day_first_term(self, db_session):
+        config = FakeTLCConfig(days=1, draws_on_end_date=60)
+        with FakeTLCServer(config) as server:
+            crawler = _crawler(server, db_session)
+            results = crawler.fetch_latest_draws(page_size=25, max_pages=10)
+            for r in results:
+                crawler.parse_and_save(r["data"], r["query_date"], r["first_term"])
+        latest = db_session.query(DrawResult).order_by(DrawResult.draw_term.desc()).first()
+        assert db_session.query(DrawResult).count() == 60
+        # 60th draw of the day: 07:05 + 59 * 5min = 12:00
+        assert latest.draw_datetime == datetime.combine(END_DATE, datetime.min.time()).replace(hour=12)
+
+    def test_run_inserts_first_page_of_each_day(self, db_session):
+        with FakeTLCServer(FakeTLCConfig(days=2)) as server:
+            stats = _crawler(server, db_session).run()
+        assert stats["fetched"] == 2 * settings.CRAWLER_PAGE_SIZE
+        assert stats["inserted"] == 2 * settings.CRAWLER_PAGE_SIZE
+
+
+class TestFakeServerFailures:
+    def test_http_errors_are_retried_then_given_up(self):
+        with FakeTLCServer(FakeTLCConfig(error_rate=1.0)) as server:
+            results = _crawler(server).fetch_latest_draws()
+            stats = server.stats
+        assert results == []
+        assert stats["http_error"] == 2 * (settings.CRAWLER_MAX_RETRIES + 1)
+
+    def test_rate_limit_honours_retry_after(self):
+        config = FakeTLCConfig(days=2, rate_limit=1, retry_after=1)
+        with FakeTLCServer(config) as server:
+            results = _crawler(server).fetch_latest_draws()
+            stats = server.stats
+        assert stats["rate_limited"] >= 1
+        assert len(results) == 2 * settings.CRAWLER_PAGE_SIZE
+
+    def test_truncated_body_is_skipped(self):
+        with FakeTLCServer(FakeTLCConfig(truncate_rate=1.0)) as server:
+            results = _crawler(server).fetch_latest_draws()
+        assert results == []
+
+    def test_rtcode_error(self):
+        with FakeTLCServer(FakeTLCConfig(rtcode_error_rate=1.0)) as server:
+            results = _crawler(server).fetch_latest_draws()
+            stats = server.stats
+        assert results == []
+        assert stats["rtcode_error"] == 2
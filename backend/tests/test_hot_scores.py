@@ -0,0 +1,69 @@
+import json
+import math
+
+import pytest
+from sqlalchemy import insert
+
+from app.models.draw_result import DrawResult
+from app.models.hot_score import HotScoreState
+from analysis.hot_scores import KINDS, RATES, HotScores
+from benchmarks.synthetic import generate_draw_rows, seed_draws
+
+
+def _direct(db, rate, kind="number"):
+    """Reference: Σ e^(-rate·idx) over every draw, newest first."""
+    draws = db.query(DrawResult).order_by(DrawResult.draw_term.desc()).all()
+    scores = {f"{n:02d}": 0.0 for n in range(1, 81)}
+    for idx, d in enumerate(draws):
+        nums = d.get_numbers_list() if kind == "number" else [d.super_number]
+        for num in nums:
+            scores[num] += math.exp(-rate * idx)
+    return scores
+
+
+class TestHotScores:
+    @pytest.mark.parametrize("rate", RATES)
+    def test_matches_direct_sum(self, db_session, rate):
+        seed_draws(db_session, 300)
+        hot = HotScores()
+        assert hot.sync(db_session) == 300
+        for kind in KINDS:
+            expected = _direct(db_session, rate, kind)
+            for num, score in hot.scores(rate, kind).items():
+                assert score == pytest.approx(expected[num], rel=1e-9, abs=1e-12)
+
+    def test_incremental_equals_full(self, db_session):
+        rows = list(generate_draw_rows(120))
+        db_session.execute(insert(DrawResult.__table__), rows[:80])
+        db_session.commit()
+        partial = HotScores()
+        partial.sync(db_session)
+        db_session.execute(insert(DrawResult.__table__), rows[80:])
+        db_session.commit()
+        assert partial.sync(db_session) == 40
+
+        full = HotScores()
+        full.sync(db_session)
+        assert partial.scores(0.05) == pytest.approx(full.scores(0.05), rel=1e-12)
+
+    def test_persist_and_resume(self, db_session):
+        seed_draws(db_session, 80)
+        hot = HotScores()
+        hot.sync(db_session, persist=True)
+        rows = db_session.query(HotScoreState).all()
+        assert len(rows) == len(RATES) * len(KINDS)
+        assert {r.last_term for r in rows} == {hot.last_term}
+
+        resumed = HotScores()
+        assert resumed.sync(db_session) == 0  # loaded from the table, nothing replayed
+        assert resumed.draws_seen == 80
+        assert resumed.scores(0.1, "super") == pytest.approx(hot.scores(0.1, "super"))
+
+    def test_snapshot_shape(self, db_session):
+        seed_draws(db_session, 5)
+        hot = HotScores()
+        hot.sync(db_session)
+        snap = hot.snapshot()
+        assert set(snap["rates"]) == {str(r) for r in RATES}
+        assert len(snap["rates"]["0.05"]["number"]) == 80
+        assert json.dumps(snap)
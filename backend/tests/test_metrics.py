@@ -0,0 +1,114 @@
+import json
+import os
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.metrics import Registry
+
+
+def _lines(text: str) -> set:
+    return set(text.strip().splitlines())
+
+
+class TestRegistry:
+    def test_counter_and_histogram_exposition(self):
+        reg = Registry()
+        c = reg.counter("t_total", "test counter", ("kind",))
+        h = reg.histogram("t_seconds", "test histogram", buckets=(0.1, 1.0))
+        c.inc(kind="a")
+        c.inc(2, kind="a")
+        h.observe(0.05)
+        h.observe(0.5)
+        h.observe(5)
+
+        lines = _lines(reg.render())
+        assert "# TYPE t_total counter" in lines
+        assert 't_total{kind="a"} 3' in lines
+        assert 't_seconds_bucket{le="0.1"} 1' in lines
+        assert 't_seconds_bucket{le="1"} 2' in lines
+        assert 't_seconds_bucket{le="+Inf"} 3' in lines
+        assert "t_seconds_count 3" in lines
+        assert "t_seconds_sum 5.55" in lines
+
+    def test_label_values_are_escaped(self):
+        reg = Registry()
+        reg.counter("esc_total", "escaping", ("v",)).inc(v='a"b')
+        assert 'esc_total{v="a\\"b"} 1' in _lines(reg.render())
+
+    def test_multiprocess_aggregation(self, tmp_path):
+        reg = Registry(str(tmp_path), flush_seconds=0)
+        c = reg.counter("mp_total", "multi", ("r",))
+        g = reg.gauge("mp_gauge", "gauge")
+        c.inc(2, r="x")
+        g.set(7)
+
+        # Snapshot left behind by another (now exited) worker
+        other = {
+            "mp_total": {"kind": "counter", "help": "multi", "labelnames": ["r"],
+                         "samples": [[["x"], 5.0]]},
+            "mp_gauge": {"kind": "gauge", "help": "gauge", "labelnames": [],
+                         "samples": [[[], 3.0]]},
+        }
+        dead_pid = 999999
+        with open(os.path.join(tmp_path, f"metrics_{dead_pid}.json"), "w") as f:
+            json.dump(other, f)
+
+        lines = _lines(reg.render())
+        assert 'mp_total{r="x"} 7' in lines
+        assert f'mp_gauge{{pid="{os.getpid()}"}} 7' in lines
+        assert not any(f'pid="{dead_pid}"' in line for line in lines)
+        # The dead worker's snapshot is retired: counters kept, gauges pruned
+        assert sorted(n for n in os.listdir(tmp_path) if n.startswith("retired_")) == [f"retired_{dead_pid}.json"]
+        assert 'mp_total{r="x"} 7' in _lines(reg.render())
+
+    def test_reused_pid_keeps_the_old_totals(self, tmp_path):
+        # A worker that exits leaves its snapshot; the next one gets the same pid
+        old = Registry(str(tmp_path), flush_seconds=0)
+        old.counter("reuse_total", "reuse").inc(5)
+        old.flush()
+        new = Registry(str(tmp_path), flush_seconds=0)
+        new.counter("reuse_total", "reuse").inc(1)
+        new.flush()
+        assert "reuse_total 6" in _lines(new.render())
+        names = os.listdir(tmp_path)
+        assert sum(n.startswith("metrics_") for n in names) == sum(n.startswith("retired_") for n in names) == 1
+
+
+class TestMetricsEndpoint:
+    def test_exposes_route_latency(self):
+        client = TestClient(app)
+        client.get("/health")
+        r = client.get("/metrics")
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/plain")
+        assert 'route="/health"' in r.text
+        assert "bingo_db_pool_checked_out" in r.text
+
+
+class TestCacheMetrics:
+    @staticmethod
+    def _count(cache, result):
+        from app.metrics import CACHE_REQUESTS
+        return CACHE_REQUESTS._values.get((cache, result), 0.0)
+
+    def test_index_lookups_are_recorded(self, db_session):
+        from analysis.hot_scores import get_hot_scores
+        from analysis.number_index import get_number_index
+        from benchmarks.synthetic import seed_draws
+
+        seed_draws(db_session, 10)
+        for cache, lookup in (("number_index", get_number_index), ("hot_scores", get_hot_scores)):
+            hits, misses = self._count(cache, "hit"), self._count(cache, "miss")
+            lookup(db_session)  # built
+            lookup(db_session)  # current
+            assert self._count(cache, "miss") == misses + 1
+            assert self._count(cache, "hit") == hits + 1
+
+    def test_singleflight_leader_is_a_miss(self):
+        from app.singleflight import SingleFlight
+
+        flight = SingleFlight("cache_metric_test")
+        flight.do("k", lambda: 1)
+        assert self._count("singleflight:cache_metric_test", "miss") == 1
+        assert self._count("singleflight:cache_metric_test", "hit") == 0
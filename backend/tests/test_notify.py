@@ -0,0 +1,65 @@
+import threading
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.notify import DrawListener, notify_new_draws
+from benchmarks.synthetic import seed_draws
+
+
+def _collector():
+    received, event = [], threading.Event()
+
+    def callback(message):
+        received.append(message)
+        event.set()
+
+    return received, event, callback
+
+
+class TestSocketChannel:
+    def test_daemon_reaches_every_listening_worker(self, tmp_path):
+        received, event, callback = _collector()
+        listener = DrawListener(callback, directory=str(tmp_path)).start()
+        try:
+            assert listener.mode == "socket"
+            assert notify_new_draws("113000005", 2, directory=str(tmp_path)) == 1
+            assert event.wait(5)
+            assert received == [{"latest_term": "113000005", "inserted": 2}]
+        finally:
+            listener.stop()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_stale_sockets_are_removed(self, tmp_path):
+        import socket
+        stale = tmp_path / "web-999999.sock"
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(str(stale))
+        sock.close()  # worker died without unlinking
+        assert notify_new_draws("113000001", 1, directory=str(tmp_path)) == 0
+        assert not stale.exists()
+
+    def test_no_directory_is_a_noop(self):
+        assert notify_new_draws("113000001", 1, directory="") == 0
+
+
+class TestPollChannel:
+    def test_detects_new_latest_term(self):
+        engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(bind=engine)
+        received, event, callback = _collector()
+        listener = DrawListener(callback, Session, directory="", poll_seconds=0.05).start()
+        try:
+            db = Session()
+            seed_draws(db, 3)
+            db.close()
+            assert event.wait(5)
+            assert received[0]["latest_term"] == "113000003"
+        finally:
+            listener.stop()
+            engine.dispose()
@@ -0,0 +1,105 @@
+from datetime import date, datetime
+
+import pytest
+
+from app.models.draw_result import DrawResult
+from analysis.draw_index import IncrementalDrawIndex
+from analysis.number_index import NumberIndex, get_number_index
+from benchmarks.synthetic import seed_draws
+
+
+def _history(db):
+    draws = db.query(DrawResult).order_by(DrawResult.draw_term).all()
+    return [(int(d.draw_term), {int(n) for n in d.get_numbers_list()}) for d in draws]
+
+
+class TestNumberIndex:
+    def test_positions_match_scan(self, db_session):
+        seed_draws(db_session, 300)
+        index = NumberIndex()
+        assert index.sync(db_session) == 300
+        history = _history(db_session)
+        for n in (1, 7, 33, 80):
+            expected = [i for i, (_, nums) in enumerate(history) if n in nums]
+            assert list(index.appearances(n)) == expected
+            assert index.count(n, 100, 200) == sum(1 for p in expected if 100 <= p < 200)
+            assert index.last_seen(n) == expected[-1]
+
+    def test_window_counts_match_positions(self, db_session):
+        seed_draws(db_session, 250)
+        index = NumberIndex()
+        index.sync(db_session)
+        for start, end in [(0, 250), (100, 250), (17, 18), (40, 40)]:
+            assert index.window_counts(start, end) == [index.count(n, start, end) for n in range(1, 81)]
+        assert sum(index.window_counts(0, 250)) == 250 * 20
+
+    def test_incremental_sync(self, db_session):
+        seed_draws(db_session, 50)
+        index = NumberIndex()
+        index.sync(db_session)
+        assert index.sync(db_session) == 0
+        db_session.add(DrawResult(
+            draw_term="999000001", draw_date=date(2030, 1, 1), draw_datetime=datetime(2030, 1, 1, 7, 5),
+            numbers_sorted=",".join(f"{n:02d}" for n in range(1, 21)),
+            numbers_sequence=",".join(f"{n:02d}" for n in range(1, 21)),
+            super_number="01",
+        ))
+        db_session.commit()
+        assert index.sync(db_session) == 1
+        assert index.terms[-1] == 999000001
+        assert index.last_seen(20) == 50
+
+    def test_backfill_triggers_rebuild(self, db_session):
+        seed_draws(db_session, 10)
+        index = NumberIndex()
+        index.sync(db_session)
+        db_session.add(DrawResult(
+            draw_term="100000001", draw_date=date(2020, 1, 1), draw_datetime=datetime(2020, 1, 1, 7, 5),
+            numbers_sorted=",".join(f"{n:02d}" for n in range(61, 81)),
+            numbers_sequence=",".join(f"{n:02d}" for n in range(61, 81)),
+            super_number="61",
+        ))
+        db_session.commit()
+        index.sync(db_session)
+        assert len(index) == 11
+        assert index.terms[0] == 100000001
+        assert list(index.terms) == sorted(index.terms)
+        assert index.positions[80][0] == 0
+
+    def test_pairs_match_scan(self, db_session):
+        seed_draws(db_session, 400)
+        index = get_number_index(db_session)
+        history = _history(db_session)
+        both = [i for i, (_, nums) in enumerate(history) if {12, 45} <= nums]
+        assert index.co_appearances(12, 45) == both
+        assert index.last_co_appearance(12, 45) == both[-1]
+        assert index.co_appearances(12, 45, start=200) == [p for p in both if p >= 200]
+
+    def test_timeline(self, db_session):
+        seed_draws(db_session, 500)
+        history = _history(db_session)
+        result = get_number_index(db_session).timeline(7, window=300, with_number=33, limit=5)
+        recent = history[-300:]
+        hits = [i for i, (_, nums) in enumerate(recent) if 7 in nums]
+        gaps = [b - a for a, b in zip(hits, hits[1:])]
+        assert result["window"] == 300
+        assert result["appearances"] == len(hits)
+        assert result["terms"] == [str(recent[i][0]) for i in reversed(hits[-5:])]
+        assert result["current_gap"] == 299 - hits[-1]
+        assert result["gap_stats"]["max"] == max(gaps)
+        assert sum(result["gap_stats"]["distribution"].values()) == len(gaps)
+        assert result["pair"]["count"] == sum(1 for _, nums in recent if {7, 33} <= nums)
+
+    def test_empty(self, db_session):
+        result = get_number_index(db_session).timeline(5)
+        assert result["appearances"] == 0
+        assert result["last_seen_term"] is None
+        assert result["gap_stats"]["mean"] is None
+
+    def test_base_requires_hooks(self):
+        class Partial(IncrementalDrawIndex):
+            def _clear(self):
+                pass
+
+        with pytest.raises(TypeError):
+            Partial()
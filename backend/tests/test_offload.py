@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import insert
+
+from app.models.draw_result import DrawResult
+from analysis import offload
+from analysis.co_occurrence_analyzer import CoOccurrenceAnalyzer
+from analysis.cold_hot_cycle_analyzer import ColdHotCycleAnalyzer
+from analysis.offload import AnalysisPool, PoolSaturated, pack_window, run_offloaded, unpack_window
+from benchmarks.synthetic import generate_draw_rows
+
+
+@pytest.fixture
+def draws(db_session):
+    rows = list(generate_draw_rows(150))
+    db_session.execute(insert(DrawResult.__table__), rows)
+    db_session.commit()
+    return rows
+
+
+class TestWindow:
+    def test_window_is_newest_first_and_compact(self, db_session, draws):
+        buf = pack_window(db_session, 50)
+        assert len(buf) == 50 * 32
+        window = unpack_window(buf)
+        assert window[0].draw_term == draws[-1]["draw_term"]
+        assert window[0].get_numbers_list() == draws[-1]["numbers_sorted"].split(",")
+
+    def test_inline_matches_database_analyzers(self, db_session, draws, monkeypatch):
+        monkeypatch.setattr(offload, "get_analysis_pool", lambda: None)
+        assert run_offloaded(db_session, "co_occurrence", period_range=100, top_n=15, target_number="07") == (
+            CoOccurrenceAnalyzer(db_session).analyze(100, 15, "07")
+        )
+        assert run_offloaded(db_session, "cold_hot_cycle", period_range=120, recent_window=10, top_n=10) == (
+            ColdHotCycleAnalyzer(db_session).analyze(120, 10, 10)
+        )
+
+
+class TestAnalysisPool:
+    def test_pool_matches_inline(self, db_session, draws, monkeypatch):
+        pool = AnalysisPool(processes=1, max_pending=4)
+        monkeypatch.setattr(offload, "get_analysis_pool", lambda: pool)
+        try:
+            result = run_offloaded(db_session, "co_occurrence", period_range=80, top_n=10)
+        finally:
+            pool.shutdown()
+        assert result == CoOccurrenceAnalyzer(db_session).analyze(80, 10)
+        assert pool.pending == 0
+
+    def test_rejects_past_max_pending(self):
+        pool = AnalysisPool(processes=1, max_pending=0)
+        with pytest.raises(PoolSaturated):
+            pool.submit(len, b"")
+        assert pool.pending == 0
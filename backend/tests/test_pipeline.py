@@ -0,0 +1,171 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models.pipeline_failure import PipelineFailure
+from app.models.precomputed_response import PrecomputedResponse
+from app.models.hot_score import HotScoreState
+from benchmarks.synthetic import seed_draws
+from scheduler.pipeline import Pipeline, Stage, pending_stages
+from scheduler.post_ingest import build_pipeline, retry_failed_stages, run_post_ingest
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _stage(name, log, after=(), fail_times=0, **kwargs):
+    calls = {"n": 0}
+
+    def fn(db, context):
+        calls["n"] += 1
+        if calls["n"] <= fail_times:
+            raise RuntimeError(f"{name} boom")
+        log.append(name)
+        return name
+
+    return Stage(name, fn, after=after, **kwargs)
+
+
+class TestPipeline:
+    def test_dependencies_run_first(self, session_factory):
+        log = []
+        pipeline = Pipeline([
+            _stage("c", log, after=("a", "b")),
+            _stage("a", log),
+            _stage("b", log, after=("a",)),
+        ], workers=4, retries=0, backoff=0)
+        results = pipeline.run(session_factory)
+        assert log == ["a", "b", "c"]
+        assert {r["status"] for r in results.values()} == {"ok"}
+        assert results["c"]["result"] == "c"
+
+    def test_independent_stages_run_concurrently(self, session_factory):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def wait_for_peer(db, context):
+            barrier.wait()  # deadlocks (BrokenBarrierError) if run one at a time
+
+        pipeline = Pipeline([Stage("a", wait_for_peer), Stage("b", wait_for_peer)], workers=2, retries=0)
+        results = pipeline.run(session_factory)
+        assert results["a"]["status"] == results["b"]["status"] == "ok"
+
+    def test_failed_stage_is_retried(self, session_factory):
+        log = []
+        pipeline = Pipeline([_stage("a", log, fail_times=2)], retries=2, backoff=0)
+        result = pipeline.run(session_factory)["a"]
+        assert result["status"] == "ok"
+        assert result["attempts"] == 3
+
+    def test_failure_skips_dependents_but_not_always_stages(self, session_factory):
+        log = []
+        pipeline = Pipeline([
+            _stage("a", log, fail_times=5),
+            _stage("b", log, after=("a",)),
+            _stage("c", log, after=("b",)),
+            _stage("d", log, after=("a",), always=True),
+            _stage("e", log),
+        ], retries=1, backoff=0)
+        results = pipeline.run(session_factory)
+        assert results["a"]["status"] == "failed"
+        assert results["a"]["attempts"] == 2
+        assert results["a"]["error"] == "a boom"
+        assert results["b"]["status"] == results["c"]["status"] == "skipped"
+        assert results["d"]["status"] == results["e"]["status"] == "ok"
+        assert sorted(log) == ["d", "e"]
+
+    def test_only_runs_selected_stages_and_dependents(self, session_factory):
+        log = []
+        pipeline = Pipeline([
+            _stage("a", log),
+            _stage("b", log, after=("a",)),
+            _stage("c", log),
+        ], retries=0)
+        assert set(pipeline.run(session_factory, only=["b"])) == {"b"}
+        assert set(pipeline.run(session_factory, only=["a"])) == {"a", "b"}
+
+    def test_rejects_cycles_and_unknown_dependencies(self):
+        noop = lambda db, context: None  # noqa: E731
+        with pytest.raises(ValueError):
+            Pipeline([Stage("a", noop, after=("b",)), Stage("b", noop, after=("a",))])
+        with pytest.raises(ValueError):
+            Pipeline([Stage("a", noop, after=("missing",))])
+
+
+class TestPostIngest:
+    def test_runs_every_stage(self, session_factory):
+        db = session_factory()
+        seed_draws(db, 30)
+        db.close()
+        results = run_post_ingest(session_factory, 30, build_pipeline(retries=0))
+        assert set(results) == {s.name for s in build_pipeline().stages}
+        failed = {name: r["error"] for name, r in results.items() if r["status"] != "ok"}
+        assert failed == {}
+
+        db = session_factory()
+        assert db.get(HotScoreState, 1) is not None
+        assert db.execute(select(PrecomputedResponse)).first() is not None
+        assert pending_stages(db) == []
+        db.close()
+
+    def test_failures_are_recorded_and_retried_without_crawling(self, session_factory):
+        db = session_factory()
+        seed_draws(db, 30)
+        db.close()
+        log, broken = [], {"on": True}
+
+        def flaky(db, context):
+            if broken["on"]:
+                raise RuntimeError("db locked")
+            log.append("flaky")
+
+        pipeline = Pipeline([
+            Stage("flaky", flaky),
+            _stage("after_flaky", log, after=("flaky",)),
+            _stage("other", log),
+        ], retries=0)
+        run_post_ingest(session_factory, 1, pipeline)
+
+        db = session_factory()
+        rows = {r.stage: r for r in db.execute(select(PipelineFailure)).scalars()}
+        assert set(rows) == {"flaky", "after_flaky"}
+        assert rows["flaky"].status == "failed" and rows["flaky"].error_message == "db locked"
+        assert rows["after_flaky"].status == "skipped"
+        assert rows["flaky"].latest_term is not None
+        db.close()
+
+        retry_failed_stages(session_factory, pipeline)  # still broken: attempts bump
+        db = session_factory()
+        assert db.execute(select(PipelineFailure.attempts).where(PipelineFailure.stage == "flaky")).scalar() == 2
+        db.close()
+
+        broken["on"] = False
+        log.clear()
+        results = retry_failed_stages(session_factory, pipeline)
+        assert set(results) == {"flaky", "after_flaky"}
+        assert log == ["flaky", "after_flaky"]
+        db = session_factory()
+        assert pending_stages(db) == []
+        db.close()
+        assert retry_failed_stages(session_factory, pipeline) == {}
+
+    def test_stage_durations_are_recorded(self, session_factory):
+        from app.metrics import PIPELINE_STAGE_DURATION
+
+        def slow(db, context):
+            time.sleep(0.01)
+
+        Pipeline([Stage("timed_stage", slow)], retries=0).run(session_factory)
+        state = PIPELINE_STAGE_DURATION._values[("timed_stage", "ok")]
+        assert state[2] >= 1 and state[1] >= 0.01
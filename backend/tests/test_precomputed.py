@@ -0,0 +1,65 @@
+import json
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.api.predictions import BUILDERS, STANDARD_REQUESTS
+from app.database import Base
+from app.models.draw_result import DrawResult
+from app.models.precomputed_response import PrecomputedResponse
+from app.precomputed import encode_body, lookup, precompute_responses, request_key, shutdown_pool
+from benchmarks.synthetic import generate_draw_rows
+
+
+def _insert(db, rows):
+    db.execute(insert(DrawResult.__table__), rows)
+    db.commit()
+
+
+class TestPrecompute:
+    def test_stores_every_standard_request(self, db_session):
+        rows = list(generate_draw_rows(120))
+        _insert(db_session, rows)
+        report = precompute_responses(db_session, processes=0)
+        term = rows[-1]["draw_term"]
+        assert report["stored"] == len(STANDARD_REQUESTS)
+        assert db_session.query(PrecomputedResponse).count() == len(STANDARD_REQUESTS)
+
+        name, params = ("smart-pick", {"period_range": 30, "pick_count": 10, "star_level": 3})
+        body = lookup(db_session, request_key(name, params), term)
+        assert body == encode_body(BUILDERS[name](db_session, **params))
+        assert json.loads(body)["period_range"] == 30
+
+    def test_same_term_is_skipped(self, db_session):
+        _insert(db_session, list(generate_draw_rows(40)))
+        precompute_responses(db_session, processes=0)
+        assert precompute_responses(db_session, processes=0)["skipped"] is True
+
+    def test_new_term_replaces_bodies(self, db_session):
+        rows = list(generate_draw_rows(41))
+        _insert(db_session, rows[:40])
+        precompute_responses(db_session, processes=0)
+        _insert(db_session, rows[40:])
+        key = request_key("high-low", {"period_range": 10})
+        assert lookup(db_session, key, rows[40]["draw_term"]) is None
+        precompute_responses(db_session, processes=0)
+        assert lookup(db_session, key, rows[39]["draw_term"]) is None
+        assert lookup(db_session, key, rows[40]["draw_term"]) is not None
+        assert db_session.query(PrecomputedResponse).count() == len(STANDARD_REQUESTS)
+
+    def test_process_pool_matches_inline(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'p.db'}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        try:
+            rows = list(generate_draw_rows(60))
+            _insert(db, rows)
+            assert precompute_responses(db, processes=2)["stored"] == len(STANDARD_REQUESTS)
+            key = request_key("basic", {"period_range": 20, "top_n": 10, "use_weighted": True})
+            assert lookup(db, key, rows[-1]["draw_term"]) == encode_body(
+                BUILDERS["basic"](db, period_range=20, top_n=10, use_weighted=True)
+            )
+        finally:
+            shutdown_pool()
+            db.close()
+            engine.dispose()
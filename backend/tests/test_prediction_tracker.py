@@ -0,0 +1,82 @@
+import json
+
+from sqlalchemy import insert
+
+from app.models.draw_result import DrawResult
+from app.models.prediction import Prediction
+from app.models.prediction_accuracy import PredictionAccuracy
+from analysis.prediction_tracker import (
+    PREDICTION_TYPES,
+    SNAPSHOT_PERIOD_RANGES,
+    accuracy_table,
+    current_prediction,
+    run_prediction_cycle,
+    score_predictions,
+    snapshot_predictions,
+)
+from benchmarks.synthetic import generate_draw_rows
+
+
+def _insert(db, rows):
+    db.execute(insert(DrawResult.__table__), rows)
+    db.commit()
+
+
+class TestSnapshot:
+    def test_snapshot_for_next_term(self, db_session):
+        rows = list(generate_draw_rows(120))
+        _insert(db_session, rows)
+        created = snapshot_predictions(db_session)
+        assert created == len(PREDICTION_TYPES) * len(SNAPSHOT_PERIOD_RANGES)
+        target = str(int(rows[-1]["draw_term"]) + 1)
+        basic = current_prediction(db_session, "basic", 30)
+        assert basic.target_term == target
+        assert basic.based_on_latest_term == rows[-1]["draw_term"]
+        assert len(json.loads(basic.predicted_numbers)) == 10
+        assert current_prediction(db_session, "high_low", 10).predicted_result in ("大", "小")
+
+    def test_snapshot_is_idempotent(self, db_session):
+        _insert(db_session, list(generate_draw_rows(40)))
+        snapshot_predictions(db_session)
+        assert snapshot_predictions(db_session) == 0
+
+    def test_empty_db(self, db_session):
+        assert snapshot_predictions(db_session) == 0
+        assert current_prediction(db_session, "basic", 30) is None
+
+
+class TestScoring:
+    def test_scores_when_target_drawn(self, db_session):
+        rows = list(generate_draw_rows(61))
+        _insert(db_session, rows[:60])
+        snapshot_predictions(db_session)
+        assert score_predictions(db_session) == 0
+
+        _insert(db_session, rows[60:])
+        drawn = set(rows[60]["numbers_sorted"].split(","))
+        assert score_predictions(db_session) == len(PREDICTION_TYPES) * len(SNAPSHOT_PERIOD_RANGES)
+
+        basic = db_session.query(Prediction).filter_by(prediction_type="basic", period_range=30).one()
+        assert basic.hits == len(set(json.loads(basic.predicted_numbers)) & drawn)
+        assert basic.scored_at is not None
+        high_low = db_session.query(Prediction).filter_by(prediction_type="high_low", period_range=30).one()
+        assert high_low.is_correct == (high_low.predicted_result == rows[60]["high_low_result"])
+
+        acc = db_session.query(PredictionAccuracy).filter_by(prediction_type="basic", period_range=30).one()
+        assert (acc.samples, acc.hit_sum, acc.pick_sum) == (1, basic.hits, 10)
+        assert score_predictions(db_session) == 0
+
+    def test_cycle_accumulates_accuracy(self, db_session):
+        rows = list(generate_draw_rows(80))
+        _insert(db_session, rows[:50])
+        run_prediction_cycle(db_session)
+        for row in rows[50:]:
+            _insert(db_session, [row])
+            run_prediction_cycle(db_session)
+
+        table = {(r["prediction_type"], r["period_range"]): r for r in accuracy_table(db_session)}
+        assert table[("basic", 10)]["samples"] == 30
+        assert table[("basic", 10)]["rolling_samples"] == 30
+        assert table[("basic", 10)]["baseline"] == 0.25
+        assert 0 <= table[("odd_even", 100)]["hit_rate"] <= 1
+        assert current_prediction(db_session, "smart_pick", 30).target_term == str(int(rows[-1]["draw_term"]) + 1)
@@ -0,0 +1,160 @@
+from datetime import date, datetime
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.database import Base, get_db
+from app.main import app
+from app.models.draw_result import DrawResult
+from app.profiling import RequestTimings, _current, timed
+
+
+@pytest.fixture
+def client():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    Session_ = sessionmaker(bind=engine)
+
+    db = Session_()
+    for i in range(12):
+        db.add(DrawResult(
+            draw_term=f"11500{i:04d}",
+            draw_date=date(2026, 1, 9),
+            draw_datetime=datetime(2026, 1, 9, 14, 30 - i),
+            numbers_sorted="01,02,03,04,05,06,07,08,09,10,41,42,43,44,45,46,47,48,49,50",
+            numbers_sequence="01,02,03,04,05,06,07,08,09,10,41,42,43,44,45,46,47,48,49,50",
+            super_number="50",
+            high_low_result="－", high_count=10, low_count=10,
+            odd_even_result="－", odd_count=10, even_count=10,
+        ))
+    db.commit()
+    db.close()
+
+    def override_get_db():
+        s = Session_()
+        try:
+            yield s
+        finally:
+            s.close()
+
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield TestClient(app)
+    if previous is None:
+        app.dependency_overrides.pop(get_db, None)
+    else:
+        app.dependency_overrides[get_db] = previous
+    engine.dispose()
+
+
+def _phases(header: str) -> dict:
+    phases = {}
+    for part in header.split(", "):
+        name, dur = part.split(";")[:2]
+        phases[name] = float(dur.split("=")[1])
+    return phases
+
+
+class TestServerTiming:
+    def test_smart_pick_phases(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "SERVER_TIMING_ORM", True)
+        r = client.get("/api/predictions/smart-pick?period_range=10")
+        assert r.status_code == 200
+        phases = _phases(r.headers["Server-Timing"])
+        for name in ("db", "orm", "handler", "serialize", "total",
+                     "analyzer.basic", "analyzer.co_occurrence", "scoring"):
+            assert name in phases
+        assert phases["total"] >= phases["handler"]
+
+    def test_orm_phase_is_opt_in(self, client):
+        r = client.get("/api/predictions/smart-pick?period_range=10")
+        phases = _phases(r.headers["Server-Timing"])
+        assert "db" in phases and "orm" not in phases
+
+    def test_all_has_every_analyzer(self, client):
+        r = client.get("/api/predictions/all?period_range=10")
+        phases = _phases(r.headers["Server-Timing"])
+        assert sum(1 for k in phases if k.startswith("analyzer.")) == 9
+
+    def test_timed_is_noop_outside_request(self):
+        assert _current.get() is None
+        with timed("anything"):
+            pass
+
+    def test_timed_accumulates(self):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            with timed("x"):
+                pass
+            with timed("x"):
+                pass
+        finally:
+            _current.reset(token)
+        assert timings.counts["x"] == 2
+        assert 'x;dur=' in timings.server_timing_header()
+
+
+class TestProfileMode:
+    def test_requires_admin_token(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+        r = client.get("/api/predictions/smart-pick?period_range=10&profile=1")
+        assert r.headers["content-type"].startswith("application/json")
+
+        r = client.get(
+            "/api/predictions/smart-pick?period_range=10&profile=1",
+            headers={"X-Admin-Token": "wrong"},
+        )
+        assert r.headers["content-type"].startswith("application/json")
+
+    def test_returns_profile_for_admin(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+        r = client.get(
+            "/api/predictions/smart-pick?period_range=10&profile=1",
+            headers={"X-Admin-Token": "secret"},
+        )
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/plain")
+        assert "phases (ms)" in r.text
+        assert "smart_pick_engine.py" in r.text
+
+    def test_disabled_without_configured_token(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+        r = client.get(
+            "/api/predictions/smart-pick?period_range=10&profile=1",
+            headers={"X-Admin-Token": ""},
+        )
+        assert r.headers["content-type"].startswith("application/json")
+
+    def test_profiles_offloaded_async_endpoint(self, client, monkeypatch):
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+        r = client.get(
+            "/api/predictions/co-occurrence?period_range=10&profile=1",
+            headers={"X-Admin-Token": "secret"},
+        )
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/plain")
+        assert "_serve" in r.text
+
+    def test_unprofiled_async_endpoint_answers_400(self, monkeypatch):
+        from fastapi import APIRouter, FastAPI
+        from app.profiling import ServerTimingMiddleware, TimedRoute
+
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+        router = APIRouter(route_class=TimedRoute)
+
+        @router.get("/ping")
+        async def ping():
+            return {"ok": True}
+
+        bare = FastAPI()
+        bare.include_router(router)
+        bare.add_middleware(ServerTimingMiddleware)
+        r = TestClient(bare).get("/ping?profile=1", headers={"X-Admin-Token": "secret"})
+        assert r.status_code == 400
@@ -0,0 +1,125 @@
+import gzip
+import hashlib
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.database import Base
+from app.models.draw_number import DrawNumber
+from app.models.draw_result import DrawResult
+from benchmarks.fake_tlc_server import FakeTLCConfig, FakeTLCServer
+from benchmarks.synthetic import DRAWS_PER_DAY
+from crawler.bingo_crawler import BingoCrawler
+from crawler.raw_archive import RawArchive, replay
+
+END_DATE = datetime.now().date()
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "CRAWLER_RETRY_BACKOFF", 0.0)
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return RawArchive(str(tmp_path / "archive"))
+
+
+def _fresh_session():
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def _crawl(db, archive, config, max_pages=10, page_size=50):
+    with FakeTLCServer(config) as server:
+        crawler = BingoCrawler(db, base_url=server.base_url, archive=archive)
+        for entry in crawler.fetch_latest_draws(page_size=page_size, max_pages=max_pages):
+            crawler.parse_and_save(entry["data"], entry["query_date"], entry["first_term"])
+
+
+def _draws(db):
+    return [
+        (r.draw_term, r.draw_datetime, r.numbers_sequence, r.super_number, r.high_low_result)
+        for r in db.query(DrawResult).order_by(DrawResult.draw_term)
+    ]
+
+
+class TestRawArchive:
+    def test_objects_are_gzip_and_content_addressed(self, archive):
+        body = b'{"rtCode": 0}'
+        digest = archive.put(body)
+        assert digest == hashlib.sha256(body).hexdigest()
+        path = os.path.join(archive.root, "objects", digest[:2], f"{digest[2:]}.json.gz")
+        with open(path, "rb") as f:
+            assert gzip.decompress(f.read()) == body
+        assert archive.put(body) == digest
+        assert archive.get(digest) == body
+
+    def test_crawler_archives_every_page(self, db_session, archive):
+        config = FakeTLCConfig(days=2)
+        _crawl(db_session, archive, config)
+        _crawl(db_session, archive, config)  # same bodies again
+        entries = list(archive.entries())
+        pages_per_crawl = 2 * -(-DRAWS_PER_DAY // 50)
+        assert len(entries) == 2 * pages_per_crawl
+        assert len({e["digest"] for e in entries}) == pages_per_crawl
+        assert len({e["fetch_id"] for e in entries}) == 4  # one per day per crawl
+
+    def test_disabled_by_default(self, db_session):
+        assert BingoCrawler(db_session).archive is None
+
+
+class TestReplay:
+    def test_rebuilds_the_same_draws_offline(self, db_session, archive):
+        _crawl(db_session, archive, FakeTLCConfig(days=2))
+        replica = _fresh_session()
+        stats = replay(replica, archive)
+        assert stats["draws"] == stats["inserted"] == 2 * DRAWS_PER_DAY
+        assert _draws(replica) == _draws(db_session)
+        numbers = replica.execute(select(func.count()).select_from(DrawNumber)).scalar()
+        assert numbers == 2 * DRAWS_PER_DAY * 20
+        replica.close()
+
+    def test_merges_partial_crawls_of_a_day(self, db_session, archive):
+        # Scheduled crawls fetch only the newest page; together they cover the day
+        for published in (40, 120, 200):
+            config = FakeTLCConfig(days=1, draws_on_end_date=published)
+            _crawl(db_session, archive, config, max_pages=1, page_size=50)
+        assert db_session.query(DrawResult).count() == 140  # 1-40, 71-120, 151-200
+        replica = _fresh_session()
+        stats = replay(replica, archive)
+        assert stats["inserted"] == 140
+        assert _draws(replica) == _draws(db_session)
+        replica.close()
+
+    def test_rerun_skips_existing_draws(self, db_session, archive):
+        _crawl(db_session, archive, FakeTLCConfig(days=1))
+        stats = replay(db_session, archive)
+        assert stats["inserted"] == 0
+        assert stats["skipped"] == DRAWS_PER_DAY
+
+    def test_replace_rederives_columns(self, db_session, archive, monkeypatch):
+        _crawl(db_session, archive, FakeTLCConfig(days=1))
+        first = db_session.query(DrawResult).order_by(DrawResult.draw_term).first().draw_datetime
+        monkeypatch.setattr(settings, "BINGO_FIRST_DRAW_HOUR", settings.BINGO_FIRST_DRAW_HOUR + 1)
+        stats = replay(db_session, archive, replace=True)
+        assert stats["replaced"] == DRAWS_PER_DAY and stats["inserted"] == 0
+        db_session.expire_all()
+        rows = db_session.query(DrawResult).order_by(DrawResult.draw_term).all()
+        assert len(rows) == DRAWS_PER_DAY
+        assert rows[0].draw_datetime == first + timedelta(hours=1)
+        numbers = db_session.execute(select(func.count()).select_from(DrawNumber)).scalar()
+        assert numbers == DRAWS_PER_DAY * 20
+
+    def test_date_range(self, db_session, archive):
+        _crawl(db_session, archive, FakeTLCConfig(days=2))
+        replica = _fresh_session()
+        stats = replay(replica, archive, from_date=END_DATE, to_date=END_DATE)
+        assert stats["inserted"] == DRAWS_PER_DAY
+        assert {r.draw_date for r in replica.query(DrawResult)} == {END_DATE}
+        replica.close()
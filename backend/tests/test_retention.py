@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta
+
+from app.models.archived_bet import ArchivedBet, BetDailySummary
+from app.models.crawler_log import CrawlerLog
+from app.models.crawler_log_daily import CrawlerLogDaily
+from app.models.simulated_bet import SimulatedBet
+from scheduler.retention import (
+    archive_settled_bets,
+    compact_database,
+    enable_incremental_vacuum,
+    rollup_crawler_logs,
+    run_retention,
+)
+
+
+def _bet(session_id, status, settled_days_ago=None, prize=0, multiplier=1):
+    settled_at = datetime.utcnow() - timedelta(days=settled_days_ago) if settled_days_ago is not None else None
+    return SimulatedBet(
+        session_id=session_id, bet_type="high_low", selected_option="大", bet_amount=25,
+        multiplier=multiplier, target_draw_term="113000001", status=status,
+        prize_amount=prize, net_profit=prize - 25 * multiplier, settled_at=settled_at,
+    )
+
+
+def _log(days_ago, status="success", inserted=1):
+    started = datetime.now() - timedelta(days=days_ago)
+    return CrawlerLog(
+        started_at=started, finished_at=started + timedelta(seconds=3), status=status,
+        records_fetched=50, records_inserted=inserted, records_skipped=50 - inserted,
+    )
+
+
+class TestArchiveBets:
+    def test_moves_old_settled_bets_only(self, db_session):
+        db_session.add_all([
+            _bet("a", "won", 40, prize=50, multiplier=2),
+            _bet("a", "lost", 40),
+            _bet("a", "lost", 1),
+            _bet("b", "pending"),
+        ])
+        db_session.commit()
+
+        assert archive_settled_bets(db_session, 30) == 2
+        assert {b.status for b in db_session.query(SimulatedBet)} == {"lost", "pending"}
+        archived = db_session.query(ArchivedBet).order_by(ArchivedBet.id).all()
+        assert [a.status for a in archived] == ["won", "lost"]
+        assert archived[0].prize_amount == 50 and archived[0].archived_at
+
+        summary = db_session.query(BetDailySummary).one()
+        assert (summary.session_id, summary.bets, summary.wins) == ("a", 2, 1)
+        assert (summary.total_cost, summary.total_prize) == (75, 50)
+
+    def test_summaries_merge_across_batches(self, db_session):
+        db_session.add_all([_bet("a", "lost", 40) for _ in range(7)])
+        db_session.commit()
+        assert archive_settled_bets(db_session, 30, batch_size=3) == 7
+        assert db_session.query(BetDailySummary).one().bets == 7
+        assert db_session.query(SimulatedBet).count() == 0
+
+
+class TestCrawlerLogRollup:
+    def test_rolls_up_by_day(self, db_session):
+        db_session.add_all([_log(10), _log(10, status="failed", inserted=0), _log(1)])
+        db_session.add(CrawlerLog(started_at=datetime.now() - timedelta(days=10), status="running"))
+        db_session.commit()
+
+        assert rollup_crawler_logs(db_session, 7) == 2
+        day = db_session.query(CrawlerLogDaily).one()
+        assert (day.runs, day.succeeded, day.failed) == (2, 1, 1)
+        assert (day.records_fetched, day.records_inserted, day.total_seconds) == (100, 1, 6)
+        assert db_session.query(CrawlerLog).count() == 2
+
+
+class TestCompaction:
+    def test_switches_to_incremental_then_reclaims(self, tmp_path):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from app.database import Base
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'r.db'}")
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        try:
+            assert compact_database(engine)["mode"] == "analyze"  # scheduled job: no full VACUUM
+            assert enable_incremental_vacuum(engine)["mode"] == "vacuum"
+            assert enable_incremental_vacuum(engine) is None
+            db.add_all([_bet("a", "lost", 40) for _ in range(3000)])
+            db.commit()
+            report = run_retention(db, bet_days=30, log_days=7, vacuum_pages=0)
+            assert report["archived_bets"] == 3000
+            assert report["mode"] == "incremental"
+            assert report["reclaimed_bytes"] > 0
+            assert report["bytes_after"] == report["bytes_before"] - report["reclaimed_bytes"]
+            assert report["duration_seconds"] >= 0
+        finally:
+            db.close()
+            engine.dispose()
@@ -0,0 +1,93 @@
+import threading
+import time
+
+import pytest
+
+from app.singleflight import SingleFlight
+
+
+def _run_concurrently(flight, n, fn, key="k", version=1):
+    results, errors = [None] * n, [None] * n
+    start = threading.Barrier(n)
+
+    def worker(i):
+        start.wait()
+        try:
+            results[i] = flight.do(key, fn, version=version)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+class TestInProcess:
+    def test_concurrent_callers_share_one_run(self):
+        flight = SingleFlight("test")
+        calls = []
+
+        def slow():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"value": 42}
+
+        results, errors = _run_concurrently(flight, 8, slow)
+        assert len(calls) == 1
+        assert errors == [None] * 8
+        assert all(r is results[0] for r in results)
+        assert flight.in_flight() == 0
+
+    def test_error_reaches_every_waiter(self):
+        flight = SingleFlight("test")
+
+        def boom():
+            time.sleep(0.1)
+            raise ValueError("boom")
+
+        _, errors = _run_concurrently(flight, 4, boom)
+        assert all(isinstance(e, ValueError) for e in errors)
+        assert flight.in_flight() == 0
+
+    def test_sequential_calls_recompute(self):
+        flight = SingleFlight("test")
+        calls = []
+        flight.do("k", lambda: calls.append(1))
+        flight.do("k", lambda: calls.append(1))
+        assert len(calls) == 2
+
+    def test_versions_do_not_coalesce(self):
+        flight = SingleFlight("test")
+        assert flight.do("k", lambda: "old", version=1) == "old"
+        assert flight.do("k", lambda: "new", version=2) == "new"
+
+
+class TestCrossWorker:
+    @pytest.fixture(autouse=True)
+    def _posix_only(self):
+        pytest.importorskip("fcntl")
+
+    def test_second_worker_reuses_published_result(self, tmp_path):
+        worker_a = SingleFlight("test", str(tmp_path))
+        worker_b = SingleFlight("test", str(tmp_path))
+        assert worker_a.do("k", lambda: {"picks": [1, 2]}, version="113000001") == {"picks": [1, 2]}
+        assert worker_b.do("k", lambda: pytest.fail("recomputed"), version="113000001") == {"picks": [1, 2]}
+
+    def test_stale_version_or_ttl_recomputes(self, tmp_path):
+        worker_a = SingleFlight("test", str(tmp_path), shared_ttl=0.1)
+        worker_b = SingleFlight("test", str(tmp_path), shared_ttl=0.1)
+        worker_a.do("k", lambda: 1, version="113000001")
+        assert worker_b.do("k", lambda: 2, version="113000002") == 2
+        time.sleep(0.15)
+        assert worker_a.do("k", lambda: 3, version="113000002") == 3
+
+    def test_unserialisable_result_is_not_published(self, tmp_path):
+        worker_a = SingleFlight("test", str(tmp_path))
+        worker_b = SingleFlight("test", str(tmp_path))
+        marker = object()
+        assert worker_a.do("k", lambda: marker) is marker
+        assert worker_b.do("k", lambda: "fresh") == "fresh"
+        assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,99 @@
+import pytest
+
+from app.models.draw_result import DrawResult
+from analysis.high_low_analyzer import HighLowAnalyzer
+from analysis.odd_even_analyzer import OddEvenAnalyzer
+from analysis.trend_series import TrendSeries, get_trend_series
+from benchmarks.synthetic import seed_draws
+
+
+def _reference_stats(db, column, count_column, tie, window):
+    """Straight scan over ORM rows, the way TrendAnalyzer used to compute it."""
+    draws = db.query(DrawResult).order_by(DrawResult.draw_term.desc()).limit(window).all()
+    results = [getattr(d, column) or tie for d in draws]
+    streak_type, streak_count = None, 0
+    for r in results:
+        if r == tie:
+            if streak_type is not None:
+                break
+            continue
+        if streak_type is None:
+            streak_type, streak_count = r, 1
+        elif r == streak_type:
+            streak_count += 1
+        else:
+            break
+    return results, {"type": streak_type, "count": streak_count}, sum(getattr(d, count_column) for d in draws)
+
+
+def _runs(results):
+    runs = []
+    for r in results:
+        if runs and runs[-1][0] == r:
+            runs[-1][1] += 1
+        else:
+            runs.append([r, 1])
+    return runs
+
+
+class TestTrendSeries:
+    @pytest.mark.parametrize("window", [1, 2, 7, 30, 250, 1000])
+    def test_window_stats_match_scan(self, db_session, window):
+        seed_draws(db_session, 400)
+        series = get_trend_series(db_session, "high_low")
+        stats = series.window_stats(window)
+        results, streak, count_sum = _reference_stats(db_session, "high_low_result", "high_count", "－", window)
+        assert stats["size"] == len(results)
+        assert (stats["pos"], stats["neg"], stats["tie"]) == (
+            results.count("大"), results.count("小"), results.count("－"),
+        )
+        assert stats["streak"] == streak
+        assert stats["count_sum"] == count_sum
+
+    def test_runs_compress_history(self, db_session):
+        seed_draws(db_session, 300)
+        series = TrendSeries("odd_even")
+        series.sync(db_session)
+        results, _, _ = _reference_stats(db_session, "odd_even_result", "odd_count", "－", 300)
+        expected = _runs(list(reversed(results)))
+        runs = series.runs(limit=10_000)
+        assert [(r["result"], r["length"]) for r in reversed(runs)] == [tuple(r) for r in expected]
+        assert sum(r["length"] for r in runs) == 300
+
+    def test_runs_pagination(self, db_session):
+        seed_draws(db_session, 200)
+        series = get_trend_series(db_session, "high_low")
+        first = series.runs(limit=5)
+        second = series.runs(limit=5, before_term=int(first[-1]["start_term"]))
+        assert int(second[0]["end_term"]) < int(first[-1]["start_term"])
+        assert series.runs(limit=10)[5:] == second
+
+    def test_histogram_reversal_rates(self, db_session):
+        seed_draws(db_session, 500)
+        series = get_trend_series(db_session, "odd_even")
+        results, _, _ = _reference_stats(db_session, "odd_even_result", "odd_count", "－", 500)
+        completed = _runs(list(reversed(results)))[:-1]
+        hist = series.histogram()
+        lengths = [n for label, n in completed if label == "單"]
+        for k, row in hist["單"].items():
+            k = int(k)
+            assert row["runs"] == lengths.count(k)
+            assert row["reached"] == sum(1 for n in lengths if n >= k)
+        assert sum(row["runs"] for rows in hist.values() for row in rows.values()) == len(completed)
+
+
+class TestTrendAnalyzerHistory:
+    def test_history_payload(self, db_session):
+        seed_draws(db_session, 120)
+        result = HighLowAnalyzer(db_session).history(limit=3)
+        assert result["series"] == "high_low"
+        assert len(result["runs"]) == 3
+        assert result["next_before_term"] == int(result["runs"][-1]["start_term"])
+        assert set(result["streak_histogram"]) == {"大", "小", "－"}
+
+    def test_analyze_uses_series(self, db_session):
+        seed_draws(db_session, 60)
+        result = OddEvenAnalyzer(db_session).analyze(30)
+        stats = result["statistics"]
+        assert stats["odd_count"] + stats["even_count"] + stats["tie_count"] == 30
+        assert result["period_range"] == 30
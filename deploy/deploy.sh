@@ -51,14 +51,15 @@ if [ ! -f ".env" ]; then
 fi
 
 # ── 3. Systemd service ─────────────────────────
-echo "[3/7] Installing systemd service..."
+echo "[3/7] Installing systemd services..."
 sed "s|{{DOMAIN}}|$DOMAIN|g" "$DEPLOY_DIR/bingo-backend.service" \
   > /etc/systemd/system/bingo-backend.service
+cp "$DEPLOY_DIR/bingo-worker.service" /etc/systemd/system/bingo-worker.service
 
 systemctl daemon-reload
-systemctl enable bingo-backend
-systemctl restart bingo-backend
-echo "  → Backend service started on port 8000"
+systemctl enable bingo-backend bingo-worker
+systemctl restart bingo-worker bingo-backend
+echo "  → Backend service started on port 8000, ingestion worker started"
 
 # ── 4. Frontend build ──────────────────────────
 echo "[4/7] Building frontend..."
@@ -94,7 +95,7 @@ certbot --nginx -d "$DOMAIN" -d "www.$DOMAIN" --non-interactive --agree-tos --re
 
 # ── 7. Final check ─────────────────────────────
 echo "[7/7] Verifying..."
-systemctl status bingo-backend --no-pager || true
+systemctl status bingo-backend bingo-worker --no-pager || true
 echo ""
 echo "========================================"
 echo "  Deployment complete!"
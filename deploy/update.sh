@@ -14,8 +14,15 @@ cd "$APP_DIR/backend"
 source venv/bin/activate
 pip install -r requirements.txt --quiet
 python -m scripts.migrate_add_session_id
+python -m scripts.migrate_add_term_number
+python -m scripts.migrate_prediction_tracking
+python -m scripts.migrate_add_draw_date_index
+python -m scripts.backfill_draw_numbers --pause 0.1
 deactivate
-sudo systemctl restart bingo-backend
+sudo cp "$APP_DIR/deploy/bingo-worker.service" /etc/systemd/system/bingo-worker.service
+sudo systemctl daemon-reload
+sudo systemctl enable bingo-worker
+sudo systemctl restart bingo-worker bingo-backend
 
 echo "── Rebuilding frontend..."
 cd "$APP_DIR/frontend"